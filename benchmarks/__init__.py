@@ -0,0 +1,11 @@
+# Python dependencies
+import os
+import tempfile
+
+# Project dependencies
+from wca_nr_api.config.constants import BACKUP_FOLDER, DATABASE_FOLDER, EXPORTS_FOLDER, LOGS_FOLDER, RECORDS_FOLDER
+
+# The project works with the folders of the working directory, so the benchmarks run in a temporary one
+os.chdir(tempfile.mkdtemp(prefix="wca_nr_api_benchmarks_"))
+for folder in (EXPORTS_FOLDER, RECORDS_FOLDER, DATABASE_FOLDER, LOGS_FOLDER, BACKUP_FOLDER):
+    os.makedirs(folder, exist_ok=True)
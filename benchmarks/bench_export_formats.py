@@ -0,0 +1,86 @@
+"""
+End-to-end benchmark of the export formats - from the downloaded archive to the records of the country, for the
+SQL dump (read from the archive, or extracted and memory-mapped) and for the TSV export. The records of every
+format are checked to be the same.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_export_formats --persons 100000
+"""
+
+# Python dependencies
+import argparse
+import os
+import time
+from typing import Any
+from unittest import mock
+
+# Project dependencies
+from benchmarks.fixtures import BENCHMARK_COUNTRY, generate_export_tables, write_sql_export, write_tsv_export
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils import file_utils, sql_utils, tsv_utils
+from wca_nr_api.utils.records_engine import RecordsEngine
+
+
+def run_export(export_format: str, source: str, scan_mode: str, repeat: int) -> tuple[float, dict[str, Any]]:
+    """
+    Unarchives the export and extracts the records of the country from it with the given configuration.
+
+    :param export_format: (str) The format of the export.
+    :param source: (str) The source of the SQL dump.
+    :param scan_mode: (str) The scan mode of the SQL dump.
+    :param repeat: (int) The number of runs, of which the fastest is taken.
+    :return: (tuple) The time of the fastest run in seconds and the records of the last run.
+    """
+
+    times = []
+    with mock.patch.multiple(file_utils, EXPORT_FORMAT=export_format, SQL_DUMP_SOURCE=source), \
+            mock.patch.object(sql_utils, "SQL_DUMP_SCAN_MODE", scan_mode):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            file_utils.unarchive_latest_export()
+            records_engine = RecordsEngine()
+            if export_format == EXPORT_FORMAT_TSV:
+                tsv_utils.ingest_tsv_export(TABLE_FILTERS, records_engine)
+            else:
+                sql_utils.filter_sql_dump(TABLE_FILTERS, output=records_engine)
+            records = records_engine.to_records().to_dict()
+            times.append(time.perf_counter() - start)
+
+    return min(times), records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persons", type=int, default=50000, help="number of persons of the synthetic export")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration, the fastest is reported")
+    args = parser.parse_args()
+
+    os.environ["WCA_COUNTRY"] = BENCHMARK_COUNTRY
+    tables = generate_export_tables(args.persons)
+    write_sql_export(tables, EXPORTS_FOLDER)
+    write_tsv_export(tables, EXPORTS_FOLDER)
+    sql_size = os.path.getsize(os.path.join(EXPORTS_FOLDER, EXPORTS_ARCHIVE_FILENAME))
+    tsv_size = os.path.getsize(os.path.join(EXPORTS_FOLDER, EXPORTS_TSV_ARCHIVE_FILENAME))
+    print(f"Export of {args.persons} persons - SQL archive {sql_size / 1024 / 1024:.1f} MiB, "
+          f"TSV archive {tsv_size / 1024 / 1024:.1f} MiB")
+
+    configurations = [
+        (EXPORT_FORMAT_SQL, SQL_DUMP_SOURCE_ARCHIVE, SQL_DUMP_SCAN_MODE_LINES),
+        (EXPORT_FORMAT_SQL, SQL_DUMP_SOURCE_EXTRACTED, SQL_DUMP_SCAN_MODE_LINES),
+        (EXPORT_FORMAT_SQL, SQL_DUMP_SOURCE_EXTRACTED, SQL_DUMP_SCAN_MODE_MMAP),
+        (EXPORT_FORMAT_TSV, "-", "-"),
+    ]
+
+    print(f"{'format':<8}{'source':<11}{'scan':<7}{'seconds':>10}")
+    expected_records = None
+    for export_format, source, scan_mode in configurations:
+        seconds, records = run_export(export_format, source, scan_mode, args.repeat)
+        if expected_records is None:
+            expected_records = records
+        elif records != expected_records:
+            raise ValueError(f"Records of {export_format} ({source}, {scan_mode}) differ from the SQL dump")
+        print(f"{export_format:<8}{source:<11}{scan_mode:<7}{seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of the scan modes of the SQL dump - how the parallel mode scales with the number of workers, compared
+to the line scan and the memory-mapped scan. The filtered output of every run is checked to be the same.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_parallel_filter --persons 100000 --workers 1 2 4 8
+"""
+
+# Python dependencies
+import argparse
+import hashlib
+import os
+import time
+from unittest import mock
+
+# Project dependencies
+from benchmarks.fixtures import BENCHMARK_COUNTRY, generate_export_tables, write_sql_export
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils import file_utils, sql_utils
+
+
+def run_filter(scan_mode: str, workers: int, repeat: int) -> tuple[float, str]:
+    """
+    Filters the extracted SQL dump into the filtered SQL script with the given scan mode.
+
+    :param scan_mode: (str) The scan mode of the SQL dump.
+    :param workers: (int) The number of worker processes of the parallel mode.
+    :param repeat: (int) The number of runs, of which the fastest is taken.
+    :return: (tuple) The time of the fastest run in seconds and the hash of the filtered SQL script.
+    """
+
+    times = []
+    with mock.patch.object(file_utils, "SQL_DUMP_SOURCE", SQL_DUMP_SOURCE_EXTRACTED), \
+            mock.patch.multiple(sql_utils, SQL_DUMP_SCAN_MODE=scan_mode, SQL_DUMP_PARALLEL_WORKERS=workers,
+                                DATABASE_LOADER_MODE=DATABASE_LOADER_MODE_SCRIPT):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            sql_utils.filter_sql_dump(TABLE_FILTERS)
+            times.append(time.perf_counter() - start)
+
+    with open(os.path.join(EXPORTS_FOLDER, FILTERED_EXPORTS_SQL_FILENAME), "rb") as f:
+        return min(times), hashlib.sha256(f.read()).hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persons", type=int, default=50000, help="number of persons of the synthetic export")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()],
+                        help="numbers of workers of the parallel mode")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration, the fastest is reported")
+    args = parser.parse_args()
+
+    os.environ["WCA_COUNTRY"] = BENCHMARK_COUNTRY
+    write_sql_export(generate_export_tables(args.persons), EXPORTS_FOLDER)
+    size = os.path.getsize(os.path.join(EXPORTS_FOLDER, EXPORTS_SQL_FILENAME))
+    print(f"SQL dump of {args.persons} persons, {size / 1024 / 1024:.1f} MiB, {os.cpu_count()} CPUs")
+
+    baseline, expected_output = run_filter(SQL_DUMP_SCAN_MODE_LINES, 1, args.repeat)
+    print(f"{'mode':<10}{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    print(f"{SQL_DUMP_SCAN_MODE_LINES:<10}{'-':>8}{baseline:>10.3f}{1:>10.2f}")
+
+    configurations = [(SQL_DUMP_SCAN_MODE_MMAP, 1)]
+    configurations += [(SQL_DUMP_SCAN_MODE_PARALLEL, workers) for workers in sorted(set(args.workers))]
+    for scan_mode, workers in configurations:
+        seconds, output = run_filter(scan_mode, workers, args.repeat)
+        if output != expected_output:
+            raise ValueError(f"Filtered output of {scan_mode} with {workers} workers differs from the line scan")
+        label = workers if scan_mode == SQL_DUMP_SCAN_MODE_PARALLEL else "-"
+        print(f"{scan_mode:<10}{label:>8}{seconds:>10.3f}{baseline / seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
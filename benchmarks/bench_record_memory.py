@@ -0,0 +1,103 @@
+"""
+Memory benchmark of the records - the memory and the time to create a million records of 150 thousand persons,
+from new strings for every record, as the rows of the export are parsed. A plain class with the same attributes
+in a dictionary and without interned strings is measured as a reference.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_record_memory --records 1000000
+"""
+
+# Python dependencies
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable
+
+# Project dependencies
+from benchmarks.fixtures import BENCHMARK_EVENTS
+from wca_nr_api.classes.event import Event
+from wca_nr_api.classes.gender import Gender
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.result_type import ResultType
+
+BENCHMARK_PERSONS = 150000
+
+
+class PlainRecord:
+    """
+    "PlainRecord" holds the same attributes as "Record" in the dictionary of the instance, without interning the
+    strings and with the enumerations resolved for every record.
+    """
+
+    def __init__(self, person_id: str, name: str, gender: str, event: str, result: int, result_type: ResultType):
+        self.person_id = person_id
+        self.name = name
+        self.gender = Gender.from_database_value(gender)
+        self.event = Event.from_database_value(event)
+        self.result = result
+        self.result_type = result_type
+
+
+def create_records(record_class: Callable[..., Any], count: int) -> list[Any]:
+    """
+    Creates the records with new strings for every record.
+
+    :param record_class: (Callable) The class of the records.
+    :param count: (int) The number of records.
+    :return: (list) The records.
+    """
+
+    return [record_class(f"{2000 + index % 25}PERS{index % BENCHMARK_PERSONS:02d}",
+                         f"Person {index % BENCHMARK_PERSONS}", "mf"[index % 2],
+                         BENCHMARK_EVENTS[index % len(BENCHMARK_EVENTS)], 500 + index % 5000,
+                         ResultType.SINGLE if index % 3 else ResultType.AVERAGE) for index in range(count)]
+
+
+def measure(record_class: Callable[..., Any], count: int) -> tuple[float, float]:
+    """
+    Measures the memory, which the records hold, and the time to create them.
+
+    :param record_class: (Callable) The class of the records.
+    :param count: (int) The number of records.
+    :return: (tuple) The memory in MiB and the time in seconds.
+    """
+
+    # The time is measured without tracing the allocations
+    gc.collect()
+    start = time.perf_counter()
+    records = create_records(record_class, count)
+    seconds = time.perf_counter() - start
+    del records
+
+    gc.collect()
+    tracemalloc.start()
+    records = create_records(record_class, count)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+
+    return memory / 1024 / 1024, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000000, help="number of records")
+    args = parser.parse_args()
+
+    # The records survive the round trip through the records file
+    records = create_records(Record, min(args.records, 200000))
+    if [Record.from_dict(record.to_dict()) for record in records] != records:
+        raise ValueError("Records differ after a round trip through their dictionaries")
+    del records
+
+    print(f"{args.records} records of {BENCHMARK_PERSONS} persons")
+    print(f"{'class':<13}{'MiB':>9}{'bytes/record':>14}{'seconds':>9}")
+    for record_class in (Record, PlainRecord):
+        memory, seconds = measure(record_class, args.records)
+        print(f"{record_class.__name__:<13}{memory:>9.1f}{memory * 1024 * 1024 / args.records:>14.0f}"
+              f"{seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
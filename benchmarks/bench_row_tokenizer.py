@@ -0,0 +1,123 @@
+"""
+Throughput benchmark of the row tokenizer - the rows of the persons and the ranks tables are filtered and parsed
+with "RowTokenizer" and with the split-based filters and the value-by-value parser, which it replaced. The kept
+rows and the parsed values of both are checked to be the same.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_row_tokenizer --persons 100000
+"""
+
+# Python dependencies
+import argparse
+import re
+import time
+from typing import Any, Callable
+
+# Project dependencies
+from benchmarks.fixtures import BENCHMARK_COUNTRY, format_sql_value, generate_export_tables
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, unescape_value
+
+# Value of a row, followed by a comma or the end of the row - the pattern of the value-by-value parser
+SPLIT_VALUE_PATTERN = re.compile(r"\s*(?:'((?:[^'\\]|\\.)*)'|(NULL)|([^,()']+?))\s*(?:,|$)", re.DOTALL)
+
+
+def split_row_filter(table: str) -> Callable[[str], bool]:
+    """
+    Returns the split-based filter of the rows of a table - the country rank is the last comma-separated field,
+    the country is anywhere in the row.
+
+    :param table: (str) The name of the table.
+    :return: (Callable) Function, which accepts a row and returns "True" if it should be kept.
+    """
+
+    if table == TABLE_PERSONS:
+        return lambda row: BENCHMARK_COUNTRY in row
+    return lambda row: int(row.strip("(),;").split(",")[-1]) == 1
+
+
+def split_parse(row: str) -> tuple[Any, ...]:
+    """
+    Parses a row value by value, with a match of the value pattern for every value.
+
+    :param row: (str) The row.
+    :return: (tuple) The values of the row.
+    """
+
+    row = row.strip().rstrip(",;")
+    if row.startswith("(") and row.endswith(")"):
+        row = row[1:-1]
+
+    values = []
+    position = 0
+    while position < len(row):
+        match = SPLIT_VALUE_PATTERN.match(row, position)
+        if match is None:
+            raise ValueError(f"Invalid value at position {position} of row {row!r}")
+        quoted, null, number = match.groups()
+
+        if quoted is not None:
+            values.append(unescape_value(quoted))
+        elif null is not None:
+            values.append(None)
+        else:
+            try:
+                values.append(int(number))
+            except ValueError:
+                values.append(float(number))
+        position = match.end()
+
+    return tuple(values)
+
+
+def measure(function: Callable[[str], Any], rows: list[str], repeat: int) -> tuple[float, list[Any]]:
+    """
+    Applies a function to every row.
+
+    :param function: (Callable) The function.
+    :param rows: (list) The rows.
+    :param repeat: (int) The number of runs, of which the fastest is taken.
+    :return: (tuple) The time of the fastest run in seconds and the results of the last run.
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = list(map(function, rows))
+        times.append(time.perf_counter() - start)
+    return min(times), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persons", type=int, default=50000, help="number of persons of the synthetic export")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration, the fastest is reported")
+    args = parser.parse_args()
+
+    tables = generate_export_tables(args.persons)
+    predicates = {TABLE_PERSONS: {COLUMN_COUNTRY_ID: BENCHMARK_COUNTRY}, TABLE_RANKS_SINGLE: {COLUMN_COUNTRY_RANK: 1}}
+
+    print(f"{'table':<14}{'operation':<11}{'rows':>9}{'split':>9}{'tokenizer':>11}{'speedup':>9}")
+    for table, table_predicates in predicates.items():
+        columns, values = tables[table]
+        # The rows as they are filtered - the stripped lines of the SQL dump, followed by a comma
+        rows = ["(" + ",".join(map(format_sql_value, row)) + ")," for row in values]
+        tokenizer = RowTokenizer([column for column, _ in columns])
+
+        split_seconds, split_kept = measure(split_row_filter(table), rows, args.repeat)
+        seconds, kept = measure(tokenizer.filter(table_predicates), rows, args.repeat)
+        if kept != split_kept:
+            raise ValueError(f"Rows of table `{table}` kept by the tokenizer differ from the split-based filter")
+        print(f"{table:<14}{'filter':<11}{len(rows):>9}{split_seconds:>9.3f}{seconds:>11.3f}"
+              f"{split_seconds / seconds:>9.2f}")
+
+        split_seconds, split_parsed = measure(split_parse, rows, args.repeat)
+        seconds, parsed = measure(tokenizer.parse, rows, args.repeat)
+        if parsed != split_parsed:
+            raise ValueError(f"Rows of table `{table}` parsed by the tokenizer differ from the split-based parser")
+        print(f"{table:<14}{'parse':<11}{len(rows):>9}{split_seconds:>9.3f}{seconds:>11.3f}"
+              f"{split_seconds / seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
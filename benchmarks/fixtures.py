@@ -0,0 +1,142 @@
+# Python dependencies
+import json
+import os
+import random
+import zipfile
+from typing import Any
+
+# Project dependencies
+from wca_nr_api.config.constants import *
+
+BENCHMARK_COUNTRY = "Bulgaria"
+BENCHMARK_EVENTS = ["333", "222", "444", "555", "666", "777", "333bf", "333fm", "333oh", "clock", "minx", "pyram",
+                    "skewb", "sq1", "444bf", "555bf", "333mbf"]
+BENCHMARK_CONTINENTS = {"Bulgaria": "_Europe", "Romania": "_Europe", "Germany": "_Europe", "Poland": "_Europe",
+                        "USA": "_North America", "Canada": "_North America", "China": "_Asia", "India": "_Asia",
+                        "Brazil": "_South America", "Australia": "_Oceania"}
+# Results of every rank of a person - the results table is the largest one of the export
+BENCHMARK_RESULTS_PER_RANK = 4
+BENCHMARK_COMPETITIONS = 500
+
+
+def generate_export_tables(persons: int, seed: int = 1) -> dict[str, tuple[list[tuple[str, str]], list[tuple]]]:
+    """
+    Generates the tables of a synthetic WCA export with the given number of persons. Every person is ranked in about
+    half of the events and has a few results for every rank, the ranks are consistent with the bests.
+
+    :param persons: (int) The number of persons.
+    :param seed: (int) The seed of the random generator, so that the export is the same for every run.
+    :return: (dict) Dictionary of {table: (columns with their SQL types, rows)}.
+    """
+
+    generator = random.Random(seed)
+    countries = list(BENCHMARK_CONTINENTS)
+
+    competitions = [(f"Competition{index}2024", f"Competition {index} 2024", countries[index % len(countries)],
+                     f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}") for index in range(BENCHMARK_COMPETITIONS)]
+    people = [(f"{2000 + index % 25}PERS{index:02d}", 1, f"Person {index}", countries[index % len(countries)],
+               generator.choice("mf")) for index in range(persons)]
+
+    tables = {
+        TABLE_COMPETITIONS: ([("id", "varchar(32)"), ("name", "varchar(50)"), ("country_id", "varchar(50)"),
+                              ("start_date", "date")], competitions),
+        TABLE_PERSONS: ([("wca_id", "varchar(10)"), ("sub_id", "tinyint"), ("name", "varchar(80)"),
+                         ("country_id", "varchar(50)"), ("gender", "char(1)")], people),
+    }
+
+    results = []
+    for table in (TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE):
+        rows = []
+        for event in BENCHMARK_EVENTS:
+            ranked = sorted((generator.randint(400, 90000), person) for person in people if generator.random() < 0.5)
+            continent_ranks, country_ranks = {}, {}
+            for world_rank, (best, (wca_id, _, name, country, _)) in enumerate(ranked, start=1):
+                continent = BENCHMARK_CONTINENTS[country]
+                continent_ranks[continent] = continent_ranks.get(continent, 0) + 1
+                country_ranks[country] = country_ranks.get(country, 0) + 1
+                rows.append((wca_id, event, best, world_rank, continent_ranks[continent], country_ranks[country]))
+
+                if table == TABLE_RANKS_SINGLE:
+                    for result in range(BENCHMARK_RESULTS_PER_RANK):
+                        competition = competitions[generator.randrange(BENCHMARK_COMPETITIONS)][0]
+                        results.append((competition, event, "f", best + result * 100, best + 500, name, wca_id,
+                                        country))
+        tables[table] = ([("person_id", "varchar(10)"), ("event_id", "varchar(6)"), ("best", "int"),
+                          ("world_rank", "int"), ("continent_rank", "int"), ("country_rank", "int")], rows)
+
+    tables[TABLE_RESULTS] = ([("competition_id", "varchar(32)"), ("event_id", "varchar(6)"),
+                              ("round_type_id", "char(1)"), ("best", "int"), ("average", "int"),
+                              ("person_name", "varchar(80)"), ("person_id", "varchar(10)"),
+                              ("person_country_id", "varchar(50)")], results)
+    return tables
+
+
+def write_sql_export(tables: dict[str, tuple[list[tuple[str, str]], list[tuple]]], folder: str) -> None:
+    """
+    Writes the tables as the SQL dump of the export, extracted and archived with the metadata, like the WCA does -
+    every row on its own line, with an INSERT statement for every batch of rows.
+
+    :param tables: (dict) Dictionary of {table: (columns with their SQL types, rows)}.
+    :param folder: (str) The folder of the export.
+    """
+
+    sql_dump_location = os.path.join(folder, EXPORTS_SQL_FILENAME)
+    with open(sql_dump_location, "w", encoding="utf-8") as f:
+        f.write("-- MySQL dump\n/*!40101 SET NAMES utf8mb4 */;\n")
+        for table, (columns, rows) in sorted(tables.items()):
+            f.write(f"DROP TABLE IF EXISTS `{table}`;\nCREATE TABLE `{table}` (\n")
+            f.write(",\n".join(f"  `{column}` {column_type} DEFAULT NULL" for column, column_type in columns))
+            f.write("\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;\n")
+            f.write(f"LOCK TABLES `{table}` WRITE;\n/*!40000 ALTER TABLE `{table}` DISABLE KEYS */;\n")
+            for start in range(0, len(rows), 5000):
+                batch = rows[start:start + 5000]
+                f.write(f"INSERT INTO `{table}` VALUES\n")
+                f.write(",\n".join("(" + ",".join(map(format_sql_value, row)) + ")" for row in batch) + ";\n")
+            f.write(f"/*!40000 ALTER TABLE `{table}` ENABLE KEYS */;\nUNLOCK TABLES;\n")
+
+    with zipfile.ZipFile(os.path.join(folder, EXPORTS_ARCHIVE_FILENAME), "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(EXPORTS_READ_ME_FILENAME, "Synthetic export for the benchmarks")
+        zf.writestr(EXPORTS_METADATA_FILENAME, json.dumps(get_export_metadata()))
+        zf.write(sql_dump_location, EXPORTS_SQL_FILENAME)
+
+
+def write_tsv_export(tables: dict[str, tuple[list[tuple[str, str]], list[tuple]]], folder: str) -> None:
+    """
+    Writes the tables as the TSV export - a TSV file with a header for every table, archived with the metadata.
+
+    :param tables: (dict) Dictionary of {table: (columns with their SQL types, rows)}.
+    :param folder: (str) The folder of the export.
+    """
+
+    with zipfile.ZipFile(os.path.join(folder, EXPORTS_TSV_ARCHIVE_FILENAME), "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(EXPORTS_READ_ME_FILENAME, "Synthetic export for the benchmarks")
+        zf.writestr(EXPORTS_METADATA_FILENAME, json.dumps(get_export_metadata()))
+        for table, (columns, rows) in tables.items():
+            lines = ["\t".join(column for column, _ in columns)]
+            lines.extend("\t".join("NULL" if value is None else str(value) for value in row) for row in rows)
+            zf.writestr(EXPORTS_TSV_MEMBER_FILENAME.format(table=table), "\n".join(lines) + "\n")
+
+
+def format_sql_value(value: Any) -> str:
+    """
+    Formats a value of a row as a literal of the SQL dump.
+
+    :param value: (Any) The value.
+    :return: (str) The literal of the value.
+    """
+
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def get_export_metadata() -> dict[str, Any]:
+    """
+    Returns the metadata of the synthetic export.
+
+    :return: (dict) The metadata with the format version and the date of the export.
+    """
+
+    return {"export_format_version": "v2.0.2", "export_date": "2026-09-01 00:00:13 UTC"}
@@ -0,0 +1,7 @@
+# Python dependencies
+import os
+import tempfile
+
+# The project logs to the logs folder of the working directory, so the tests run in a temporary one
+os.chdir(tempfile.mkdtemp(prefix="wca_nr_api_tests_"))
+os.makedirs("logs", exist_ok=True)
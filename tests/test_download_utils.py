@@ -0,0 +1,195 @@
+# Python dependencies
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+# Project dependencies
+from wca_nr_api.utils import download_utils
+from wca_nr_api.utils.download_utils import RangedDownloader
+
+CONTENT_SIZE = 10000
+RANGE_SIZE = 1000
+
+
+class RangeServer(ThreadingHTTPServer):
+    """
+    "RangeServer" serves a single file over HTTP in a background thread, optionally with support for ranged
+    requests. Requests for chunks can be set to drop the connection in the middle of the body, or to stall.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, content: bytes, accept_ranges: bool = True, honor_ranges: bool = True):
+        """
+        Initializer for the "RangeServer" class.
+
+        :param content: (bytes) The content of the served file.
+        :param accept_ranges: (bool) Whether the server announces the support for ranged requests.
+        :param honor_ranges: (bool) Whether the server answers the ranged requests with the requested chunk.
+        """
+
+        super().__init__(("127.0.0.1", 0), RangeHandler)
+        self.content = content
+        self.accept_ranges = accept_ranges
+        self.honor_ranges = honor_ranges
+        # Number of failures left by the first byte of the chunk
+        self.drops: dict[int, int] = {}
+        self.stalls: dict[int, int] = {}
+        self.requests: list[tuple[str, str | None]] = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/export.sql.zip"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+    def take_failure(self, failures: dict[int, int], start: int) -> bool:
+        """
+        Consumes a failure of the chunk, which starts at the given byte.
+
+        :param failures: (dict) The failures left by the first byte of the chunk.
+        :param start: (int) The first byte of the chunk.
+        :return: (bool) Whether the request for the chunk should fail.
+        """
+
+        with self._lock:
+            if failures.get(start, 0) > 0:
+                failures[start] -= 1
+                return True
+            return False
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", None))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.server.content)))
+        if self.server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", '"export"')
+        self.end_headers()
+
+    def do_GET(self):
+        content = self.server.content
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        self.server.requests.append(("GET", match.group(0) if match else None))
+
+        if match is None or not self.server.honor_ranges:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+            return
+
+        start, end = int(match.group(1)), int(match.group(2))
+        body = content[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        self.end_headers()
+
+        if self.server.take_failure(self.server.stalls, start):
+            # Longer than the read timeout of the tests
+            time.sleep(2)
+        if self.server.take_failure(self.server.drops, start):
+            # Drop the connection in the middle of the body
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RangedDownloaderTest(unittest.TestCase):
+    def setUp(self):
+        self.content = random.Random(0).randbytes(CONTENT_SIZE)
+        self.folder = tempfile.mkdtemp()
+        self.location = os.path.join(self.folder, "export.sql.zip")
+
+    def download(self, server: RangeServer, retries: int = 3) -> None:
+        RangedDownloader(server.url, self.location, connections=4, range_size=RANGE_SIZE, retries=retries).download()
+
+    def read(self) -> bytes:
+        with open(self.location, "rb") as f:
+            return f.read()
+
+    def ranged_requests(self, server: RangeServer) -> list[str]:
+        return [request for method, request in server.requests if method == "GET" and request is not None]
+
+    def test_ranged_download(self):
+        with RangeServer(self.content) as server:
+            self.download(server)
+
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(len(self.ranged_requests(server)), CONTENT_SIZE // RANGE_SIZE)
+        self.assertFalse(os.path.exists(self.location + ".parts"))
+
+    def test_dropped_connections_are_retried(self):
+        with RangeServer(self.content) as server:
+            server.drops = {0: 1, 3000: 2, 9000: 1}
+            self.download(server)
+
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(len(self.ranged_requests(server)), CONTENT_SIZE // RANGE_SIZE + 4)
+
+    def test_stalled_chunks_time_out_and_are_retried(self):
+        with RangeServer(self.content) as server, mock.patch.object(download_utils, "EXPORTS_DOWNLOAD_TIMEOUT",
+                                                                    (1, 0.5)):
+            server.stalls = {2000: 1}
+            self.download(server)
+
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(self.ranged_requests(server).count("bytes=2000-2999"), 2)
+
+    def test_failed_chunks_are_raised_and_resumed(self):
+        with RangeServer(self.content) as server:
+            server.drops = {5000: 2}
+            with self.assertRaisesRegex(Exception, "Failed to download 1 chunks"):
+                self.download(server, retries=2)
+            self.assertTrue(os.path.exists(self.location + ".parts"))
+
+            # Only the missing chunk is fetched again
+            server.requests.clear()
+            self.download(server)
+
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(self.ranged_requests(server), ["bytes=5000-5999"])
+        self.assertFalse(os.path.exists(self.location + ".parts"))
+
+    def test_server_without_ranges(self):
+        with RangeServer(self.content, accept_ranges=False) as server:
+            self.download(server)
+
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(server.requests, [("HEAD", None), ("GET", None)])
+
+    def test_ranges_answered_with_whole_file_fall_back_to_single_connection(self):
+        with RangeServer(self.content, honor_ranges=False) as server:
+            self.download(server)
+
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(server.requests[-1], ("GET", None))
+        self.assertFalse(os.path.exists(self.location + ".parts"))
+
+
+if __name__ == "__main__":
+    unittest.main()
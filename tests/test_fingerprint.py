@@ -0,0 +1,75 @@
+# Python dependencies
+import unittest
+from unittest import mock
+
+# Project dependencies
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils.fingerprint import FilteredRowsFingerprint, get_schema_fingerprint
+
+PERSONS_STATEMENT = ("CREATE TABLE `persons` (`wca_id` varchar(10),`sub_id` tinyint,`name` varchar(80),"
+                     "`country_id` varchar(50),`gender` char(1));")
+RANKS_STATEMENT = ("CREATE TABLE `{table}` (`person_id` varchar(10),`event_id` varchar(6),`best` int,"
+                   "`world_rank` int,`continent_rank` int,`country_rank` int);")
+
+PERSONS = [("2010AAAA01", 1, "First Person", "Bulgaria", "m"),
+           ("2010AAAA01", 2, "First Person", "Romania", "m"),
+           ("2011BBBB01", 1, "Second Person", "Bulgaria", "f")]
+RANKS = {
+    TABLE_RANKS_AVERAGE: [("2010AAAA01", "333", 700, 10, 3, 1), ("2011BBBB01", "333", 800, 20, 5, 2)],
+    TABLE_RANKS_SINGLE: [("2011BBBB01", "333", 500, 1, 1, 1), ("2012CCCC01", "222", 100, 1, 1, 1)],
+}
+
+
+def fingerprint_tables(tables: list[str], persons: list[tuple] = PERSONS) -> FilteredRowsFingerprint:
+    """
+    Passes the rows of the tables through a fingerprint, in the given order of the tables.
+
+    :param tables: (list) The order of the tables.
+    :param persons: (list) The rows of the persons.
+    :return: (FilteredRowsFingerprint) The fingerprint of the rows.
+    """
+
+    fingerprint = FilteredRowsFingerprint().wrap(mock.Mock())
+    for table in tables:
+        if table == TABLE_PERSONS:
+            fingerprint.create_table(table, PERSONS_STATEMENT)
+            fingerprint.insert_rows(table, persons)
+        else:
+            fingerprint.create_table(table, RANKS_STATEMENT.format(table=table))
+            fingerprint.insert_rows(table, RANKS[table])
+    return fingerprint
+
+
+class FilteredRowsFingerprintTest(unittest.TestCase):
+    def test_ranks_before_the_persons_have_the_same_fingerprint(self):
+        expected = fingerprint_tables([TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE]).hexdigest()
+
+        self.assertEqual(fingerprint_tables([TABLE_RANKS_AVERAGE, TABLE_PERSONS, TABLE_RANKS_SINGLE]).hexdigest(),
+                         expected)
+        self.assertEqual(fingerprint_tables([TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE, TABLE_PERSONS]).hexdigest(),
+                         expected)
+
+    def test_fingerprint_is_stable(self):
+        fingerprint = fingerprint_tables([TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE])
+
+        self.assertEqual(fingerprint.hexdigest(), fingerprint.hexdigest())
+        self.assertEqual(fingerprint.to_metadata()["rows_fingerprint"], fingerprint.hexdigest())
+
+    def test_only_current_rows_of_the_persons_are_hashed(self):
+        tables = [TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE]
+
+        self.assertEqual(fingerprint_tables(tables, [PERSONS[0], PERSONS[2]]).hexdigest(),
+                         fingerprint_tables(tables).hexdigest())
+        self.assertNotEqual(fingerprint_tables(tables, [PERSONS[1], PERSONS[2]]).hexdigest(),
+                            fingerprint_tables(tables).hexdigest())
+
+    def test_changed_columns_are_raised(self):
+        columns = ["wca_id", "sub_id", "name", "country_id"]
+        fingerprint = FilteredRowsFingerprint({TABLE_PERSONS: get_schema_fingerprint(columns)}).wrap(mock.Mock())
+
+        with self.assertRaisesRegex(ValueError, "Different columns of table `persons`"):
+            fingerprint.create_table(TABLE_PERSONS, PERSONS_STATEMENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# Python dependencies
+import unittest
+
+# Project dependencies
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.utils.progression_utils import compute_event_progression, merge_round_results, reduce_results_chunk
+
+RESULTS_COLUMNS = ["competition_id", "event_id", "round_type_id", "best", "average", "person_name", "person_id",
+                   "person_country_id"]
+COMPETITION_DATES = {"A2020": "2020-01-01", "B2020": "2020-05-01", "C2020": "2020-06-01", "D2021": "2021-01-01",
+                     "E2021": "2021-02-01"}
+
+# Best results of the rounds of an event - (country, type of result, competition ID, round type, result, holders)
+ROUNDS = [
+    ("Bulgaria", ResultType.SINGLE, "E2021", "1", 750, [("2012FOUR01", "Four")]),
+    ("Bulgaria", ResultType.SINGLE, "B2020", "f", 800, [("2012TWOO01", "Two")]),
+    ("Bulgaria", ResultType.SINGLE, "A2020", "f", 900, [("2012ONEE01", "One")]),
+    # The first round of the same competition comes before the final
+    ("Bulgaria", ResultType.SINGLE, "B2020", "1", 850, [("2012SEVN01", "Seven")]),
+    # Worse than the record
+    ("Bulgaria", ResultType.SINGLE, "C2020", "1", 1000, [("2012FIVE01", "Five")]),
+    # Ties the record - a new holder holds it together with the current one, who does not hold it again
+    ("Bulgaria", ResultType.SINGLE, "C2020", "f", 800, [("2012THRE01", "Three"), ("2012TWOO01", "Two")]),
+    ("Bulgaria", ResultType.SINGLE, "D2021", "f", 800, [("2012TWOO01", "Two")]),
+    # Competition without a date
+    ("Bulgaria", ResultType.SINGLE, "X2021", "f", 100, [("2012SIXX01", "Six")]),
+    ("Romania", ResultType.AVERAGE, "C2020", "f", 1200, [("2012EIGT01", "Eight")]),
+]
+
+
+class ProgressionTest(unittest.TestCase):
+    def test_running_minimum_with_ties_and_superseded_records(self):
+        progression = compute_event_progression(ROUNDS, COMPETITION_DATES)
+
+        self.assertEqual(progression, {
+            ("Bulgaria", ResultType.SINGLE): [
+                ["2012ONEE01", "One", 900, "A2020", "2020-01-01", "2020-05-01"],
+                ["2012SEVN01", "Seven", 850, "B2020", "2020-05-01", "2020-05-01"],
+                ["2012TWOO01", "Two", 800, "B2020", "2020-05-01", "2021-02-01"],
+                ["2012THRE01", "Three", 800, "C2020", "2020-06-01", "2021-02-01"],
+                ["2012FOUR01", "Four", 750, "E2021", "2021-02-01", None],
+            ],
+            ("Romania", ResultType.AVERAGE): [
+                ["2012EIGT01", "Eight", 1200, "C2020", "2020-06-01", None],
+            ],
+        })
+
+    def test_best_results_of_a_round_are_merged_across_chunks(self):
+        first_chunk = ["('A2020','333','f',800,900,'One','2012ONEE01','Bulgaria'),",
+                       "('A2020','333','f',-1,0,'Two','2012TWOO01','Bulgaria'),",
+                       "('A2020','333','f',700,1000,'Three','2012THRE01','Romania'),"]
+        second_chunk = [("A2020", "333", "f", "800", "950", "Four", "2012FOUR01", "Bulgaria")]
+
+        rounds = reduce_results_chunk(RESULTS_COLUMNS, first_chunk, False, {"Bulgaria"})
+        merge_round_results(rounds, reduce_results_chunk(RESULTS_COLUMNS, second_chunk, True, {"Bulgaria"}))
+
+        self.assertEqual(rounds, {
+            ("333", "Bulgaria", ResultType.SINGLE, "A2020", "f"): (800, [("2012ONEE01", "One"),
+                                                                        ("2012FOUR01", "Four")]),
+            ("333", "Bulgaria", ResultType.AVERAGE, "A2020", "f"): (900, [("2012ONEE01", "One")]),
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
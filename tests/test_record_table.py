@@ -0,0 +1,120 @@
+# Python dependencies
+import unittest
+
+# Project dependencies
+from wca_nr_api.classes.event import Event
+from wca_nr_api.classes.gender import Gender
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.region import Region
+from wca_nr_api.classes.record_table import RecordTable
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils.records_engine import RecordsEngine
+
+PERSONS_STATEMENT = ("CREATE TABLE `persons` (`wca_id` varchar(10),`sub_id` tinyint,`name` varchar(80),"
+                     "`country_id` varchar(50),`gender` char(1));")
+RANKS_STATEMENT = ("CREATE TABLE `{table}` (`person_id` varchar(10),`event_id` varchar(6),`best` int,"
+                   "`world_rank` int,`continent_rank` int,`country_rank` int);")
+
+# Rows of (country, person_id, event, result, result_type, regions)
+ROWS = [
+    ("Bulgaria", "2010AAAA01", Event.THREE_X_THREE, 600, ResultType.SINGLE, {Region.CONTINENT}),
+    ("Bulgaria", "2011BBBB01", Event.THREE_X_THREE, 600, ResultType.SINGLE, set()),
+    ("Bulgaria", "2010AAAA01", Event.THREE_X_THREE, 700, ResultType.AVERAGE, set()),
+    ("Romania", "2012CCCC01", Event.THREE_X_THREE, 500, ResultType.SINGLE, {Region.WORLD, Region.CONTINENT}),
+    ("Romania", "2012CCCC01", Event.TWO_X_TWO, 150, ResultType.SINGLE, set()),
+    ("Bulgaria", "2013DDDD01", Event.THREE_X_THREE, 550, ResultType.SINGLE, set()),
+    ("Romania", "2014EEEE01", Event.TWO_X_TWO, 150, ResultType.SINGLE, {Region.WORLD}),
+]
+
+
+def create_table(rows: list[tuple] = ROWS) -> RecordTable:
+    """
+    Creates a table of the given rows.
+
+    :param rows: (list) The rows of (country, person_id, event, result, result_type, regions).
+    :return: (RecordTable) The table.
+    """
+
+    table = RecordTable()
+    for country, person_id, event, result, result_type, regions in rows:
+        table.append_row(country, person_id, f"Name {person_id}", Gender.MALE, event, result, result_type, regions)
+    return table
+
+
+class RecordTableTest(unittest.TestCase):
+    def test_filter_matches_all_values(self):
+        table = create_table()
+
+        self.assertEqual(table.filter(), list(range(len(ROWS))))
+        self.assertEqual(table.filter(event=Event.TWO_X_TWO), [4, 6])
+        self.assertEqual(table.filter(result_type=ResultType.AVERAGE), [2])
+        self.assertEqual(table.filter(country="Romania", result_type=ResultType.SINGLE), [3, 4, 6])
+        self.assertEqual(table.filter(region=Region.WORLD), [3, 6])
+        self.assertEqual(table.filter(event=Event.THREE_X_THREE, region=Region.CONTINENT), [0, 3])
+        self.assertEqual(table.filter(country="USA"), [])
+
+    def test_country_mask_compares_both_bytes(self):
+        # Countries 44 and 300 share the low byte of their two-byte codes, 256 and 0 share the high one
+        rows = [(f"Country {index}", f"2010{index:04d}01", Event.THREE_X_THREE, 1000 + index, ResultType.SINGLE,
+                 set()) for index in range(301)]
+        table = create_table(rows)
+
+        for index in (0, 44, 255, 256, 300):
+            self.assertEqual(table.filter(country=f"Country {index}"), [index])
+            self.assertEqual(table.country(index), f"Country {index}")
+
+    def test_group_min_keeps_the_tied_rows(self):
+        table = create_table()
+
+        self.assertEqual(table.group_min(), {
+            ("Bulgaria", Event.THREE_X_THREE, ResultType.SINGLE): (550, [5]),
+            ("Bulgaria", Event.THREE_X_THREE, ResultType.AVERAGE): (700, [2]),
+            ("Romania", Event.THREE_X_THREE, ResultType.SINGLE): (500, [3]),
+            ("Romania", Event.TWO_X_TWO, ResultType.SINGLE): (150, [4, 6]),
+        })
+        self.assertEqual(table.group_min([0, 1, 2]), {
+            ("Bulgaria", Event.THREE_X_THREE, ResultType.SINGLE): (600, [0, 1]),
+            ("Bulgaria", Event.THREE_X_THREE, ResultType.AVERAGE): (700, [2]),
+        })
+        self.assertEqual(table.group_min(table.filter(region=Region.WORLD)), {
+            ("Romania", Event.THREE_X_THREE, ResultType.SINGLE): (500, [3]),
+            ("Romania", Event.TWO_X_TWO, ResultType.SINGLE): (150, [6]),
+        })
+        self.assertEqual(table.group_min([]), {})
+        self.assertEqual(RecordTable().group_min(), {})
+
+    def test_records_round_trip(self):
+        table = RecordTable()
+        record = Record("2010AAAA01", "First Person", "f", "333oh", 1200, ResultType.AVERAGE)
+        table.append("Bulgaria", record)
+
+        self.assertEqual(list(table.records()), [record])
+
+    def test_records_without_an_event_or_a_gender_are_rejected(self):
+        table = RecordTable()
+
+        with self.assertRaises(ValueError):
+            table.append_row("Bulgaria", "2010AAAA01", "First Person", Gender.MALE, None, 100, ResultType.SINGLE)
+        with self.assertRaises(ValueError):
+            table.append_row("Bulgaria", "2010AAAA01", "First Person", None, Event.THREE_X_THREE, 100,
+                             ResultType.SINGLE)
+        self.assertEqual(len(table), 0)
+
+    def test_records_of_removed_events_are_not_joined(self):
+        engine = RecordsEngine()
+        engine.create_table(TABLE_PERSONS, PERSONS_STATEMENT)
+        engine.insert_rows(TABLE_PERSONS, [("2010AAAA01", 1, "First Person", "Bulgaria", "m")])
+        engine.create_table(TABLE_RANKS_SINGLE, RANKS_STATEMENT.format(table=TABLE_RANKS_SINGLE))
+        engine.insert_rows(TABLE_RANKS_SINGLE, [("2010AAAA01", "333mbo", 3000, 1, 1, 1),
+                                                ("2010AAAA01", "333", 600, 2, 2, 1)])
+
+        records = engine.to_records()
+
+        self.assertEqual([record for event_records in records.records.values() for record in event_records],
+                         [Record("2010AAAA01", "First Person", "m", "333", 600, ResultType.SINGLE)])
+        self.assertEqual(engine.countries(), ["Bulgaria"])
+
+
+if __name__ == "__main__":
+    unittest.main()
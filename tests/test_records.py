@@ -0,0 +1,157 @@
+# Python dependencies
+import random
+import unittest
+
+# Project dependencies
+from wca_nr_api.classes.event import Event
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.records import Records
+from wca_nr_api.classes.result_type import ResultType
+
+EVENTS = ["333", "222", "333bf", "sq1"]
+
+
+def scan_for_new_records(records: Records, old_records: Records, allow_vacant: bool) -> list[Record]:
+    """
+    Compares the records by scanning the lists of every event, as before the records were indexed.
+
+    :param records: (Records) The new records.
+    :param old_records: (Records) The old records.
+    :param allow_vacant: (bool) Whether the records of an event are new, if the event had no old records.
+    :return: (list) The new records.
+    """
+
+    new_records = []
+    for event, event_records in records.records.items():
+        old_event_records = old_records.records.get(event)
+        for result_type in (ResultType.SINGLE, ResultType.AVERAGE):
+            current = [record for record in event_records if record.result_type == result_type]
+            old = [record for record in old_event_records if record.result_type == result_type]
+
+            if current and not old and allow_vacant:
+                new_records.extend(current)
+            elif current and old:
+                if current[0].result < old[0].result:
+                    new_records.extend(current)
+                elif len(current) > len(old):
+                    new_records.extend(set(current) - set(old))
+    return new_records
+
+
+def create_records(holders: dict[tuple[str, ResultType], tuple[int, list[str]]]) -> Records:
+    """
+    Creates the records from their results and holders.
+
+    :param holders: (dict) Dictionary of {(event, result_type): (result, [WCA ID])}.
+    :return: (Records) The records.
+    """
+
+    return Records.from_records(Record(person_id, f"Name {person_id}", "m", event, result, result_type)
+                                for (event, result_type), (result, person_ids) in holders.items()
+                                for person_id in person_ids)
+
+
+def sort_records(records: list[Record]) -> list[tuple]:
+    """
+    Returns the event, the type of result and the person of the records, sorted - the previous scan returned
+    the new tied records as a set.
+
+    :param records: (list) The records.
+    :return: (list) The sorted keys of the records.
+    """
+
+    return sorted((record.event.value, record.result_type.value, record.person_id) for record in records)
+
+
+class CheckForNewRecordsTest(unittest.TestCase):
+    def setUp(self):
+        self.old_records = create_records({
+            ("333", ResultType.SINGLE): (500, ["2010AAAA01"]),
+            ("333", ResultType.AVERAGE): (700, ["2010AAAA01"]),
+            ("222", ResultType.SINGLE): (100, ["2011BBBB01", "2012CCCC01"]),
+        })
+
+    def assert_same_as_scan(self, records: Records, allow_vacant: bool = False) -> list[Record]:
+        new_records = records.check_for_new_records(self.old_records, allow_vacant)
+        self.assertEqual(sort_records(new_records), sort_records(scan_for_new_records(records, self.old_records,
+                                                                                      allow_vacant)))
+        return new_records
+
+    def test_unchanged_records(self):
+        self.assertEqual(self.assert_same_as_scan(self.old_records), [])
+
+    def test_better_result(self):
+        records = create_records({
+            ("333", ResultType.SINGLE): (500, ["2010AAAA01"]),
+            ("333", ResultType.AVERAGE): (650, ["2013DDDD01"]),
+            ("222", ResultType.SINGLE): (100, ["2011BBBB01", "2012CCCC01"]),
+        })
+
+        self.assertEqual(sort_records(self.assert_same_as_scan(records)),
+                         [(Event.THREE_X_THREE.value, ResultType.AVERAGE.value, "2013DDDD01")])
+
+    def test_tied_result(self):
+        records = create_records({
+            ("333", ResultType.SINGLE): (500, ["2010AAAA01", "2013DDDD01"]),
+            ("333", ResultType.AVERAGE): (700, ["2010AAAA01"]),
+            ("222", ResultType.SINGLE): (100, ["2011BBBB01", "2012CCCC01", "2014EEEE01"]),
+        })
+
+        self.assertEqual(sort_records(self.assert_same_as_scan(records)),
+                         [(Event.THREE_X_THREE.value, ResultType.SINGLE.value, "2013DDDD01"),
+                          (Event.TWO_X_TWO.value, ResultType.SINGLE.value, "2014EEEE01")])
+
+    def test_better_result_of_tied_holders(self):
+        records = create_records({
+            ("333", ResultType.SINGLE): (500, ["2010AAAA01"]),
+            ("333", ResultType.AVERAGE): (700, ["2010AAAA01"]),
+            ("222", ResultType.SINGLE): (90, ["2011BBBB01"]),
+        })
+
+        self.assertEqual(sort_records(self.assert_same_as_scan(records)),
+                         [(Event.TWO_X_TWO.value, ResultType.SINGLE.value, "2011BBBB01")])
+
+    def test_vacant_records(self):
+        records = create_records({
+            ("333", ResultType.SINGLE): (500, ["2010AAAA01"]),
+            ("333", ResultType.AVERAGE): (700, ["2010AAAA01"]),
+            ("222", ResultType.SINGLE): (100, ["2011BBBB01", "2012CCCC01"]),
+            ("sq1", ResultType.AVERAGE): (900, ["2013DDDD01"]),
+        })
+
+        self.assertEqual(self.assert_same_as_scan(records, allow_vacant=False), [])
+        self.assertEqual(sort_records(self.assert_same_as_scan(records, allow_vacant=True)),
+                         [(Event.SQUARE_1.value, ResultType.AVERAGE.value, "2013DDDD01")])
+
+    def test_random_records(self):
+        generator = random.Random(1)
+        persons = [f"2010PERS{index:02d}" for index in range(6)]
+
+        for _ in range(500):
+            old_holders, holders = {}, {}
+            for event in EVENTS:
+                for result_type in ResultType:
+                    if generator.random() < 0.2:
+                        continue
+                    result = generator.randint(100, 105)
+                    old_holders[(event, result_type)] = (result, generator.sample(persons, generator.randint(1, 3)))
+                    # The record is kept, tied by more holders or improved
+                    new_result = result - generator.choice([0, 0, 1])
+                    holders[(event, result_type)] = (new_result, old_holders[(event, result_type)][1][:]
+                                                      if new_result == result else generator.sample(persons, 1))
+                    if new_result == result and generator.random() < 0.5:
+                        holders[(event, result_type)][1].append(
+                            generator.choice([person for person in persons
+                                              if person not in old_holders[(event, result_type)][1]]))
+                # A record, which was not held before
+                if generator.random() < 0.2:
+                    holders[(event, ResultType.AVERAGE)] = (200, generator.sample(persons, 2))
+                    old_holders.pop((event, ResultType.AVERAGE), None)
+
+            self.old_records = create_records(old_holders)
+            for allow_vacant in (False, True):
+                self.assert_same_as_scan(create_records(holders), allow_vacant)
+
+
+if __name__ == "__main__":
+    unittest.main()
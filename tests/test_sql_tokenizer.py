@@ -0,0 +1,109 @@
+# Python dependencies
+import unittest
+
+# Project dependencies
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns, to_sql_literal
+
+PERSONS_COLUMNS = ["wca_id", "sub_id", "name", "country_id", "gender"]
+RANKS_COLUMNS = ["person_id", "event_id", "best", "world_rank", "continent_rank", "country_rank"]
+
+
+class RowTokenizerTest(unittest.TestCase):
+    def setUp(self):
+        self.persons = RowTokenizer(PERSONS_COLUMNS)
+        self.ranks = RowTokenizer(RANKS_COLUMNS)
+
+    def test_escaped_quotes_are_unescaped(self):
+        self.assertEqual(self.persons.parse("('2012PERS01',1,'O\\'Neil \\\\ \\\"Jr\\\"','Ireland','m'),"),
+                         ("2012PERS01", 1, "O'Neil \\ \"Jr\"", "Ireland", "m"))
+        self.assertEqual(self.persons.parse("('2012PERS01',1,'Line\\nbreak','Ireland','m');"),
+                         ("2012PERS01", 1, "Line\nbreak", "Ireland", "m"))
+
+    def test_null_is_none(self):
+        self.assertEqual(self.persons.parse("('2012PERS01',NULL,'Name','Ireland',NULL)"),
+                         ("2012PERS01", None, "Name", "Ireland", None))
+
+    def test_commas_and_parentheses_in_quoted_strings(self):
+        row = "('2012PERS01',1,'Smith, John (Jr.), \\'JJ\\'','Ireland','m'),"
+
+        self.assertEqual(self.persons.tokens(row),
+                         ("'2012PERS01'", "1", "'Smith, John (Jr.), \\'JJ\\''", "'Ireland'", "'m'"))
+        self.assertEqual(self.persons.parse(row)[2], "Smith, John (Jr.), 'JJ'")
+
+    def test_negative_and_decimal_numbers(self):
+        self.assertEqual(self.ranks.parse("('2012PERS01','333',-1,2.5,-0.25,1e3)"),
+                         ("2012PERS01", "333", -1, 2.5, -0.25, 1000.0))
+
+    def test_rows_with_other_columns_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.persons.parse("('2012PERS01',1,'Name','Ireland')")
+
+    def test_rows_of_a_statement(self):
+        statement = "INSERT INTO `ranks_single` VALUES ('2012PERS01','333',600,1,1,1),('2013PERS01','2,2',-1,2,2,NULL);"
+
+        self.assertEqual(list(self.ranks.iter_rows(statement)), [("2012PERS01", "333", 600, 1, 1, 1),
+                                                                 ("2013PERS01", "2,2", -1, 2, 2, None)])
+
+    def test_literal_of_the_first_column(self):
+        row_filter = self.persons.filter({"wca_id": "2012PERS01"})
+
+        self.assertTrue(row_filter("('2012PERS01',1,'Name','Ireland','m'),"))
+        self.assertFalse(row_filter("('2012PERS02',1,'Name','Ireland','m'),"))
+        # The literal is in the row, but not in the first column
+        self.assertFalse(row_filter("('2012PERS02',1,'2012PERS01','Ireland','m'),"))
+
+    def test_literal_of_the_middle_column(self):
+        row_filter = self.ranks.filter({"best": 600})
+
+        self.assertTrue(row_filter("('2012PERS01','333',600,1,1,1),"))
+        self.assertFalse(row_filter("('2012PERS01','333',6000,1,1,1),"))
+        self.assertFalse(row_filter("('2012PERS01','333',-600,1,1,1),"))
+        # The literal is in the row, but in another column
+        self.assertFalse(row_filter("('2012PERS01','333',700,600,1,1),"))
+
+    def test_literal_of_the_last_column(self):
+        row_filter = self.ranks.filter({"country_rank": 1})
+
+        self.assertTrue(row_filter("('2012PERS01','333',600,5,3,1),"))
+        self.assertTrue(row_filter("('2012PERS01','333',600,5,3,1);"))
+        self.assertFalse(row_filter("('2012PERS01','333',600,5,3,11),"))
+        self.assertFalse(row_filter("('2012PERS01','333',600,1,1,-1),"))
+        self.assertFalse(row_filter("('2012PERS01','333',600,1,1,2),"))
+
+    def test_function_of_the_last_column(self):
+        row_filter = self.ranks.filter({"country_rank": lambda rank: rank is not None and 1 <= rank <= 10})
+
+        self.assertTrue(row_filter("('2012PERS01','333',600,5,3,10),"))
+        self.assertFalse(row_filter("('2012PERS01','333',600,5,3,11),"))
+        self.assertFalse(row_filter("('2012PERS01','333',600,5,3,NULL),"))
+
+    def test_country_in_another_field(self):
+        row_filter = self.persons.filter({"country_id": "Bulgaria"})
+
+        self.assertTrue(row_filter("('2012PERS01',1,'First Person','Bulgaria','m'),"))
+        self.assertFalse(row_filter("('2012PERS02',1,'Bulgaria','Romania','m'),"))
+        self.assertFalse(row_filter("('2012PERS03',1,'Fan of Bulgaria, \\'Bulgaria\\'','Romania','f'),"))
+        self.assertFalse(row_filter("('2012PERS04',1,'Person','Bulgaria2','f'),"))
+
+    def test_predicates_of_unknown_columns_are_rejected(self):
+        with self.assertRaises(KeyError):
+            self.persons.filter({"continent_id": "_Europe"})
+
+
+class CreateTableColumnsTest(unittest.TestCase):
+    def test_keys_are_skipped(self):
+        statement = ("CREATE TABLE `persons` (\n  `wca_id` varchar(10) NOT NULL DEFAULT '',\n"
+                     "  `name` varchar(80) DEFAULT NULL,\n  `country_id` varchar(50) DEFAULT NULL,\n"
+                     "  PRIMARY KEY (`wca_id`),\n  KEY `persons_country` (`country_id`)\n) ENGINE=InnoDB;")
+
+        self.assertEqual(parse_create_table_columns(statement), ["wca_id", "name", "country_id"])
+
+    def test_literals_round_trip(self):
+        tokenizer = RowTokenizer(["text", "number", "nothing"])
+        values = ("O'Neil \\ (1, 2)", -12.5, None)
+
+        self.assertEqual(tokenizer.parse("(" + ",".join(map(to_sql_literal, values)) + ")"), values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# Python dependencies
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+# Project dependencies
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils import file_utils, sql_utils
+
+# Every INSERT statement ends with a row, which the filter drops
+SQL_DUMP = """-- MySQL dump
+DROP TABLE IF EXISTS `persons`;
+CREATE TABLE `persons` (
+  `wca_id` varchar(10) DEFAULT NULL,
+  `sub_id` tinyint DEFAULT NULL,
+  `name` varchar(80) DEFAULT NULL,
+  `country_id` varchar(50) DEFAULT NULL,
+  `gender` char(1) DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40000 ALTER TABLE `persons` DISABLE KEYS */;
+INSERT INTO `persons` VALUES
+('2010AAAA01',1,'First Person','Bulgaria','m'),
+('2010BBBB01',1,'Second Person','Romania','f'),
+('2011CCCC01',1,'O\\'Third, Person','Bulgaria','f'),
+('2012DDDD01',1,'Fourth Person','Romania','m');
+INSERT INTO `persons` VALUES
+('2013EEEE01',1,'Fifth Person','Bulgaria',NULL),
+('2013FFFF01',1,'Sixth Person','USA','m');
+/*!40000 ALTER TABLE `persons` ENABLE KEYS */;
+DROP TABLE IF EXISTS `ranks_single`;
+CREATE TABLE `ranks_single` (
+  `person_id` varchar(10) DEFAULT NULL,
+  `event_id` varchar(6) DEFAULT NULL,
+  `best` int DEFAULT NULL,
+  `world_rank` int DEFAULT NULL,
+  `continent_rank` int DEFAULT NULL,
+  `country_rank` int DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+/*!40000 ALTER TABLE `ranks_single` DISABLE KEYS */;
+INSERT INTO `ranks_single` VALUES
+('2010AAAA01','333',600,1,1,1),
+('2010BBBB01','333',700,2,2,1),
+('2011CCCC01','333',800,3,3,11),
+('2010AAAA01','222',150,1,1,1),
+('2012DDDD01','222',250,5,4,12);
+/*!40000 ALTER TABLE `ranks_single` ENABLE KEYS */;
+"""
+
+
+class RecordingOutput:
+    """
+    "RecordingOutput" records the calls of the filter, so that the outputs of the scan modes can be compared.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def drop_tables(self, tables: list[str]) -> None:
+        self.calls.append(("drop_tables", tables))
+
+    def create_table(self, table: str, statement: str) -> None:
+        self.calls.append(("create_table", table, statement))
+
+    def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+        self.calls.append(("insert", table, insert_statement, values))
+
+
+class FilterSqlDumpTest(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(EXPORTS_FOLDER, exist_ok=True)
+        with open(os.path.join(EXPORTS_FOLDER, EXPORTS_SQL_FILENAME), "w", encoding="utf-8") as f:
+            f.write(SQL_DUMP)
+
+        patchers = [
+            mock.patch.dict(os.environ, {"WCA_COUNTRY": "Bulgaria", "WCA_COUNTRIES": ""}),
+            mock.patch.object(file_utils, "SQL_DUMP_SOURCE", SQL_DUMP_SOURCE_EXTRACTED),
+            # Ranges of a few rows, so that the statements are split between the workers
+            mock.patch.multiple(sql_utils, SQL_DUMP_PARALLEL_RANGE_SIZE=64, SQL_DUMP_PARALLEL_WORKERS=2),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def filter(self, scan_mode: str) -> list[tuple]:
+        output = RecordingOutput()
+        with mock.patch.object(sql_utils, "SQL_DUMP_SCAN_MODE", scan_mode):
+            sql_utils.filter_sql_dump([TABLE_PERSONS, TABLE_RANKS_SINGLE], output=output)
+        return output.calls
+
+    def test_line_scan_keeps_the_filtered_rows(self):
+        inserts = [call[1:] for call in self.filter(SQL_DUMP_SCAN_MODE_LINES) if call[0] == "insert"]
+
+        self.assertEqual(inserts, [
+            ("persons", "INSERT INTO `persons` VALUES", ["('2010AAAA01',1,'First Person','Bulgaria','m')",
+                                                         "('2011CCCC01',1,'O\\'Third, Person','Bulgaria','f')"]),
+            ("persons", "INSERT INTO `persons` VALUES", ["('2013EEEE01',1,'Fifth Person','Bulgaria',NULL)"]),
+            ("ranks_single", "INSERT INTO `ranks_single` VALUES", ["('2010AAAA01','333',600,1,1,1)",
+                                                                   "('2010BBBB01','333',700,2,2,1)",
+                                                                   "('2010AAAA01','222',150,1,1,1)"]),
+        ])
+
+    def test_memory_mapped_scans_match_the_line_scan(self):
+        expected = self.filter(SQL_DUMP_SCAN_MODE_LINES)
+
+        self.assertEqual(self.filter(SQL_DUMP_SCAN_MODE_MMAP), expected)
+        self.assertEqual(self.filter(SQL_DUMP_SCAN_MODE_PARALLEL), expected)
+
+    def test_prefiltered_rows_are_not_filtered_again(self):
+        row_filter = mock.Mock(return_value=False)
+        with mock.patch.object(sql_utils, "get_row_filter", return_value=row_filter), \
+                ProcessPoolExecutor(max_workers=1) as executor, file_utils.map_sql_dump() as sql_dump_map:
+            lines = list(sql_utils.iter_sql_dump_sections_parallel(sql_dump_map, [TABLE_RANKS_SINGLE], executor))
+            sql_utils.filter_sql_lines(lines, [TABLE_RANKS_SINGLE], RecordingOutput(),
+                                       sql_utils.get_prefiltered_row_filter)
+
+        # Only the row, which ends the INSERT statement, is filtered in this process
+        row_filter.assert_called_once_with("('2012DDDD01','222',250,5,4,12);")
+
+
+if __name__ == "__main__":
+    unittest.main()
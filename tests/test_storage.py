@@ -0,0 +1,85 @@
+# Python dependencies
+import os
+import shutil
+import unittest
+from unittest import mock
+
+# Project dependencies
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.records import Records
+from wca_nr_api.classes.region import Region
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils import storage
+from wca_nr_api.utils.storage import Storage
+
+METADATA = {"export_date": "2026-09-01 00:00:13 UTC", "export_format_version": "v2.0.2"}
+RECORDS = [Record("2010AAAA01", "First Person", "m", "333", 500, ResultType.SINGLE),
+           Record("2011BBBB01", "O'Second Person", "f", "333", 500, ResultType.SINGLE),
+           Record("2010AAAA01", "First Person", "m", "333", 700, ResultType.AVERAGE),
+           Record("2012CCCC01", "Third Person", "f", "sq1", 900, ResultType.AVERAGE)]
+WORLD_RECORDS = [Record("2012CCCC01", "Third Person", "f", "sq1", 900, ResultType.AVERAGE)]
+
+
+def create_storage(records: list[Record] = RECORDS) -> Storage:
+    """
+    Creates a storage with the national and the world records, and no continental records.
+
+    :param records: (list) The national records.
+    :return: (Storage) The storage.
+    """
+
+    return Storage(METADATA, Records.from_records(records),
+                   {Region.WORLD: Records.from_records(WORLD_RECORDS), Region.CONTINENT: Records.from_records([])})
+
+
+class StorageSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(RECORDS_FOLDER, exist_ok=True)
+        self.addCleanup(shutil.rmtree, RECORDS_FOLDER)
+
+        patcher = mock.patch.multiple(storage, STORAGE_FORMAT=STORAGE_FORMAT_SNAPSHOT, STORAGE_JSON_EXPORT=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot_round_trip(self):
+        create_storage().save("Bulgaria")
+
+        self.assertTrue(os.path.exists(Storage.location("Bulgaria", STORAGE_FORMAT_SNAPSHOT)))
+        self.assertFalse(os.path.exists(Storage.location("Bulgaria", STORAGE_FORMAT_JSON)))
+        self.assertEqual(Storage.load("Bulgaria").to_dict(), create_storage().to_dict())
+
+    def test_single_event_is_loaded(self):
+        create_storage().save("Bulgaria")
+
+        self.assertEqual(Storage.load_event("333", country="Bulgaria"), RECORDS[:3])
+        self.assertEqual(Storage.load_event("sq1", Region.WORLD, "Bulgaria"), WORLD_RECORDS)
+        self.assertEqual(Storage.load_event("sq1", Region.CONTINENT, "Bulgaria"), [])
+        self.assertEqual(Storage.load_event("444", country="Bulgaria"), [])
+
+    def test_changed_records_are_saved(self):
+        create_storage().save("Bulgaria")
+        records = RECORDS[:1] + [Record("2013DDDD01", "Fourth Person", "m", "333", 650, ResultType.AVERAGE)]
+        create_storage(records).save("Bulgaria")
+
+        self.assertEqual(Storage.load("Bulgaria").to_dict(), create_storage(records).to_dict())
+        self.assertEqual(Storage.load_event("333", country="Bulgaria"), records)
+        self.assertEqual(Storage.load_event("sq1", country="Bulgaria"), [])
+
+    def test_json_is_loaded_without_a_snapshot(self):
+        with mock.patch.object(storage, "STORAGE_FORMAT", STORAGE_FORMAT_JSON):
+            create_storage().save("Bulgaria")
+        self.assertFalse(os.path.exists(Storage.location("Bulgaria", STORAGE_FORMAT_SNAPSHOT)))
+
+        self.assertTrue(Storage.exists("Bulgaria"))
+        self.assertEqual(Storage.load("Bulgaria").to_dict(), create_storage().to_dict())
+        self.assertEqual(Storage.load_event("333", country="Bulgaria"), RECORDS[:3])
+        self.assertEqual(Storage.load_event("sq1", Region.WORLD, "Bulgaria"), WORLD_RECORDS)
+
+        # Once the first snapshot is saved, it is loaded instead of the JSON file
+        create_storage(RECORDS[:1]).save("Bulgaria")
+        self.assertEqual(Storage.load_event("333", country="Bulgaria"), RECORDS[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
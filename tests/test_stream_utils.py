@@ -0,0 +1,171 @@
+# Python dependencies
+import io
+import os
+import tempfile
+import time
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import mock
+
+# External dependencies
+import requests
+
+# Project dependencies
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils import stream_utils
+from wca_nr_api.utils.stream_utils import DownloadSpool, SpoolReader, ZipMemberReader
+
+CONTENT = b"0123456789" * 1000
+SQL_DUMP = b"".join(b"('%dPERS%02d',1,'Person %d','Bulgaria','m'),\n" % (2000 + i % 25, i, i) for i in range(5000))
+# Members, which come before the SQL dump in the archive
+README_MEMBER = ("README.md", b"Readme of the export\n" * 300, zipfile.ZIP_DEFLATED)
+METADATA_MEMBER = ("metadata.json", b'{"export_format_version": "v2.0.0"}', zipfile.ZIP_STORED)
+
+
+class StallingHandler(BaseHTTPRequestHandler):
+    """
+    "StallingHandler" sends the first half of the content and then stalls for longer than the read timeout.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT[:len(CONTENT) // 2])
+        self.wfile.flush()
+        if self.path != "/complete":
+            time.sleep(2)
+        self.wfile.write(CONTENT[len(CONTENT) // 2:])
+
+    def log_message(self, *args):
+        pass
+
+
+class DownloadSpoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StallingHandler)
+        self.server.daemon_threads = True
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.location = os.path.join(tempfile.mkdtemp(), "export.sql.zip")
+
+        # Shorter than the stall of the server
+        patcher = mock.patch.object(stream_utils, "EXPORTS_DOWNLOAD_TIMEOUT", (1, 0.5))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def read(self, path: str) -> bytes:
+        spool = DownloadSpool(f"http://127.0.0.1:{self.server.server_address[1]}{path}", self.location, 1024)
+        spool.start()
+        with SpoolReader(spool) as reader:
+            data = reader.read()
+        spool.join()
+        return data
+
+    def test_download_is_read_while_spooled(self):
+        self.assertEqual(self.read("/complete"), CONTENT)
+
+    def test_stalled_download_raises_to_the_reader(self):
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.read("/stalled")
+
+
+class UnseekableOutput(io.RawIOBase):
+    """
+    "UnseekableOutput" collects the written bytes without allowing seeks, so that "zipfile" streams the members
+    with data descriptors, like the archive of the export is streamed.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.data += data
+        return len(data)
+
+
+def create_archive(members: list[tuple[str, bytes, int]], streamed: bool, force_zip64: bool = False) -> bytes:
+    """
+    Creates a ZIP archive of the given members, in the given order.
+
+    :param members: (list) The members of (name, data, compression method).
+    :param streamed: (bool) Whether the archive is written to an unseekable output, with data descriptors.
+    :param force_zip64: (bool) Whether the sizes of the members are written in the ZIP64 format.
+    :return: (bytes) The archive.
+    """
+
+    output = UnseekableOutput() if streamed else io.BytesIO()
+    with zipfile.ZipFile(output, "w") as zf:
+        for name, data, method in members:
+            info = zipfile.ZipInfo(name)
+            info.compress_type = method
+            with zf.open(info, "w", force_zip64=force_zip64) as member:
+                member.write(data)
+    return bytes(output.data) if streamed else output.getvalue()
+
+
+def read_member(archive: bytes, name: str = EXPORTS_SQL_FILENAME) -> bytes:
+    """
+    Reads a member from a forward-only stream of the archive, in small blocks.
+
+    :param archive: (bytes) The archive.
+    :param name: (str) The name of the member.
+    :return: (bytes) The decompressed member.
+    """
+
+    return ZipMemberReader(io.BufferedReader(io.BytesIO(archive)), name, 256).readall()
+
+
+class ZipMemberReaderTest(unittest.TestCase):
+    def test_member_after_other_members_is_read(self):
+        archive = create_archive([README_MEMBER, METADATA_MEMBER, (EXPORTS_SQL_FILENAME, SQL_DUMP, zipfile.ZIP_STORED)],
+                                 False)
+
+        self.assertEqual(read_member(archive), SQL_DUMP)
+        self.assertEqual(read_member(archive, METADATA_MEMBER[0]), METADATA_MEMBER[1])
+
+    def test_streamed_member_after_other_members_is_read(self):
+        archive = create_archive([README_MEMBER, (EXPORTS_SQL_FILENAME, SQL_DUMP, zipfile.ZIP_DEFLATED)], True)
+
+        # The sizes of the streamed members are only in their data descriptors
+        self.assertTrue(all(info.flag_bits & 0x08 for info in zipfile.ZipFile(io.BytesIO(archive)).infolist()))
+        self.assertEqual(read_member(archive), SQL_DUMP)
+
+    def test_zip64_members_are_read(self):
+        members = [README_MEMBER, (EXPORTS_SQL_FILENAME, SQL_DUMP, zipfile.ZIP_DEFLATED)]
+
+        for streamed in (False, True):
+            with self.subTest(streamed=streamed):
+                self.assertEqual(read_member(create_archive(members, streamed, force_zip64=True)), SQL_DUMP)
+
+    def test_streamed_stored_member_before_the_sql_dump_fails(self):
+        archive = create_archive([METADATA_MEMBER, (EXPORTS_SQL_FILENAME, SQL_DUMP, zipfile.ZIP_DEFLATED)], True)
+
+        with self.assertRaisesRegex(zipfile.BadZipFile, "Cannot skip member with compression method 0"):
+            read_member(archive)
+
+    def test_streamed_stored_member_fails(self):
+        archive = create_archive([(EXPORTS_SQL_FILENAME, SQL_DUMP, zipfile.ZIP_STORED)], True)
+
+        with self.assertRaisesRegex(zipfile.BadZipFile, "Cannot stream stored member"):
+            read_member(archive)
+
+    def test_missing_member_fails(self):
+        archive = create_archive([README_MEMBER, METADATA_MEMBER], False)
+
+        with self.assertRaises(KeyError):
+            read_member(archive)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# Python dependencies
+import sys
+
+# Project dependencies
+from wca_nr_api.config.config import clear_files, setup_files
+from wca_nr_api.config.environ import load_environment
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.file_utils import unarchive_latest_export
+from wca_nr_api.utils.mail import send_email
+from wca_nr_api.utils.progression_utils import backfill_national_record_progression
+from wca_nr_api.utils.wca_utils import WCAUtils
+
+
+if __name__ == '__main__':
+    logger.info("Starting WCA NR progression backfill!")
+
+    try:
+        # Load and validate environmental variables
+        load_environment()
+
+        # Setup files and folders
+        setup_files()
+
+        # Download and unarchive the latest export, regardless of the last processed one
+        wca_utils = WCAUtils()
+        wca_utils.extract_latest_export_information()
+        wca_utils.download_latest_export()
+        unarchive_latest_export()
+
+        # Compute the progression of the national records from the results and save it
+        backfill_national_record_progression()
+
+        # Clear files and folders
+        clear_files()
+
+        success = True
+    except Exception as e:
+        logger.error(e)
+        success = False
+
+    logger.info("Finished WCA NR progression backfill!")
+
+    # Send email
+    send_email(success)
+
+    # A failed backfill fails the job, which runs it
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,60 @@
+# Python dependencies
+from datetime import date
+
+
+class Competition:
+    """
+    "Competition" class holds the information for a WCA competition, at which a record was set - its ID, name and date.
+    """
+
+    def __init__(self, competition_id: str, name: str, start_date: date):
+        """
+        Initializer for the "Competition" class.
+
+        :param competition_id: (str) The ID of the competition.
+        :param name: (str) The name of the competition.
+        :param start_date: (date) The date, on which the competition started.
+        """
+
+        self._competition_id: str = competition_id
+        self._name: str = name
+        self._start_date: date = start_date
+
+    @property
+    def competition_id(self) -> str:
+        return self._competition_id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def start_date(self) -> date:
+        return self._start_date
+
+    def url(self) -> str:
+        """
+        Returns the URL of the competition on the WCA website.
+
+        :return: (str) The URL of the competition.
+        """
+
+        return f"https://www.worldcubeassociation.org/competitions/{self.competition_id}"
+
+    def readable_date(self) -> str:
+        """
+        Returns the date of the competition in readable format, e.g. "01.09.2026".
+
+        :return: (str) The date of the competition in readable format.
+        """
+
+        return self.start_date.strftime("%d.%m.%Y")
+
+    def __str__(self) -> str:
+        """
+        String representation of the competition.
+
+        :return: (str) The string representation of the competition.
+        """
+
+        return f"{self.name} ({self.readable_date()})"
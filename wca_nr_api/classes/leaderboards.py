@@ -0,0 +1,218 @@
+# Python dependencies
+import heapq
+import itertools
+import json
+import os
+from typing import Any, Self
+
+# Project dependencies
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.constants import (COLUMN_COUNTRY_RANK, COLUMN_SUB_ID, LEADERBOARDS_FILENAME, RECORDS_FOLDER,
+                                         TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE)
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.database import DB
+from wca_nr_api.utils.file_utils import open_atomically
+
+
+class Leaderboards:
+    """
+    "Leaderboards" class stores the national top-N results for every country, event and result type.
+    While the results are added, only a heap of the best N results is kept for every leaderboard,
+    so the memory does not depend on the number of added results.
+    """
+
+    def __init__(self, size: int, leaderboards: dict[str, dict[str, dict[str, list[Record]]]] = None):
+        """
+        Initializer for the "Leaderboards" class.
+
+        :param size: (int) The number of results in a leaderboard.
+        :param leaderboards: (dict) The leaderboards, if they are already computed - {country: {event: {type: []}}}.
+        Used when extracting from storage file.
+        """
+
+        self._size = size
+        self._leaderboards = leaderboards
+
+        # Heaps of the worst results first - (-result, -order, record), so that the worst result is replaced
+        # and the earlier of two equal results is kept
+        self._heaps: dict[tuple[str, str, ResultType], list[tuple[int, int, Record]]] = {}
+        self._order = itertools.count()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def leaderboards(self) -> dict[str, dict[str, dict[str, list[Record]]]]:
+        # Sort the heaps once all results are added
+        if self._leaderboards is None:
+            self._leaderboards = {}
+            for (country, event, result_type), heap in self._heaps.items():
+                results = [record for _, _, record in sorted(heap, reverse=True)]
+                self._leaderboards.setdefault(country, {}).setdefault(event, {})[result_type.name] = results
+        return self._leaderboards
+
+    def add(self, country: str, record: Record) -> None:
+        """
+        Adds a result to the leaderboard of its country, event and result type, if it is among the best N.
+
+        :param country: (str) The country of the person.
+        :param record: (Record) The result.
+        """
+
+        if not record.validate():
+            return
+
+        heap = self._heaps.setdefault((country, record.event.database_value(), record.result_type), [])
+        item = (-record.result, -next(self._order), record)
+
+        if len(heap) < self.size:
+            heapq.heappush(heap, item)
+        # Better than the worst result in the leaderboard
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+
+        # The sorted leaderboards are outdated
+        self._leaderboards = None
+
+    def check_for_new_entries(self, old_leaderboards: Self, country: str) -> list[tuple[int, Record]]:
+        """
+        Compares the leaderboards of a country and returns the results of the persons, who entered them.
+        Persons, who improved their result in a leaderboard, which they were already in, are not returned.
+
+        :param old_leaderboards: (Leaderboards) The old leaderboards.
+        :param country: (str) The country.
+        :return: (list) List of (position, record) of the new entries.
+        """
+
+        # Nothing to compare with, if the country was not tracked or the leaderboards had a different size
+        old_country_leaderboards = old_leaderboards.leaderboards.get(country)
+        if old_country_leaderboards is None or old_leaderboards.size != self.size:
+            logger.info(f"No last known top {self.size} leaderboards of {country}.")
+            return []
+
+        new_entries: list[tuple[int, Record]] = []
+        for event, event_leaderboards in self.leaderboards.get(country, {}).items():
+            for result_type, results in event_leaderboards.items():
+                old_results = old_country_leaderboards.get(event, {}).get(result_type, [])
+                old_persons = {record.person_id for record in old_results}
+                for position, record in self.positions(results):
+                    if record.person_id not in old_persons:
+                        new_entries.append((position, record))
+
+        if not new_entries:
+            logger.info(f"No new entries in the top {self.size} leaderboards of {country} found.")
+        for position, record in new_entries:
+            logger.info(f"Extracted new entry in the top {self.size} of {country} at position {position} - {record}")
+
+        return new_entries
+
+    @staticmethod
+    def positions(results: list[Record]) -> list[tuple[int, Record]]:
+        """
+        Returns the positions of the sorted results of a leaderboard. Equal results share the same position.
+
+        :param results: (list) The sorted results.
+        :return: (list) List of (position, record).
+        """
+
+        positions = []
+        for index, record in enumerate(results):
+            if index > 0 and record.result == results[index - 1].result:
+                positions.append((positions[-1][0], record))
+            else:
+                positions.append((index + 1, record))
+        return positions
+
+    def extract(self, country: str = None) -> None:
+        """
+        Adds the results from the database, created from the SQL dump, with the current name and country of
+        every person.
+
+        :param country: (str) The country, whose results are added. All countries if not passed.
+        """
+
+        with DB() as database:
+            for table, result_type in ((TABLE_RANKS_SINGLE, ResultType.SINGLE),
+                                       (TABLE_RANKS_AVERAGE, ResultType.AVERAGE)):
+                query = (f"SELECT p.country_id, p.wca_id, p.name, p.gender, r.event_id, r.best FROM {table} AS r "
+                         f"INNER JOIN {TABLE_PERSONS} AS p "
+                         f"ON r.person_id = p.wca_id AND p.{COLUMN_SUB_ID} = 1 "
+                         f"WHERE r.{COLUMN_COUNTRY_RANK} <= ?")
+                parameters: list[Any] = [self.size]
+                if country is not None:
+                    query += " AND p.country_id = ?"
+                    parameters.append(country)
+
+                for row in database.execute(query, parameters):
+                    self.add(row[0], Record(*(row[1:] + (result_type, ))))
+            logger.info(f"Extracted top {self.size} leaderboards from the database.")
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns a dictionary representation of the leaderboards, with the position and the readable result of
+        every record.
+
+        :return: (dict) The dictionary representation of the leaderboards.
+        """
+
+        return {
+            "size": self.size,
+            "leaderboards": {
+                country: {
+                    event: {
+                        result_type: [
+                            record.to_dict() | {"position": position, "readable_result": record.readable_result()}
+                            for position, record in self.positions(results)
+                        ]
+                        for result_type, results in event_leaderboards.items()
+                    }
+                    for event, event_leaderboards in country_leaderboards.items()
+                }
+                for country, country_leaderboards in self.leaderboards.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """
+        Returns a class instance from a dictionary representation of the leaderboards.
+
+        :param data: (dict) The dictionary representation of the leaderboards.
+        :return: (Leaderboards) The class instance.
+        """
+
+        return cls(data.get("size"), {
+            country: {
+                event: {
+                    result_type: [Record.from_dict(result) for result in results]
+                    for result_type, results in event_leaderboards.items()
+                }
+                for event, event_leaderboards in country_leaderboards.items()
+            }
+            for country, country_leaderboards in data.get("leaderboards").items()
+        })
+
+    def to_json(self) -> None:
+        """
+        Saves the leaderboards to the leaderboards file. The file is replaced only once it is fully written.
+        """
+
+        with open_atomically(os.path.join(RECORDS_FOLDER, LEADERBOARDS_FILENAME)) as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def from_json(cls) -> Self:
+        """
+        Creates a class instance from the leaderboards file. If there is no file, the leaderboards are empty.
+
+        :return: (Leaderboards) The class instance.
+        """
+
+        location = os.path.join(RECORDS_FOLDER, LEADERBOARDS_FILENAME)
+        if not os.path.exists(location):
+            return cls(0, {})
+
+        with open(location, 'r') as f:
+            return cls.from_dict(json.load(f))
@@ -1,4 +1,6 @@
 # Python dependencies
+import sys
+from functools import cache
 from typing import Any, Self
 
 # Project dependencies
@@ -12,8 +14,14 @@ class Record:
     """
     "Record" class holds the information for a single WCA national records - information about who achieved it
     (WCA ID, name, gender) and information about the event and result (event, result, result_type).
+
+    The records are compact, as many of them are held for the leaderboards and the progression - the attributes are
+    slots, the WCA ID and the name are interned, so that the records of a person share them, and the enumerations
+    are resolved once for every database value.
     """
 
+    __slots__ = ("_person_id", "_name", "_gender", "_event", "_result", "_result_type")
+
     def __init__(self, person_id: str, name: str, gender: str, event: str, result: int, result_type: ResultType):
         """
         Initializer for the "Record" class.
@@ -26,13 +34,37 @@ class Record:
         :param result_type: (ResultType) The type of result.
         """
 
-        self._person_id: str = person_id
-        self._name: str = name
-        self._gender: Gender = Gender.from_database_value(gender)
-        self._event: Event = Event.from_database_value(event)
+        self._person_id: str = sys.intern(person_id) if isinstance(person_id, str) else person_id
+        self._name: str = sys.intern(name) if isinstance(name, str) else name
+        self._gender: Gender = self.__gender(gender)
+        self._event: Event = self.__event(event)
         self._result: int = result
         self._result_type: ResultType = result_type
 
+    @staticmethod
+    @cache
+    def __gender(gender: str) -> Gender:
+        """
+        Returns the class value of a gender, resolved once for every database value.
+
+        :param gender: (str) The gender.
+        :return: (Gender) The class value of the gender.
+        """
+
+        return Gender.from_database_value(gender)
+
+    @staticmethod
+    @cache
+    def __event(event: str) -> Event:
+        """
+        Returns the class value of an event, resolved once for every database value.
+
+        :param event: (str) The name of the event.
+        :return: (Event) The class value of the event.
+        """
+
+        return Event.from_database_value(event)
+
     @property
     def person_id(self) -> str:
         return self._person_id
@@ -64,9 +96,8 @@ class Record:
         :return: (bool) "True" if all values are valid, "False" otherwise.
         """
 
-        return all(val is not None for val in [
-            self.person_id, self.name, self.gender, self.event, self.result, self.result_type
-        ])
+        return (self._person_id is not None and self._name is not None and self._gender is not None
+                and self._event is not None and self._result is not None and self._result_type is not None)
 
     def readable_result(self) -> str:
         """
@@ -0,0 +1,277 @@
+# Python dependencies
+import itertools
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+# External dependencies
+import numpy as np
+
+# Project dependencies
+from wca_nr_api.classes.event import Event
+from wca_nr_api.classes.gender import Gender
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.region import Region
+from wca_nr_api.classes.result_type import ResultType
+
+# Offset of the int32 results in the sort keys of "group_min", so that they sort as unsigned numbers
+RESULT_OFFSET = 1 << 31
+
+
+class RecordTable:
+    """
+    "RecordTable" stores many records by columns instead of as "Record" objects - the results are an int32 array,
+    the event, the type of result, the gender and the regions are arrays of small codes, while the WCA ID, the name
+    and the country are indices into tables of the distinct strings.
+
+    The columns of codes are filtered with byte translations and the masks are combined as integers, so filtering
+    does not loop over the rows in Python. "Record" objects are created only when a row is read.
+    Only valid records are stored - a record without an event (e.g. of a removed event) or a gender is rejected.
+    """
+
+    def __init__(self):
+        """
+        Initializer for the "RecordTable" class.
+        """
+
+        self._results = array("i")
+        self._events = array("B")
+        self._result_types = array("B")
+        self._genders = array("B")
+        # Bit mask of the regions, in which the record is also a record - 1 << region.value
+        self._regions = array("B")
+        self._persons = array("I")
+        self._names = array("I")
+        self._countries = array("H")
+
+        # Distinct strings of the columns and their indices
+        self._strings: dict[str, list[str]] = {"persons": [], "names": [], "countries": []}
+        self._string_indices: dict[str, dict[str, int]] = {"persons": {}, "names": {}, "countries": {}}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def append(self, country: str, record: Record, regions: Iterable[Region] = ()) -> None:
+        """
+        Appends a record.
+
+        :param country: (str) The country of the person.
+        :param record: (Record) The record.
+        :param regions: (Iterable) The regions, in which the record is also a record.
+        """
+
+        self.append_row(country, record.person_id, record.name, record.gender, record.event, record.result,
+                        record.result_type, regions)
+
+    def append_row(self, country: str, person_id: str, name: str, gender: Gender | None, event: Event | None,
+                   result: int, result_type: ResultType, regions: Iterable[Region] = ()) -> None:
+        """
+        Appends the values of a record, without creating a "Record" object.
+
+        :param country: (str) The country of the person.
+        :param person_id: (str) The WCA ID of the person.
+        :param name: (str) The name of the person.
+        :param gender: (Gender) The gender of the person.
+        :param event: (Event) The event.
+        :param result: (int) The result.
+        :param result_type: (ResultType) The type of result.
+        :param regions: (Iterable) The regions, in which the record is also a record.
+        """
+
+        if event is None or gender is None:
+            raise ValueError(f"Record of {person_id} without an event or a gender cannot be stored")
+
+        self._results.append(result)
+        self._events.append(event.value)
+        self._result_types.append(result_type.value)
+        self._genders.append(gender.value)
+        self._regions.append(sum(1 << region.value for region in regions))
+        self._persons.append(self.__string_index("persons", person_id))
+        self._names.append(self.__string_index("names", name))
+        self._countries.append(self.__string_index("countries", country))
+
+    def countries(self) -> list[str]:
+        """
+        Returns the countries, which have rows.
+
+        :return: (list) The IDs of the countries, sorted.
+        """
+
+        return sorted(self._strings["countries"])
+
+    def filter(self, event: Event = None, result_type: ResultType = None, country: str = None,
+               region: Region = None) -> list[int]:
+        """
+        Returns the rows, which match all the given values.
+
+        :param event: (Event) The event of the rows. Any event if not passed.
+        :param result_type: (ResultType) The type of result of the rows. Any type if not passed.
+        :param country: (str) The country of the rows. Any country if not passed.
+        :param region: (Region) The region, in which the rows are also records. Any rows if not passed.
+        :return: (list) The indices of the matching rows, in the order they were appended.
+        """
+
+        masks = []
+        if event is not None:
+            masks.append(self.__codes_mask(self._events, {event.value}))
+        if result_type is not None:
+            masks.append(self.__codes_mask(self._result_types, {result_type.value}))
+        if region is not None:
+            masks.append(self.__codes_mask(self._regions, {code for code in range(256) if code >> region.value & 1}))
+        if country is not None:
+            country_index = self._string_indices["countries"].get(country)
+            if country_index is None:
+                return []
+            masks.append(self.__country_mask(country_index))
+
+        if not masks:
+            return list(range(len(self)))
+        return list(itertools.compress(range(len(self)), self.__combine_masks(masks)))
+
+    def group_min(self, rows: Iterable[int] = None) -> dict[tuple[str, Event, ResultType], tuple[int, list[int]]]:
+        """
+        Returns the best (minimum) result of every country, event and type of result, with the rows that hold it.
+
+        The columns are viewed as NumPy arrays without copying, the rows are sorted by the group and the result,
+        and the best result of every group is at its first sorted row - so Python runs once per group, not per row.
+
+        :param rows: (Iterable) The indices of the rows to group, e.g. from "filter". All rows if not passed.
+        :return: (dict) Dictionary of {(country, event, result_type): (result, rows)}, the rows in the given order.
+        """
+
+        rows = np.arange(len(self)) if rows is None else np.fromiter(rows, dtype=np.int64)
+        if not len(rows):
+            return {}
+
+        # Integer key of the codes of every row, the keys are converted once per group
+        keys = (self.__column(self._countries)[rows].astype(np.uint64) << 16
+                | self.__column(self._events)[rows].astype(np.uint64) << 8
+                | self.__column(self._result_types)[rows])
+        results = self.__column(self._results)[rows]
+
+        # Sort by the key and the result, packed into 64 bits - the stable sort keeps the order of the tied rows
+        order = np.argsort(keys << 32 | (results.astype(np.int64) + RESULT_OFFSET).astype(np.uint64), kind="stable")
+        keys, results, rows = keys[order], results[order], rows[order]
+
+        # The first sorted row of every group holds its best result, the rows with the same result are tied
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        best = np.repeat(results[starts], np.diff(np.r_[starts, len(keys)]))
+        tied = results == best
+        tied_rows = np.split(rows[tied], np.flatnonzero(np.diff(keys[tied])) + 1)
+
+        country_strings = self._strings["countries"]
+        return {
+            (country_strings[key >> 16], Event(key >> 8 & 0xFF), ResultType(key & 0xFF)): (result, group_rows.tolist())
+            for key, result, group_rows in zip(keys[starts].tolist(), results[starts].tolist(), tied_rows)
+        }
+
+    def record(self, row: int) -> Record:
+        """
+        Creates the "Record" object of a row.
+
+        :param row: (int) The index of the row.
+        :return: (Record) The record.
+        """
+
+        return Record(self._strings["persons"][self._persons[row]], self._strings["names"][self._names[row]],
+                      Gender(self._genders[row]).name, Event(self._events[row]).database_value(),
+                      self._results[row], ResultType(self._result_types[row]))
+
+    def records(self, rows: Iterable[int] = None) -> Iterator[Record]:
+        """
+        Creates the "Record" objects of rows lazily, one by one.
+
+        :param rows: (Iterable) The indices of the rows. All rows if not passed.
+        :return: (Iterator) The records.
+        """
+
+        rows = range(len(self)) if rows is None else rows
+        return map(self.record, rows)
+
+    def country(self, row: int) -> str:
+        """
+        Returns the country of a row.
+
+        :param row: (int) The index of the row.
+        :return: (str) The ID of the country.
+        """
+
+        return self._strings["countries"][self._countries[row]]
+
+    def __string_index(self, column: str, value: str) -> int:
+        """
+        Returns the index of a value in the table of the distinct strings of a column, adding it if it is new.
+
+        :param column: (str) The name of the column.
+        :param value: (str) The value.
+        :return: (int) The index of the value.
+        """
+
+        indices = self._string_indices[column]
+        index = indices.get(value)
+        if index is None:
+            index = indices[value] = len(self._strings[column])
+            self._strings[column].append(value)
+        return index
+
+    @staticmethod
+    def __column(column: array) -> np.ndarray:
+        """
+        Returns a NumPy view of a column, which shares its memory.
+
+        :param column: (array) The column.
+        :return: (np.ndarray) The view of the column.
+        """
+
+        return np.frombuffer(column, dtype=column.typecode) if len(column) else np.empty(0, dtype=column.typecode)
+
+    def __country_mask(self, country_index: int) -> bytes:
+        """
+        Returns the mask of the rows of a country - the low and the high bytes of the two-byte codes are masked
+        separately and combined.
+
+        :param country_index: (int) The index of the country.
+        :return: (bytes) One byte per row - 1 if the row is of the country, 0 otherwise.
+        """
+
+        data = memoryview(self._countries).cast("B")
+        low, high = (data[0::2], data[1::2]) if sys.byteorder == "little" else (data[1::2], data[0::2])
+        return self.__combine_masks([self.__bytes_mask(bytes(low), {country_index & 0xFF}),
+                                     self.__bytes_mask(bytes(high), {country_index >> 8})])
+
+    def __codes_mask(self, codes: array, values: set[int]) -> bytes:
+        """
+        Returns the mask of the rows, whose code is one of the given values.
+
+        :param codes: (array) A column of one-byte codes.
+        :param values: (set) The values.
+        :return: (bytes) One byte per row - 1 if the code of the row is one of the values, 0 otherwise.
+        """
+
+        return self.__bytes_mask(codes.tobytes(), values)
+
+    @staticmethod
+    def __bytes_mask(data: bytes, values: set[int]) -> bytes:
+        """
+        Translates bytes to a mask - every byte, which is one of the given values, becomes 1, any other byte 0.
+
+        :param data: (bytes) The bytes.
+        :param values: (set) The values.
+        :return: (bytes) The mask.
+        """
+
+        return data.translate(bytes(1 if code in values else 0 for code in range(256)))
+
+    @staticmethod
+    def __combine_masks(masks: list[bytes]) -> bytes:
+        """
+        Combines masks of the same length with a logical AND over their bytes, as integers.
+
+        :param masks: (list) The masks.
+        :return: (bytes) The combined mask.
+        """
+
+        combined = int.from_bytes(masks[0], "little")
+        for mask in masks[1:]:
+            combined &= int.from_bytes(mask, "little")
+        return combined.to_bytes(len(masks[0]), "little")
@@ -1,11 +1,13 @@
 # Python dependencies
-from typing import Any, Self
+from typing import Any, Iterable, Self
 
 # Project dependencies
 from wca_nr_api.classes.event import Event
 from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.region import Region
 from wca_nr_api.classes.result_type import ResultType
-from wca_nr_api.config.constants import TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE
+from wca_nr_api.config.constants import (COLUMN_COUNTRY_RANK, COLUMN_SUB_ID, DATABASE_FETCH_BATCH_SIZE,
+                                         TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE)
 from wca_nr_api.config.logger import logger
 from wca_nr_api.utils.database import DB
 
@@ -13,139 +15,212 @@ from wca_nr_api.utils.database import DB
 class Records:
     """
     "Records" class stores arrays of all records for all events.
+    The records are also indexed by event and type of result, with the best result and the persons, who hold it.
     """
 
-    def __init__(self, records: dict[str, Any] = None):
+    def __init__(self, records: dict[str, Any] = None, country: str = None, region: Region = None):
         """
         Initializer for the "Records" class.
 
         :param records: (dict) The records.
+        :param country: (str) The country, whose records are extracted from the database. All countries if not passed.
+        :param region: (Region) The region, whose records (held by the country) are extracted from the database,
+        instead of the national records.
         """
 
         # If "records" are passed as an argument - assign
         # Used when extracting from storage file.
-        if records:
+        if records is not None:
             self._records = records
 
         # If "records" are not passed as an argument - initialize and extract national records
         # Used when extracting from SQL dump.
         if records is None:
-            self._records = {
-                "333": [],
-                "222": [],
-                "444": [],
-                "555": [],
-                "666": [],
-                "777": [],
-                "333bf": [],
-                "333fm": [],
-                "333oh": [],
-                "clock": [],
-                "minx": [],
-                "pyram": [],
-                "skewb": [],
-                "sq1": [],
-                "444bf": [],
-                "555bf": [],
-                "333mbf": []
-            }
+            self._records = self.__empty_records()
             # Extract the national records
-            self.__extract_national_records_single()
-            self.__extract_national_records_average()
+            self.__extract_national_records(country, region)
 
             logger.info("Successfully initialized Records class.")
 
+        self._index = self.__create_index(self._records)
+
     @property
     def records(self) -> dict[str, Any]:
         return self._records
 
-    def __extract_national_records_single(self) -> None:
+    @property
+    def index(self) -> dict[tuple[Event, ResultType], tuple[int, list[Record]]]:
+        return self._index
+
+    def best_result(self, event: Event, result_type: ResultType) -> int | None:
         """
-        Extracts the national records for all events (only Single) from the database, created from the SQL dump.
-        Saves them into the respective arrays.
+        Returns the result of the record of an event and type of result.
+
+        :param event: (Event) The event.
+        :param result_type: (ResultType) The type of result.
+        :return: (int) The result of the record, "None" if nobody holds the record.
         """
 
-        with DB() as database:
-            # Execute SELECT query on the database
-            rows = database.execute(f"SELECT p.wca_id, p.name, p.gender, rs.event_id, rs.best FROM {TABLE_RANKS_SINGLE} AS rs "
-                                    f"INNER JOIN {TABLE_PERSONS} AS p "
-                                    "ON rs.person_id = p.wca_id").fetchall()
-            logger.info(f"Successfully executed SELECT query on `{TABLE_RANKS_SINGLE}` table.")
+        entry = self.index.get((event, result_type))
+        return entry[0] if entry is not None else None
 
-            # Create a "Record" class for each row and append it to the records if it is valid
-            for row in rows:
-                record = Record(*(row + (ResultType.SINGLE, )))
-                if record.validate():
-                    self.records[record.event.database_value()].append(record)
-            logger.info("Created `Record` class instance for every `single` record.")
+    def holders(self, event: Event, result_type: ResultType) -> list[Record]:
+        """
+        Returns the records of the persons, who hold the record of an event and type of result.
+
+        :param event: (Event) The event.
+        :param result_type: (ResultType) The type of result.
+        :return: (list) The records of the holders, empty if nobody holds the record.
+        """
 
-    def __extract_national_records_average(self) -> None:
+        entry = self.index.get((event, result_type))
+        return entry[1] if entry is not None else []
+
+    @staticmethod
+    def __create_index(records: dict[str, list[Record]]) -> dict[tuple[Event, ResultType], tuple[int, list[Record]]]:
         """
-        Extracts the national records for all events (only Single) from the database, created from the SQL dump.
-        Saves them into the respective arrays.
+        Indexes the records by event and type of result - only the best result and its holders are kept.
+
+        :param records: (dict) Dictionary of {event: []}.
+        :return: (dict) Dictionary of {(event, result_type): (result, holders)}.
         """
 
+        index = {}
+        for event_records in records.values():
+            for record in event_records:
+                key = (record.event, record.result_type)
+                entry = index.get(key)
+                if entry is None or record.result < entry[0]:
+                    index[key] = (record.result, [record])
+                elif record.result == entry[0]:
+                    entry[1].append(record)
+        return index
+
+    @staticmethod
+    def __empty_records() -> dict[str, list[Record]]:
+        """
+        Returns an empty array of records for every event.
+
+        :return: (dict) Dictionary of {event: []}.
+        """
+
+        return {
+            "333": [],
+            "222": [],
+            "444": [],
+            "555": [],
+            "666": [],
+            "777": [],
+            "333bf": [],
+            "333fm": [],
+            "333oh": [],
+            "clock": [],
+            "minx": [],
+            "pyram": [],
+            "skewb": [],
+            "sq1": [],
+            "444bf": [],
+            "555bf": [],
+            "333mbf": []
+        }
+
+    def __extract_national_records(self, country: str = None, region: Region = None) -> None:
+        """
+        Extracts the national records for all events (Single and Average) from the database, created from the SQL dump,
+        with a single query. The rows are read from the cursor in batches and saved into the respective arrays.
+        The records of removed events are skipped by the query.
+
+        :param country: (str) The country, whose records are extracted. All countries if not passed.
+        :param region: (Region) The region, whose records are extracted. National records if not passed.
+        """
+
+        events = [event.database_value() for event in Event]
+
+        queries, parameters = [], []
+        for table, result_type in ((TABLE_RANKS_SINGLE, ResultType.SINGLE), (TABLE_RANKS_AVERAGE, ResultType.AVERAGE)):
+            query = (f"SELECT p.wca_id, p.name, p.gender, r.event_id, r.best, '{result_type.name}' FROM {table} AS r "
+                     f"INNER JOIN {TABLE_PERSONS} AS p "
+                     f"ON r.person_id = p.wca_id AND p.{COLUMN_SUB_ID} = 1")
+            # Only the national records of the current events, if the database holds the national leaderboards
+            conditions = [f"r.{COLUMN_COUNTRY_RANK} = 1", f"r.event_id IN ({', '.join('?' * len(events))})"]
+            parameters.extend(events)
+            # Only the persons of the country, if the database holds more countries
+            if country is not None:
+                conditions.append("p.country_id = ?")
+                parameters.append(country)
+            # Only the records, which are also records of the region
+            if region is not None:
+                conditions.append(f"r.{region.rank_column()} = 1")
+            queries.append(query + " WHERE " + " AND ".join(conditions))
+
         with DB() as database:
-            # Execute SELECT query on the database
-            rows = database.execute(f"SELECT p.wca_id, p.name, p.gender, ra.event_id, ra.best FROM {TABLE_RANKS_AVERAGE} AS ra "
-                                    f"INNER JOIN {TABLE_PERSONS} AS p "
-                                    "ON ra.person_id = p.wca_id").fetchall()
-            logger.info(f"Successfully executed SELECT query on `{TABLE_RANKS_AVERAGE}` table.")
+            # Single records first, then average records
+            cursor = database.execute(" UNION ALL ".join(queries), parameters)
+            logger.info(f"Successfully executed SELECT query on `{TABLE_RANKS_SINGLE}` and `{TABLE_RANKS_AVERAGE}` "
+                        f"tables.")
 
             # Create a "Record" class for each row and append it to the records if it is valid
-            for row in rows:
-                record = Record(*(row + (ResultType.AVERAGE, )))
-                if record.validate():
-                    self.records[record.event.database_value()].append(record)
-            logger.info("Created `Record` class instance for every `average` record.")
+            while rows := cursor.fetchmany(DATABASE_FETCH_BATCH_SIZE):
+                for row in rows:
+                    record = Record(*(row[:-1] + (ResultType.from_database_value(row[-1]), )))
+                    if record.validate():
+                        self.records[record.event.database_value()].append(record)
+            logger.info("Created `Record` class instance for every `single` and `average` record.")
+
+    @staticmethod
+    def extract_countries() -> list[str]:
+        """
+        Extracts the countries, which have national records, from the database, created from the SQL dump.
+
+        :return: (list) The IDs of the countries.
+        """
 
-    def check_for_new_records(self, old_records_class: Self) -> list[Record]:
+        with DB() as database:
+            rows = database.execute(f"SELECT DISTINCT p.country_id FROM {TABLE_PERSONS} AS p "
+                                    f"WHERE p.{COLUMN_SUB_ID} = 1 "
+                                    f"AND (p.wca_id IN (SELECT person_id FROM {TABLE_RANKS_SINGLE}) "
+                                    f"OR p.wca_id IN (SELECT person_id FROM {TABLE_RANKS_AVERAGE})) "
+                                    "ORDER BY p.country_id").fetchall()
+        return [row[0] for row in rows]
+
+    def check_for_new_records(self, old_records_class: Self, allow_vacant: bool = False,
+                              name: str = "NR") -> list[Record]:
         """
         Compares all records and returns if there are new records.
 
         :param old_records_class: (dict) The old records.
+        :param allow_vacant: (bool) Whether the records of an event are new, if the event had no old records.
+        Used for the regional records of a country, which are often not held by anyone from the country.
+        :param name: (str) The name of the records in the logs, e.g. "NR".
         :return: (list) List of new records.
         """
 
         all_new_records: list[Record] = []
 
-        # Iterate all events and their records
-        for event, new_records in self.records.items():
-            # Get old records for this event
-            old_records = old_records_class.records.get(event)
+        # Compare the best result and the holders of every event and type of result
+        for (event, result_type), (result, holders) in self.index.items():
+            old_result = old_records_class.best_result(event, result_type)
 
-            # Obtain all records for Single
-            new_records_single: list[Record] = [r for r in new_records if r.result_type == ResultType.SINGLE]
-            old_records_single: list[Record] = [r for r in old_records if r.result_type == ResultType.SINGLE]
+            # Case 0 - The record was not held before
+            if old_result is None:
+                if allow_vacant:
+                    all_new_records.extend(holders)
 
-            if new_records_single and old_records_single:
-                # Case 1 - New record
-                if new_records_single[0].result < old_records_single[0].result:
-                    all_new_records.extend(new_records_single)
+            # Case 1 - New record
+            elif result < old_result:
+                all_new_records.extend(holders)
 
-                # Case 2 - Tied record
-                elif len(new_records_single) > len(old_records_single):
-                    diff_records = set(new_records_single) - set(old_records_single)
-                    all_new_records.extend(diff_records)
-
-            # Obtain all records for Average
-            new_records_average: list[Record] = [r for r in new_records if r.result_type == ResultType.AVERAGE]
-            old_records_average: list[Record] = [r for r in old_records if r.result_type == ResultType.AVERAGE]
-
-            if new_records_average and old_records_average:
-                # Case 1 - New record
-                if new_records_average[0].result < old_records_average[0].result:
-                    all_new_records.extend(new_records_average)
-
-                # Case 2 - Tied record
-                elif len(new_records_average) > len(old_records_average):
-                    diff_records = set(new_records_average) - set(old_records_average)
-                    all_new_records.extend(diff_records)
+            # Case 2 - Tied record
+            elif result == old_result:
+                old_holders = old_records_class.holders(event, result_type)
+                if len(holders) > len(old_holders):
+                    known_holders = set(old_holders)
+                    all_new_records.extend(record for record in holders if record not in known_holders)
 
         if not all_new_records:
-            logger.info("No new records found.")
+            logger.info(f"No new {name}s found.")
         for record in all_new_records:
-            logger.info(f"Extracted new NR - {record.__str__()}")
+            logger.info(f"Extracted new {name} - {record.__str__()}")
 
         return all_new_records
 
@@ -170,13 +245,25 @@ class Records:
         :return: (Record) The class instance.
         """
 
-        # For every event
-        for value in records.values():
-            # For every record for the respective event
-            for i in range(len(value)):
-                value[i] = Record.from_dict(value[i])
+        # Create a "Record" class for every record of every event, without changing the dictionary
+        return cls({event: [Record.from_dict(record) for record in event_records]
+                    for event, event_records in records.items()})
+
+    @classmethod
+    def from_records(cls, records: Iterable[Record]) -> Self:
+        """
+        Returns a class instance from records, which are already extracted (e.g. joined in memory from the export).
+        Only the valid records are kept.
+
+        :param records: (Iterable) The records, in the order they are saved into the respective arrays.
+        :return: (Records) The class instance.
+        """
 
-        return cls(records)
+        records_by_event = cls.__empty_records()
+        for record in records:
+            if record.validate():
+                records_by_event[record.event.database_value()].append(record)
+        return cls(records_by_event)
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,53 @@
+# Python dependencies
+from enum import Enum
+from typing import Self
+
+
+class Region(Enum):
+    """
+    Enumeration, representing the regions of WCA records above the national level. These include - World, Continent.
+    """
+
+    WORLD = 1
+    CONTINENT = 2
+
+    def abbreviation(self) -> str:
+        """
+        Returns the abbreviation of the records of the region.
+
+        :return: (str) The abbreviation, e.g. "WR".
+        """
+
+        match self:
+            case Region.WORLD:
+                return "WR"
+            case Region.CONTINENT:
+                return "CR"
+
+    def rank_column(self) -> str:
+        """
+        Returns the column of the ranks tables, which holds the rank of a result in the region.
+
+        :return: (str) The name of the column.
+        """
+
+        match self:
+            case Region.WORLD:
+                return "world_rank"
+            case Region.CONTINENT:
+                return "continent_rank"
+
+    @classmethod
+    def from_database_value(cls, region: str) -> Self:
+        """
+        Returns the class value of the region.
+
+        :param region: (str) The region, accepts "WORLD" / "CONTINENT".
+        :return: (Region) The class value of the region.
+        """
+
+        match region:
+            case "WORLD":
+                return Region.WORLD
+            case "CONTINENT":
+                return Region.CONTINENT
@@ -66,7 +66,9 @@ def clear_files() -> None:
         except Exception as e:
             logger.error(f"Error while deleting file {filename}: {e}")
 
-    # Delete database
+    # Delete database, unless it was built in memory
+    if DATABASE_LOCATION == DATABASE_LOCATION_MEMORY:
+        return
     try:
         os.remove(os.path.join(DATABASE_FOLDER, DATABASE_FILENAME))
         logger.info(f"Deleted database file: {os.path.join(DATABASE_FOLDER, DATABASE_FILENAME)}")
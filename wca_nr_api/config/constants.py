@@ -1,22 +1,91 @@
+# Python dependencies
+import os
+
 ENVIRONMENT_FOLDER = ".."
 EXPECTED_ENV_VARS = ["WCA_COUNTRY", "SMTP_SERVER", "SMTP_PORT", "SENDER_EMAIL",
                      "SENDER_PASSWORD", "RECIPIENT_EMAIL", "WEBHOOK_URL", "ROLE_ID"]
+# Value of the optional "WCA_COUNTRIES" variable, which tracks the national records of all countries
+ALL_COUNTRIES = "*"
 
 EXPORTS_FOLDER = "exports"
 EXPORTS_ARCHIVE_FILENAME = "export.sql.zip"
+EXPORTS_TSV_ARCHIVE_FILENAME = "export.tsv.zip"
+EXPORTS_TSV_MEMBER_FILENAME = "WCA_export_{table}.tsv"
 EXPORTS_METADATA_FILENAME = "metadata.json"
 EXPORTS_READ_ME_FILENAME = "README.md"
 EXPORTS_SQL_FILENAME = "WCA_export.sql"
 FILTERED_EXPORTS_SQL_FILENAME = "filtered_WCA_export.sql"
+# Maximum number of rows in a single filtered INSERT statement
+FILTERED_INSERT_BATCH_SIZE = 1000
+EXPORTS_READ_BUFFER_SIZE = 16 * 1024 * 1024
+
+EXPORTS_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+EXPORTS_DOWNLOAD_CONNECTIONS = 4
+EXPORTS_DOWNLOAD_RANGE_SIZE = 16 * 1024 * 1024
+EXPORTS_DOWNLOAD_RETRIES = 3
+# Seconds to wait for the connection to the server and for the next bytes of a response (connect, read)
+EXPORTS_DOWNLOAD_TIMEOUT = (10, 60)
+
+# Which export is ingested - the SQL dump or the TSV files of the needed tables only
+EXPORT_FORMAT_SQL = "sql"
+EXPORT_FORMAT_TSV = "tsv"
+EXPORT_FORMAT = EXPORT_FORMAT_SQL
+
+# Where the SQL dump is read from - the extracted file in the exports folder, directly from the archive
+# or from the archive while it is still being downloaded. The download source reads the archive over a single
+# connection in order, so unlike the other sources it does not use the ranged downloader with its retries and
+# resuming - a stalled or dropped connection fails the run (after EXPORTS_DOWNLOAD_TIMEOUT)
+SQL_DUMP_SOURCE_EXTRACTED = "extracted"
+SQL_DUMP_SOURCE_ARCHIVE = "archive"
+SQL_DUMP_SOURCE_DOWNLOAD = "download"
+SQL_DUMP_SOURCE = SQL_DUMP_SOURCE_DOWNLOAD
+
+# How the SQL dump is scanned - every line, searching the memory-mapped dump for the needed sections only,
+# or the same with the rows filtered by a pool of processes (both require the extracted source)
+SQL_DUMP_SCAN_MODE_LINES = "lines"
+SQL_DUMP_SCAN_MODE_MMAP = "mmap"
+SQL_DUMP_SCAN_MODE_PARALLEL = "parallel"
+SQL_DUMP_SCAN_MODE = SQL_DUMP_SCAN_MODE_LINES
+SQL_DUMP_PARALLEL_WORKERS = os.cpu_count()
+SQL_DUMP_PARALLEL_RANGE_SIZE = 8 * 1024 * 1024
 
 RECORDS_FOLDER = "storage"
 RECORDS_FILENAME = "records.json"
+RECORDS_COUNTRY_FILENAME = "records-{country}.json"
+RECORDS_SNAPSHOT_FILENAME = "records.db"
+RECORDS_COUNTRY_SNAPSHOT_FILENAME = "records-{country}.db"
+# How the records are stored - as a JSON file, or as a SQLite snapshot with a section per event,
+# in which only the changed events are rewritten (optionally with the JSON file exported for tracking it in git)
+STORAGE_FORMAT_JSON = "json"
+STORAGE_FORMAT_SNAPSHOT = "snapshot"
+STORAGE_FORMAT = STORAGE_FORMAT_JSON
+STORAGE_JSON_EXPORT = True
+LEADERBOARDS_FILENAME = "leaderboards.json"
+PROGRESSION_FILENAME = "progression.json"
+# Number of results in the national leaderboards of every event and result type (0 to not compute them)
+LEADERBOARD_SIZE = 10
+EXPORT_INFORMATION_CACHE_FILENAME = "export_information.json"
 
 BACKUP_FOLDER = "backup"
 BACKUP_FILENAME = "records-{date}.json"
+BACKUP_COUNTRY_FILENAME = "records-{country}-{date}.json"
 
 DATABASE_FOLDER = "database"
 DATABASE_FILENAME = "database.db"
+# Where the database is built - in the database file, or in memory, discarded at the end of the run
+DATABASE_LOCATION_FILE = "file"
+DATABASE_LOCATION_MEMORY = "memory"
+DATABASE_LOCATION = DATABASE_LOCATION_MEMORY
+DATABASE_CACHE_SIZE_KIB = 256 * 1024
+
+# How the filtered SQL dump is loaded into the database - as an SQL script or directly, row by row,
+# or not at all, with the records joined in memory from the filtered rows (the database is kept for debugging)
+DATABASE_LOADER_MODE_SCRIPT = "script"
+DATABASE_LOADER_MODE_DIRECT = "direct"
+DATABASE_LOADER_MODE_MEMORY = "memory"
+DATABASE_LOADER_MODE = DATABASE_LOADER_MODE_MEMORY
+# Number of rows, which are read from the database at once
+DATABASE_FETCH_BATCH_SIZE = 1000
 
 LOGS_FOLDER = "logs"
 
@@ -24,3 +93,15 @@ TABLE_PERSONS = "persons"
 TABLE_RANKS_AVERAGE = "ranks_average"
 TABLE_RANKS_SINGLE = "ranks_single"
 TABLE_FILTERS = [TABLE_PERSONS, TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE]
+# Tables, which are scanned only for the competitions of the new records, once they are found
+TABLE_COMPETITIONS = "competitions"
+TABLE_RESULTS = "results"
+# Number of rows of the results table, which a worker process parses at once, when the progression is computed
+PROGRESSION_CHUNK_SIZE = 50000
+# Types of rounds from the first to the last round of a competition, for ordering the results of a competition
+ROUND_TYPE_ORDER = ["h", "0", "d", "1", "b", "2", "e", "3", "g", "c", "f"]
+
+COLUMN_COUNTRY_ID = "country_id"
+COLUMN_COUNTRY_RANK = "country_rank"
+# Column of the persons table, which is 1 for the current row of a person
+COLUMN_SUB_ID = "sub_id"
@@ -5,7 +5,7 @@ import os
 from dotenv import load_dotenv
 
 # Project dependencies
-from wca_nr_api.config.constants import ENVIRONMENT_FOLDER, EXPECTED_ENV_VARS
+from wca_nr_api.config.constants import ALL_COUNTRIES, ENVIRONMENT_FOLDER, EXPECTED_ENV_VARS
 from wca_nr_api.config.logger import logger
 
 def load_environment():
@@ -20,3 +20,17 @@ def load_environment():
     for expected_env_var in EXPECTED_ENV_VARS:
         if not os.environ.get(expected_env_var):
             raise Exception(f"{expected_env_var} not found in environmental file in {ENVIRONMENT_FOLDER}/.env.")
+
+
+def get_tracked_countries() -> list[str] | None:
+    """
+    Returns the countries, whose national records are tracked next to the ones of "WCA_COUNTRY".
+    They are configured in "WCA_COUNTRIES" as a comma-separated list of country IDs, or "*" for all countries.
+
+    :return: (list) The IDs of the countries, empty if none are configured, "None" for all countries.
+    """
+
+    countries = os.environ.get("WCA_COUNTRIES", "").strip()
+    if countries == ALL_COUNTRIES:
+        return None
+    return [country.strip() for country in countries.split(",") if country.strip()]
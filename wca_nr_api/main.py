@@ -1,19 +1,26 @@
 # Python dependencies
 import os
-import shutil
 
 # Project dependencies
+from wca_nr_api.classes.competition import Competition
+from wca_nr_api.classes.leaderboards import Leaderboards
+from wca_nr_api.classes.record import Record
 from wca_nr_api.classes.records import Records
+from wca_nr_api.classes.region import Region
 from wca_nr_api.config.config import clear_files, setup_files
 from wca_nr_api.config.constants import *
-from wca_nr_api.config.environ import load_environment
+from wca_nr_api.config.environ import get_tracked_countries, load_environment
 from wca_nr_api.config.logger import logger
-from wca_nr_api.utils.database import execute_sql_script
-from wca_nr_api.utils.discord import send_record_announcement
+from wca_nr_api.utils.database import close_database, create_join_indexes, execute_sql_script
+from wca_nr_api.utils.discord import send_leaderboard_announcement, send_record_announcement
 from wca_nr_api.utils.file_utils import get_export_metadata, unarchive_latest_export
+from wca_nr_api.utils.fingerprint import FilteredRowsFingerprint
 from wca_nr_api.utils.mail import send_email
+from wca_nr_api.utils.records_engine import RecordsEngine
+from wca_nr_api.utils.results_utils import find_record_competitions
 from wca_nr_api.utils.sql_utils import filter_sql_dump
 from wca_nr_api.utils.storage import Storage
+from wca_nr_api.utils.tsv_utils import ingest_tsv_export
 from wca_nr_api.utils.wca_utils import WCAUtils
 
 
@@ -25,9 +32,9 @@ def extract_last_known_records() -> Storage:
     """
 
     # Extract old metadata and records
-    logger.info(f"Started extracting last known records from {os.path.join(RECORDS_FOLDER, RECORDS_FILENAME)}")
-    storage = Storage.from_json()
-    logger.info(f"Successfully extracted last known records from {os.path.join(RECORDS_FOLDER, RECORDS_FILENAME)}")
+    logger.info(f"Started extracting last known records from {Storage.location()}")
+    storage = Storage.load()
+    logger.info(f"Successfully extracted last known records from {Storage.location()}")
 
     # Validate storage
     if not storage.validate():
@@ -36,27 +43,48 @@ def extract_last_known_records() -> Storage:
     return storage
 
 
-def download_latest_wca_export(old_metadata_timestamp: str) -> bool:
+def extract_last_known_country_records(country: str) -> Storage:
     """
-    Retrieves the latest export information from the WCA website, checks if a new export is available, downloads the
+    Retrieves the last known records and metadata of a tracked country from its storage file.
+    A country, which is tracked for the first time, has no last known records.
+
+    :param country: (str) The tracked country.
+    :return: (Storage) An instance of the Storage class with metadata and all records of the country.
+    """
+
+    location = Storage.location(country)
+    if not Storage.exists(country):
+        logger.info(f"No last known records of {country} in {location}")
+        return Storage(None, Records.from_records([]))
+
+    logger.info(f"Started extracting last known records of {country} from {location}")
+    return Storage.load(country)
+
+
+def download_latest_wca_export(wca_utils: WCAUtils, old_metadata_timestamp: str,
+                               records_engine: RecordsEngine | None, fingerprint: FilteredRowsFingerprint) -> bool:
+    """
+    Checks if a new export is available based on the latest export information from the WCA website, downloads the
     new export and unarchives it.
 
+    :param wca_utils: (WCAUtils) The WCA utilities with the latest export information extracted.
     :param old_metadata_timestamp: (str) The timestamp of the last known export.
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
+    :param fingerprint: (FilteredRowsFingerprint) The fingerprint, which is computed from the filtered rows.
     :return: "True" if there was new export, "False" otherwise.
     """
 
-    # Define WCA utilities class
-    wca_utils = WCAUtils()
-
-    # Extract latest export information from WCA website
-    wca_utils.extract_latest_export_information()
-
     # Check if a new export is present (based on the saved metadata timestamp)
     if wca_utils.is_new_export_present(old_metadata_timestamp):
         logger.info("New export is available!")
 
-        # Download the latest export
-        wca_utils.download_latest_export()
+        if EXPORT_FORMAT == EXPORT_FORMAT_SQL and SQL_DUMP_SOURCE == SQL_DUMP_SOURCE_DOWNLOAD:
+            # Download the latest export and filter the SQL dump while it is still downloading
+            with wca_utils.stream_latest_export() as sql_dump:
+                filter_sql_dump(TABLE_FILTERS, sql_dump, records_engine, fingerprint)
+        else:
+            # Download the latest export
+            wca_utils.download_latest_export()
 
         # Unarchive the latest export
         unarchive_latest_export()
@@ -66,25 +94,187 @@ def download_latest_wca_export(old_metadata_timestamp: str) -> bool:
     return False
 
 
-def create_records_database() -> None:
+def filter_wca_export(records_engine: RecordsEngine | None, fingerprint: FilteredRowsFingerprint) -> None:
+    """
+    Filters the SQL dump (or the TSV export) based on the configured filters and passes the filtered rows
+    to the engine, which joins the records in memory (or to the configured output of the database).
+
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
+    :param fingerprint: (FilteredRowsFingerprint) The fingerprint, which is computed from the filtered rows.
+    """
+
+    # The TSV export is filtered and loaded in a single pass
+    if EXPORT_FORMAT == EXPORT_FORMAT_TSV:
+        ingest_tsv_export(TABLE_FILTERS, records_engine, fingerprint=fingerprint)
+    # When the SQL dump is read during the download, it is already filtered
+    elif SQL_DUMP_SOURCE != SQL_DUMP_SOURCE_DOWNLOAD:
+        filter_sql_dump(TABLE_FILTERS, output=records_engine, fingerprint=fingerprint)
+
+
+def create_records_database(records_engine: RecordsEngine | None) -> None:
     """
-    Filters the SQL dump based on the configured filters.
+    Creates the database of the filtered rows, from which the records are extracted with joins.
+
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
     """
 
-    filter_sql_dump(TABLE_FILTERS)
-    execute_sql_script()
+    # When the filtered rows are loaded directly, there is no SQL script to execute
+    if EXPORT_FORMAT == EXPORT_FORMAT_SQL and DATABASE_LOADER_MODE == DATABASE_LOADER_MODE_SCRIPT:
+        execute_sql_script()
+    # The records are extracted from the database with joins
+    if records_engine is None:
+        create_join_indexes()
 
 
-def extract_new_metadata_and_records() -> Storage:
+def extract_new_metadata_and_records(records_engine: RecordsEngine | None) -> Storage:
     """
     Extracts the new metadata and records based on the new WCA export and SQL dump.
 
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
     :return: (Storage) An instance of the Storage class with metadata and records.
     """
 
+    return extract_new_country_storage(records_engine, os.environ["WCA_COUNTRY"])
+
+
+def extract_new_country_metadata_and_records(records_engine: RecordsEngine | None) -> dict[str, Storage]:
+    """
+    Extracts the new metadata and records of the tracked countries (other than the configured one),
+    from the same WCA export and SQL dump.
+
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
+    :return: (dict) Dictionary of {country: Storage}.
+    """
+
+    return {country: extract_new_country_storage(records_engine, country)
+            for country in get_other_tracked_countries(records_engine)}
+
+
+def get_other_tracked_countries(records_engine: RecordsEngine | None) -> list[str]:
+    """
+    Returns the tracked countries other than the configured one.
+
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
+    :return: (list) The tracked countries - all countries, which have national records in the export, if all
+    countries are tracked.
+    """
+
+    tracked_countries = get_tracked_countries()
+    # All countries, which have national records in the export
+    if tracked_countries is None:
+        tracked_countries = records_engine.countries() if records_engine is not None else Records.extract_countries()
+
+    return [country for country in tracked_countries if country != os.environ["WCA_COUNTRY"]]
+
+
+def extract_new_country_storage(records_engine: RecordsEngine | None, country: str) -> Storage:
+    """
+    Extracts the new metadata, national records and regional (world and continental) records of a country.
+    The regional records are the national records, which are also ranked first in the region - they come from the
+    same ranks rows, without another pass over the data.
+
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
+    :param country: (str) The country.
+    :return: (Storage) An instance of the Storage class with metadata and records of the country.
+    """
+
+    metadata = get_export_metadata()
+    if records_engine is not None:
+        records = records_engine.to_records(country)
+        regional_records = {region: records_engine.to_records(country, region) for region in Region}
+    else:
+        records = Records(country=country)
+        regional_records = {region: Records(country=country, region=region) for region in Region}
+    return Storage(metadata, records, regional_records)
+
+
+def save_unchanged_storage(old_storage: Storage, fingerprint: FilteredRowsFingerprint,
+                           records_engine: RecordsEngine | None) -> None:
+    """
+    Saves the last known records of the configured and of the other tracked countries with the metadata of the new
+    export, when the filtered rows did not change.
+
+    :param old_storage: (Storage) The last known metadata and records.
+    :param fingerprint: (FilteredRowsFingerprint) The fingerprint of the filtered rows of the new export.
+    :param records_engine: (RecordsEngine) The engine, which joins the records in memory, if the database is skipped.
+    """
+
     metadata = get_export_metadata()
-    records = Records()
-    return Storage(metadata, records)
+    Storage(metadata | fingerprint.to_metadata(), old_storage.records, old_storage.regional_records).save()
+    logger.info(f"Saved the metadata of the new export to {Storage.location()}")
+
+    # The records of the other tracked countries did not change either
+    for country in get_other_tracked_countries(records_engine):
+        if Storage.exists(country):
+            old_country_storage = Storage.load(country)
+            Storage(metadata, old_country_storage.records, old_country_storage.regional_records).save(country)
+            logger.info(f"Saved the metadata of the new export to {Storage.location(country)}")
+
+
+def find_announced_competitions(records: list[Record]) -> dict[Record, Competition]:
+    """
+    Finds the competitions of the announced records. The competitions only enrich the announcements, so if they
+    cannot be found, the error is logged and the records are announced without them.
+    The results are scanned only when there are records to announce.
+
+    :param records: (list) The announced records.
+    :return: (dict) Dictionary of {record: competition}, empty if the competitions cannot be found.
+    """
+
+    try:
+        return find_record_competitions(records)
+    except Exception as e:
+        logger.error(f"Could not find the competitions of the announced records: {e}")
+        return {}
+
+
+def check_for_new_regional_records(old_storage: Storage, new_storage: Storage) -> dict[Region, list[Record]]:
+    """
+    Compares the world and continental records of a country and returns the new ones.
+    A regional record is new also if nobody from the country held it before.
+
+    :param old_storage: (Storage) The last known metadata and records.
+    :param new_storage: (Storage) The new metadata and records.
+    :return: (dict) Dictionary of {region: new records}.
+    """
+
+    # Nothing to compare with, if the last known records were stored before the regional records were tracked
+    if old_storage.regional_records is None:
+        logger.info("No last known regional records - the current ones are only stored.")
+        return {}
+
+    return {
+        region: records.check_for_new_records(old_storage.regional_records.get(region, Records.from_records([])),
+                                              allow_vacant=True, name=region.abbreviation())
+        for region, records in new_storage.regional_records.items()
+    }
+
+
+def save_new_storage(new_storage: Storage, new_records: list[Record], country: str = None) -> None:
+    """
+    Saves the new storage to its file and keeps a backup of it if there are new records.
+
+    :param new_storage: (Storage) The new metadata and records.
+    :param new_records: (list) The new records.
+    :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+    """
+
+    # Save new storage to file
+    new_storage.save(country)
+    logger.info(f"Saved new version of records to {Storage.location(country)}")
+
+    # Keep a backup of the records file if there are new records
+    if new_records:
+        # Destination
+        backup_date = new_storage.metadata.get("export_date").split(' ')[0]
+        if country is None:
+            backup_filename = BACKUP_FILENAME.format(date=backup_date)
+        else:
+            backup_filename = BACKUP_COUNTRY_FILENAME.format(country=country, date=backup_date)
+        destination = os.path.join(BACKUP_FOLDER, backup_filename)
+        # Make a backup - always as a JSON file
+        new_storage.to_json(location=destination)
+        logger.info(f"Saved backup of new records to {destination}")
 
 
 if __name__ == '__main__':
@@ -94,51 +284,114 @@ if __name__ == '__main__':
         # Load and validate environmental variables
         load_environment()
 
-        # Setup files and folders
-        setup_files()
-
-        # Extract last known records from storage
-        old_storage = extract_last_known_records()
+        # Extract latest export information from WCA website
+        wca_utils = WCAUtils()
+        wca_utils.extract_latest_export_information()
 
-        # Check and download latest export from WCA
-        if not download_latest_wca_export(old_storage.metadata.get("export_date")):
-            logger.info("No new export is available!")
+        # The export information did not change since the last processed export - nothing else to do
+        if wca_utils.not_modified:
+            logger.info("Export information is not modified. No new export is available!")
 
         else:
-            # Verify export format version
-            if get_export_metadata().get("export_format_version") != old_storage.metadata.get("export_format_version"):
-                raise ValueError("Different export format version. Revisit.")
-
-            # Create records database
-            create_records_database()
-
-            # Extract new metadata and records
-            new_storage = extract_new_metadata_and_records()
-
-            # Check for new records
-            new_records = new_storage.records.check_for_new_records(old_storage.records)
-
-            # Announce new records in Discord
-            for nr in new_records:
-                send_record_announcement(nr)
-
-            # Save new storage to file
-            new_storage.to_json()
-            logger.info(f"Saved new version of records to {os.path.join(RECORDS_FOLDER, RECORDS_FILENAME)}")
-
-            # Keep a backup of the records file if there are new records
-            if new_records:
-                # Source
-                source = os.path.join(RECORDS_FOLDER, RECORDS_FILENAME)
-                # Destination
-                backup_date = new_storage.metadata.get("export_date").split(' ')[0]
-                destination = os.path.join(BACKUP_FOLDER, BACKUP_FILENAME.format(date=backup_date))
-                # Make a backup
-                shutil.copyfile(source, destination, follow_symlinks=False)
-                logger.info(f"Saved backup of new records to {destination}")
-
-            # Clear files and folders
-            clear_files()
+            # Setup files and folders
+            setup_files()
+
+            # Extract last known records from storage
+            old_storage = extract_last_known_records()
+
+            # National leaderboards, if they are computed
+            leaderboards = Leaderboards(LEADERBOARD_SIZE) if LEADERBOARD_SIZE > 0 else None
+            # Join the records in memory, unless they are extracted from the database
+            records_engine = RecordsEngine(leaderboards) if DATABASE_LOADER_MODE == DATABASE_LOADER_MODE_MEMORY else None
+
+            # Fingerprint of the filtered rows, which the records depend on, checking the last known schema
+            fingerprint = FilteredRowsFingerprint(old_storage.metadata.get("schema_fingerprints"))
+
+            # Check and download latest export from WCA
+            if not download_latest_wca_export(wca_utils, old_storage.metadata.get("export_date"), records_engine,
+                                              fingerprint):
+                logger.info("No new export is available!")
+
+            else:
+                # Verify export format version
+                if get_export_metadata().get("export_format_version") != old_storage.metadata.get("export_format_version"):
+                    raise ValueError("Different export format version. Revisit.")
+
+                # Filter the export and compare the fingerprint of the filtered rows with the last known one
+                filter_wca_export(records_engine, fingerprint)
+                rows_fingerprint = fingerprint.hexdigest()
+
+                if rows_fingerprint == old_storage.metadata.get("rows_fingerprint"):
+                    # Nothing, which the records depend on, changed - only the metadata of the export is saved
+                    logger.info("The filtered rows did not change since the last known export. No new records!")
+                    # All countries with national records are extracted from the database, if it is not skipped
+                    if records_engine is None and get_tracked_countries() is None:
+                        create_records_database(records_engine)
+                    save_unchanged_storage(old_storage, fingerprint, records_engine)
+
+                else:
+                    # Create records database
+                    create_records_database(records_engine)
+                    # The engine fills the leaderboards while joining, otherwise they are extracted from the database
+                    if leaderboards is not None and records_engine is None:
+                        leaderboards.extract()
+
+                    # Extract new metadata and records
+                    new_storage = extract_new_metadata_and_records(records_engine)
+                    new_storage.metadata.update(fingerprint.to_metadata())
+
+                    # Check for new records
+                    new_records = new_storage.records.check_for_new_records(old_storage.records)
+                    new_regional_records = check_for_new_regional_records(old_storage, new_storage)
+                    # Check for new entries in the leaderboards
+                    new_entries = []
+                    if leaderboards is not None:
+                        new_entries = leaderboards.check_for_new_entries(Leaderboards.from_json(), os.environ["WCA_COUNTRY"])
+
+                    # Find the competitions of everything, which is announced
+                    competitions = find_announced_competitions(list(dict.fromkeys(
+                        new_records + sum(new_regional_records.values(), []) + [record for _, record in new_entries])))
+
+                    # Announce new records in Discord - every record once, as a record of the largest region
+                    announced_records = set()
+                    for region in Region:
+                        for record in new_regional_records.get(region, []):
+                            if record not in announced_records:
+                                send_record_announcement(record, region, competitions.get(record))
+                                announced_records.add(record)
+                    for nr in new_records:
+                        if nr not in announced_records:
+                            send_record_announcement(nr, competition=competitions.get(nr))
+
+                    # Save new storage to file and keep a backup
+                    save_new_storage(new_storage, new_records + sum(new_regional_records.values(), []))
+
+                    if leaderboards is not None:
+                        # Announce new entries in the leaderboards in Discord, unless they are announced as records
+                        for position, record in new_entries:
+                            if record not in announced_records:
+                                send_leaderboard_announcement(record, position, leaderboards.size,
+                                                              competitions.get(record))
+
+                        # Publish the leaderboards
+                        leaderboards.to_json()
+                        logger.info(f"Saved new version of leaderboards to {os.path.join(RECORDS_FOLDER, LEADERBOARDS_FILENAME)}")
+
+                    # Check for new records of the other tracked countries, extracted from the same export
+                    for country, new_country_storage in extract_new_country_metadata_and_records(records_engine).items():
+                        old_country_storage = extract_last_known_country_records(country)
+                        new_country_records = new_country_storage.records.check_for_new_records(old_country_storage.records)
+                        new_country_regional_records = check_for_new_regional_records(old_country_storage,
+                                                                                      new_country_storage)
+                        save_new_storage(new_country_storage,
+                                         new_country_records + sum(new_country_regional_records.values(), []), country)
+
+                # Close the database and clear files and folders
+                close_database()
+                clear_files()
+
+            # Remember the export information only once the export is processed
+            wca_utils.save_export_information_cache()
 
         success = True
     except Exception as e:
@@ -1,9 +1,11 @@
 import os
 import sqlite3
 from sqlite3 import Cursor
+from typing import Iterable
 
 from wca_nr_api.config.constants import *
 from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns
 
 def execute_sql_script() -> None:
 	"""
@@ -23,27 +25,142 @@ def execute_sql_script() -> None:
 		database.executescript(sql_script)
 
 
+def create_join_indexes() -> None:
+	"""
+	Creates the indexes for joining the ranks with the persons, once the tables are loaded.
+	Creating them after the bulk load is faster than updating them on every inserted row.
+	"""
+
+	with DB() as database:
+		database.execute(f"CREATE INDEX IF NOT EXISTS `idx_{TABLE_PERSONS}_wca_id` ON `{TABLE_PERSONS}` (`wca_id`)")
+		for table in (TABLE_RANKS_SINGLE, TABLE_RANKS_AVERAGE):
+			database.execute(f"CREATE INDEX IF NOT EXISTS `idx_{table}_{COLUMN_COUNTRY_RANK}` "
+							 f"ON `{table}` (`{COLUMN_COUNTRY_RANK}`, `person_id`)")
+		database.execute("ANALYZE")
+	logger.info("Created the join indexes of the database.")
+
+
+def close_database() -> None:
+	"""
+	Closes the connection, which is shared by all "DB" contexts. An in-memory database is discarded with it.
+	"""
+
+	global _connection
+
+	if _connection is not None:
+		_connection.close()
+		_connection = None
+		logger.info("Closed the database connection.")
+
+
+# Connection, shared by all "DB" contexts of the run
+_connection: sqlite3.Connection | None = None
+
+
 class DB:
 	def __enter__(self) -> Cursor:
 		"""
-		Creates a connection to the database.
+		Returns a cursor of the connection to the database, which is shared by all contexts.
+		The connection is created by the first context - either to the database file or to an in-memory database,
+		depending on the configured location.
 
 		:return: (Cursor) The SQLite3 cursor
 		"""
 
-		# Get path to database
-		database_file_location = os.path.join(DATABASE_FOLDER, DATABASE_FILENAME)
-		# Create connection
-		self.conn = sqlite3.connect(database_file_location)
+		global _connection
+
+		if _connection is None:
+			if DATABASE_LOCATION == DATABASE_LOCATION_MEMORY:
+				database_location = ":memory:"
+			else:
+				# Get path to database
+				database_location = os.path.join(DATABASE_FOLDER, DATABASE_FILENAME)
+			logger.info(f"Connecting to database {database_location}")
+
+			# Create connection
+			_connection = sqlite3.connect(database_location)
+			# No rollback journal and no syncing - the database is rebuilt from the SQL dump on every run anyway
+			_connection.execute("PRAGMA journal_mode = OFF")
+			_connection.execute("PRAGMA synchronous = OFF")
+			_connection.execute(f"PRAGMA cache_size = -{DATABASE_CACHE_SIZE_KIB}")
+			_connection.execute("PRAGMA temp_store = MEMORY")
+
+		self.conn = _connection
 		# Return cursor
 		return self.conn.cursor()
 
 	def __exit__(self, type, value, traceback) -> None:
 		"""
-		Commits the changes made to the database and closes the connection.
+		Commits the changes made to the database. The connection stays open for the next context.
 		"""
 
 		# Commit changes
 		self.conn.commit()
-		# Close connection
-		self.conn.close()
+
+
+class SQLiteLoader:
+	"""
+	Loads the filtered statements of the SQL dump (or the filtered rows of the TSV export) directly into the local
+	database, without an intermediate SQL script.
+	The rows are parsed into tuples and inserted with prepared statements in a single transaction.
+	"""
+
+	def __init__(self, database: Cursor):
+		"""
+		Initializer for the "SQLiteLoader" class.
+
+		:param database: (Cursor) The SQLite3 cursor of the local database.
+		"""
+
+		self._database = database
+		self._insert_queries = {}
+		self._tokenizers = {}
+
+		# All rows are inserted in a single transaction
+		self._database.execute("BEGIN")
+
+	def drop_tables(self, tables: list[str]) -> None:
+		"""
+		Drops the tables if they exist.
+
+		:param tables: (list) The names of the tables.
+		"""
+
+		for table in tables:
+			self._database.execute(f"DROP TABLE IF EXISTS `{table}`")
+
+	def create_table(self, table: str, statement: str) -> None:
+		"""
+		Creates a table and prepares the INSERT statement for its rows.
+
+		:param table: (str) The name of the table.
+		:param statement: (str) The CREATE TABLE statement.
+		"""
+
+		self._database.execute(statement)
+
+		# Tokenizer and prepared statement with a placeholder for every column
+		columns = parse_create_table_columns(statement)
+		self._tokenizers[table] = RowTokenizer(columns)
+		self._insert_queries[table] = f"INSERT INTO `{table}` VALUES ({', '.join('?' * len(columns))})"
+
+	def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+		"""
+		Parses a batch of rows of an INSERT statement and inserts them into the table.
+
+		:param table: (str) The name of the table.
+		:param insert_statement: (str) The beginning of the INSERT statement (unused, the prepared statement is used).
+		:param values: (list) The batch of rows of the INSERT statement.
+		"""
+
+		self.insert_rows(table, map(self._tokenizers[table].parse, values))
+
+	def insert_rows(self, table: str, rows: Iterable[tuple]) -> None:
+		"""
+		Inserts a batch of already parsed rows into the table.
+
+		:param table: (str) The name of the table.
+		:param rows: (Iterable) The batch of rows, with a value for every column.
+		"""
+
+		self._database.executemany(self._insert_queries[table], rows)
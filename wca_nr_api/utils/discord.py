@@ -6,28 +6,90 @@ import time
 import requests
 
 # Project dependencies
+from wca_nr_api.classes.competition import Competition
 from wca_nr_api.classes.gender import Gender
 from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.region import Region
 from wca_nr_api.classes.result_type import ResultType
 from wca_nr_api.config.logger import logger
 
 
-def send_record_announcement(record: Record) -> None:
+def send_record_announcement(record: Record, region: Region = None, competition: Competition = None) -> None:
     """
-    Sends a message to Discord in the form of an announcement. Tries 3 times in case rate is limited.
+    Sends a message to Discord in the form of an announcement.
 
     :param record: (Record) The new national record, which is announced.
+    :param region: (Region) The region, if the record is a new world or continental record.
+    :param competition: (Competition) The competition, at which the record was set, if it is known.
     """
 
-    webhook_url = os.environ["WEBHOOK_URL"]
     role_id = os.environ["ROLE_ID"]
 
+    # Name of the record based on its region
+    match region:
+        case Region.WORLD:
+            record_name = "световен"
+        case Region.CONTINENT:
+            record_name = "континентален"
+        case _:
+            record_name = "национален"
+
     # Generate message content based on the record
     content = (f"**<@&{role_id}>**, поздравете "
                f"**[{record.name}](https://www.worldcubeassociation.org/persons/{record.person_id})** :flag_bg:,\n"
-               f"{"който" if record.gender == Gender.MALE else "която" } постави нов национален рекорд за "
+               f"{"който" if record.gender == Gender.MALE else "която" } постави нов {record_name} рекорд за "
+               f"{"най-добро" if record.result_type == ResultType.SINGLE else "средно"} време "
+               f"в дисциплината **{record.event.readable_name()}** - **{record.readable_result()}**"
+               f"{competition_text(competition)} 🎉")
+    send_message(content, role_id)
+
+
+def send_leaderboard_announcement(record: Record, position: int, size: int, competition: Competition = None) -> None:
+    """
+    Sends a message to Discord in the form of an announcement, when a person enters a national leaderboard.
+
+    :param record: (Record) The result, with which the person entered the leaderboard.
+    :param position: (int) The position of the result in the leaderboard.
+    :param size: (int) The number of results in the leaderboard.
+    :param competition: (Competition) The competition, at which the result was set, if it is known.
+    """
+
+    role_id = os.environ["ROLE_ID"]
+
+    # Generate message content based on the result
+    content = (f"Поздравете "
+               f"**[{record.name}](https://www.worldcubeassociation.org/persons/{record.person_id})** :flag_bg:,\n"
+               f"{"който" if record.gender == Gender.MALE else "която" } влезе в националния топ {size} за "
                f"{"най-добро" if record.result_type == ResultType.SINGLE else "средно"} време "
-               f"в дисциплината **{record.event.readable_name()}** - **{record.readable_result()}** 🎉")
+               f"в дисциплината **{record.event.readable_name()}** - **{record.readable_result()}** "
+               f"(№ {position}){competition_text(competition)} 🎉")
+
+    send_message(content, role_id)
+
+
+def competition_text(competition: Competition | None) -> str:
+    """
+    Returns the part of an announcement, which names the competition and the date of a result.
+
+    :param competition: (Competition) The competition, at which the result was set.
+    :return: (str) The text for the competition, empty if the competition is not known.
+    """
+
+    if competition is None:
+        return ""
+    return f" на **[{competition.name}]({competition.url()})** ({competition.readable_date()})"
+
+
+def send_message(content: str, role_id: str) -> None:
+    """
+    Sends a message to Discord. Tries 3 times in case rate is limited.
+
+    :param content: (str) The content of the message.
+    :param role_id: (str) The ID of the role, which can be mentioned in the message.
+    """
+
+    webhook_url = os.environ["WEBHOOK_URL"]
+
     data = {
         "username": "NR Bot",
         "content": content,
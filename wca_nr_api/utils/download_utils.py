@@ -0,0 +1,201 @@
+# Python dependencies
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any
+
+# External dependencies
+import requests
+
+# Project dependencies
+from wca_nr_api.config.constants import EXPORTS_DOWNLOAD_TIMEOUT
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.file_utils import open_atomically
+
+
+class RangedDownloader:
+    """
+    "RangedDownloader" downloads a file over several connections at once by splitting it into HTTP Range chunks.
+    The chunks are written at their offsets into a preallocated file. Completed chunks are tracked in a state file
+    next to the download, so that only the missing chunks are fetched again after a failure.
+    """
+
+    def __init__(self, url: str, location: str, connections: int, range_size: int, retries: int):
+        """
+        Initializer for the "RangedDownloader" class.
+
+        :param url: (str) The URL of the file to download.
+        :param location: (str) The path to save the file to.
+        :param connections: (int) The number of concurrent connections.
+        :param range_size: (int) The size of a single chunk in bytes.
+        :param retries: (int) The number of rounds, in which the missing chunks are fetched again.
+        """
+
+        self._url = url
+        self._location = location
+        self._state_location = location + ".parts"
+        self._connections = connections
+        self._range_size = range_size
+        self._retries = retries
+
+    def download(self) -> None:
+        """
+        Downloads the file. Falls back to a single connection if the server does not support ranges, also when it
+        announces them, but answers a ranged request with the whole file.
+        """
+
+        # Get the size of the file and check for range support
+        logger.info(f"Sending HEAD request to {self._url}")
+        response = requests.head(self._url, allow_redirects=True, timeout=EXPORTS_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+
+        # Use the final URL, so that redirects are not followed for every chunk
+        url = response.url
+        size = int(response.headers.get("Content-Length", 0))
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+        if response.headers.get("Accept-Ranges") != "bytes" or size == 0:
+            logger.warning(f"{self._url} does not support ranged requests, downloading over a single connection")
+            self.__download_single(url)
+            return
+
+        chunks = [(start, min(start + self._range_size, size) - 1) for start in range(0, size, self._range_size)]
+        state = self.__load_state(url, size, validator)
+        self.__preallocate(size, resume=bool(state["completed"]))
+
+        # Whether the server answers the ranged requests with the chunks, and not with the whole file
+        ranged = True
+        for attempt in range(1, self._retries + 1):
+            missing = [i for i in range(len(chunks)) if i not in state["completed"]]
+            if not missing or not ranged:
+                break
+
+            logger.info(f"Downloading {len(missing)}/{len(chunks)} chunks of {size} bytes "
+                        f"over {self._connections} connections (attempt {attempt})")
+            with ThreadPoolExecutor(max_workers=self._connections) as executor:
+                futures = {executor.submit(self.__download_chunk, url, validator, *chunks[i]): i for i in missing}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        ranged = future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to download chunk {index} {chunks[index]}: {e}")
+                        continue
+
+                    if not ranged:
+                        # The running chunks are waited for, so nothing writes to the file after the fallback
+                        executor.shutdown(cancel_futures=True)
+                        break
+
+                    # The futures are completed in this thread only, so the state is not shared
+                    state["completed"].append(index)
+                    self.__save_state(state)
+
+        if not ranged:
+            logger.warning(f"{self._url} answered a ranged request with the whole file, "
+                           "downloading over a single connection")
+            if os.path.exists(self._state_location):
+                os.remove(self._state_location)
+            self.__download_single(url)
+            return
+
+        if len(state["completed"]) != len(chunks):
+            raise Exception(f"Failed to download {len(chunks) - len(state['completed'])} chunks of {self._url} "
+                            f"after {self._retries} attempts")
+
+        # The download is complete - the state is not needed anymore
+        os.remove(self._state_location)
+        logger.info(f"Downloaded {size} bytes from {self._url} to {self._location}")
+
+    def __download_chunk(self, url: str, validator: str, start: int, end: int) -> bool:
+        """
+        Downloads a single chunk and writes it at its offset in the file.
+
+        :param url: (str) The URL of the file.
+        :param validator: (str) The ETag or Last-Modified of the file, so that a changed file is not mixed in.
+        :param start: (int) The first byte of the chunk.
+        :param end: (int) The last byte of the chunk (inclusive).
+        :return: (bool) Whether the chunk was received, "False" if the server answered with the whole file.
+        """
+
+        headers = {"Range": f"bytes={start}-{end}"}
+        if validator:
+            headers["If-Range"] = validator
+
+        with requests.get(url, headers=headers, stream=True, timeout=EXPORTS_DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            # Anything else than "206 Partial Content" is the whole file, ignoring the range or because it changed
+            if response.status_code != 206:
+                return False
+
+            with open(self._location, "r+b") as f:
+                f.seek(start)
+                written = 0
+                for block in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(block)
+                    written += len(block)
+
+        if written != end - start + 1:
+            raise Exception(f"Received {written} bytes instead of {end - start + 1}")
+        return True
+
+    def __download_single(self, url: str) -> None:
+        """
+        Downloads the file over a single connection.
+
+        :param url: (str) The URL of the file.
+        """
+
+        with (requests.get(url, stream=True, timeout=EXPORTS_DOWNLOAD_TIMEOUT) as response,
+              open(self._location, "wb") as f):
+            response.raise_for_status()
+            for block in response.iter_content(chunk_size=1024 * 1024):
+                f.write(block)
+
+    def __preallocate(self, size: int, resume: bool) -> None:
+        """
+        Creates the file with its final size, keeping the already downloaded chunks when resuming.
+
+        :param size: (int) The size of the file.
+        :param resume: (bool) Whether a previous download is resumed.
+        """
+
+        with open(self._location, "r+b" if resume else "wb") as f:
+            f.truncate(size)
+
+    def __load_state(self, url: str, size: int, validator: str) -> dict[str, Any]:
+        """
+        Loads the state of a previous download of the same file, or creates a new one.
+
+        :param url: (str) The URL of the file.
+        :param size: (int) The size of the file.
+        :param validator: (str) The ETag or Last-Modified of the file.
+        :return: (dict) The state with the indexes of the completed chunks.
+        """
+
+        state = {"url": url, "size": size, "validator": validator, "range_size": self._range_size, "completed": []}
+
+        try:
+            with open(self._state_location, "r") as f:
+                old_state = json.load(f)
+        except (OSError, ValueError):
+            return state
+
+        # Resume only if it is the same file, split in the same way, and the partial download is still present
+        if not os.path.exists(self._location) or os.path.getsize(self._location) != size:
+            return state
+        if validator and all(old_state.get(key) == state[key] for key in ("size", "validator", "range_size")):
+            logger.info(f"Resuming download of {self._url} - {len(old_state['completed'])} chunks already present")
+            state["completed"] = old_state["completed"]
+
+        return state
+
+    def __save_state(self, state: dict[str, Any]) -> None:
+        """
+        Saves the state of the download atomically.
+
+        :param state: (dict) The state with the indexes of the completed chunks.
+        """
+
+        with open_atomically(self._state_location) as f:
+            json.dump(state, f)
@@ -1,7 +1,10 @@
 # Python dependencies
+import io
 import json
+import mmap
 import os
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterator, TextIO
 from zipfile import ZipFile
 
 # Project dependencies
@@ -9,25 +12,113 @@ from wca_nr_api.config.constants import *
 from wca_nr_api.config.logger import logger
 
 
+def get_export_archive_location() -> str:
+    """
+    Returns the path to the ZIP archive of the export in the configured format.
+
+    :return: (str) The path to the archive.
+    """
+
+    if EXPORT_FORMAT == EXPORT_FORMAT_TSV:
+        return os.path.join(EXPORTS_FOLDER, EXPORTS_TSV_ARCHIVE_FILENAME)
+    return os.path.join(EXPORTS_FOLDER, EXPORTS_ARCHIVE_FILENAME)
+
+
 def unarchive_latest_export() -> None:
     """
     Unzips the results export archive.
+    If the SQL dump or the TSV files are read directly from the archive, only the metadata file is extracted.
     """
 
     # Get path to ZIP archive
-    archive_location = os.path.join(EXPORTS_FOLDER, EXPORTS_ARCHIVE_FILENAME)
+    archive_location = get_export_archive_location()
     logger.info(f"Attempting to unarchive archive stored in: {archive_location}")
 
     # Open archive in reading mode
     with ZipFile(archive_location, "r") as zf:
+        # Extract only the metadata, the SQL dump or the TSV files are read from the archive later
+        if EXPORT_FORMAT == EXPORT_FORMAT_TSV or SQL_DUMP_SOURCE != SQL_DUMP_SOURCE_EXTRACTED:
+            zf.extract(EXPORTS_METADATA_FILENAME, EXPORTS_FOLDER)
         # Extract archive
-        zf.extractall(EXPORTS_FOLDER)
+        else:
+            zf.extractall(EXPORTS_FOLDER)
         zf.close()
 
         logger.info(f"Extracted files are stored in: {EXPORTS_FOLDER}")
         logger.info(f"Files: {[f for f in os.listdir(EXPORTS_FOLDER)]}")
 
 
+@contextmanager
+def open_sql_dump() -> Iterator[TextIO]:
+    """
+    Opens the SQL dump of the export for reading in text mode with a large read buffer.
+    Depending on the configured source, the dump is either the extracted file in the exports folder or the
+    "WCA_export.sql" member, decompressed on the fly from the archive.
+    When the dump was read during the download, the downloaded archive is read again.
+
+    :return: (TextIO) The SQL dump as a text stream.
+    """
+
+    # Read the SQL dump directly from the archive
+    if SQL_DUMP_SOURCE in (SQL_DUMP_SOURCE_ARCHIVE, SQL_DUMP_SOURCE_DOWNLOAD):
+        archive_location = os.path.join(EXPORTS_FOLDER, EXPORTS_ARCHIVE_FILENAME)
+        logger.info(f"Streaming {EXPORTS_SQL_FILENAME} from archive {archive_location}")
+
+        with ZipFile(archive_location, "r") as zf, zf.open(EXPORTS_SQL_FILENAME, "r") as member:
+            # Large buffer, so that the member is decompressed in big blocks instead of 4 KB reads
+            buffered_member = io.BufferedReader(member, buffer_size=EXPORTS_READ_BUFFER_SIZE)
+            yield io.TextIOWrapper(buffered_member, encoding="utf-8", errors="ignore")
+
+    # Read the extracted SQL dump
+    else:
+        sql_dump_location = os.path.join(EXPORTS_FOLDER, EXPORTS_SQL_FILENAME)
+        logger.info(f"Reading extracted {EXPORTS_SQL_FILENAME} from {sql_dump_location}")
+
+        with open(sql_dump_location, "r", encoding="utf-8", errors="ignore",
+                  buffering=EXPORTS_READ_BUFFER_SIZE) as sql_dump:
+            yield sql_dump
+
+
+@contextmanager
+def map_sql_dump() -> Iterator[mmap.mmap]:
+    """
+    Memory-maps the extracted SQL dump of the export for reading.
+
+    :return: (mmap) The memory-mapped SQL dump.
+    """
+
+    if SQL_DUMP_SOURCE != SQL_DUMP_SOURCE_EXTRACTED:
+        raise ValueError(f"Memory-mapping the SQL dump requires it to be extracted (source {SQL_DUMP_SOURCE}).")
+
+    sql_dump_location = os.path.join(EXPORTS_FOLDER, EXPORTS_SQL_FILENAME)
+    logger.info(f"Memory-mapping extracted {EXPORTS_SQL_FILENAME} from {sql_dump_location}")
+
+    with open(sql_dump_location, "rb") as sql_dump, \
+            mmap.mmap(sql_dump.fileno(), 0, access=mmap.ACCESS_READ) as sql_dump_map:
+        yield sql_dump_map
+
+
+@contextmanager
+def open_atomically(location: str, mode: str = "w") -> Iterator[TextIO]:
+    """
+    Opens a temporary file next to the given file for writing and replaces the file with it, once it is written.
+    If writing fails, the file is left as it was.
+
+    :param location: (str) The path to the file.
+    :param mode: (str) The mode, in which the temporary file is opened for writing.
+    :return: (TextIO) The temporary file.
+    """
+
+    temporary_location = f"{location}.tmp"
+    try:
+        with open(temporary_location, mode) as f:
+            yield f
+        os.replace(temporary_location, location)
+    finally:
+        if os.path.exists(temporary_location):
+            os.remove(temporary_location)
+
+
 def get_export_metadata() -> dict[str, Any]:
     """
     Extracts the metadata of the export, including date and version.
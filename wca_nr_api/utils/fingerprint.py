@@ -0,0 +1,204 @@
+# Python dependencies
+import hashlib
+from typing import Any, Iterable, Self
+
+# Project dependencies
+from wca_nr_api.classes.region import Region
+from wca_nr_api.config.constants import *
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns
+
+
+def get_schema_fingerprint(columns: list[str]) -> str:
+    """
+    Returns the fingerprint of the schema of a table - the hash of the names of its columns, in their order.
+
+    :param columns: (list) The names of the columns of the table.
+    :return: (str) The hexadecimal SHA-256 hash.
+    """
+
+    return hashlib.sha256(",".join(columns).encode()).hexdigest()
+
+
+class FilteredRowsFingerprint:
+    """
+    "FilteredRowsFingerprint" computes a content hash of the filtered rows, which the records depend on.
+    It is put between the filter and its output and forwards every call to the output, while it keeps the current
+    rows of the persons by WCA ID and the needed columns of the rows of the ranks tables.
+
+    The columns of every table are checked against the last known schema as soon as its CREATE TABLE statement
+    is met, so a changed export fails in the first seconds of the stream, before any of its rows are loaded.
+
+    The hash is taken over the ranks joined with the persons - the ranks of the persons, who are not kept, and the
+    exact world and continent ranks (other than the first) change with almost every export, but not the records.
+    The values are hashed as text, so the rows of the SQL dump and of the TSV export have the same fingerprint.
+    The persons come before the ranks in both exports, so the ranks are hashed as they are inserted - only the ranks,
+    which come before the persons are complete, are kept until the fingerprint is taken.
+    """
+
+    def __init__(self, known_schemas: dict[str, str] = None):
+        """
+        Initializer for the "FilteredRowsFingerprint" class.
+
+        :param known_schemas: (dict) The last known schema fingerprints by table. No schema is checked if not passed.
+        """
+
+        self._output = None
+        self._known_schemas = known_schemas or {}
+        self._schemas: dict[str, str] = {}
+        self._tokenizers: dict[str, RowTokenizer] = {}
+        self._columns: dict[str, tuple[int, ...]] = {}
+
+        # Current rows of the persons by WCA ID, the ranks waiting for the persons and the hash of the joined ranks
+        self._persons: dict[str, str] = {}
+        self._persons_complete = False
+        self._pending_ranks: list[str] = []
+        self._digest = hashlib.sha256()
+
+    @property
+    def schemas(self) -> dict[str, str]:
+        return self._schemas
+
+    def wrap(self, output: Any) -> Self:
+        """
+        Sets the output, to which the calls of the filter are forwarded.
+
+        :param output: (Any) The output of the filter, e.g. "RecordsEngine".
+        :return: (FilteredRowsFingerprint) The fingerprint, to be used as the output of the filter.
+        """
+
+        self._output = output
+        return self
+
+    def drop_tables(self, tables: list[str]) -> None:
+        """
+        Forwards the dropping of the tables.
+
+        :param tables: (list) The names of the tables.
+        """
+
+        self._output.drop_tables(tables)
+
+    def create_table(self, table: str, statement: str) -> None:
+        """
+        Checks the columns of the table against its last known schema, forwards the CREATE TABLE statement and
+        prepares the positions of the hashed columns of the table.
+
+        :param table: (str) The name of the table.
+        :param statement: (str) The CREATE TABLE statement.
+        """
+
+        columns = parse_create_table_columns(statement)
+        schema = get_schema_fingerprint(columns)
+        if table in self._known_schemas and self._known_schemas[table] != schema:
+            raise ValueError(f"Different columns of table `{table}` in the export: {columns}. Revisit.")
+        self._schemas[table] = schema
+
+        self._output.create_table(table, statement)
+
+        # The tables come one after another, so the persons are complete once the next table starts
+        if TABLE_PERSONS in self._schemas and table != TABLE_PERSONS and not self._persons_complete:
+            self._persons_complete = True
+            self.__hash_pending_ranks()
+
+        tokenizer = RowTokenizer(columns)
+        self._tokenizers[table] = tokenizer
+        if table == TABLE_PERSONS:
+            self._columns[table] = (tokenizer.index("wca_id"), tokenizer.index(COLUMN_SUB_ID),
+                                    tokenizer.index("name"), tokenizer.index("gender"),
+                                    tokenizer.index(COLUMN_COUNTRY_ID))
+        elif table in (TABLE_RANKS_SINGLE, TABLE_RANKS_AVERAGE):
+            self._columns[table] = (tokenizer.index("person_id"), tokenizer.index("event_id"),
+                                    tokenizer.index("best"), tokenizer.index(COLUMN_COUNTRY_RANK),
+                                    tokenizer.index(Region.WORLD.rank_column()),
+                                    tokenizer.index(Region.CONTINENT.rank_column()))
+
+    def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+        """
+        Forwards a batch of rows of an INSERT statement and adds them to the fingerprint.
+
+        :param table: (str) The name of the table.
+        :param insert_statement: (str) The beginning of the INSERT statement.
+        :param values: (list) The batch of rows of the INSERT statement.
+        """
+
+        self._output.insert(table, insert_statement, values)
+        if table in self._columns:
+            self.__add_rows(table, map(self._tokenizers[table].parse, values))
+
+    def insert_rows(self, table: str, rows: Iterable[tuple]) -> None:
+        """
+        Forwards a batch of already parsed rows and adds them to the fingerprint.
+
+        :param table: (str) The name of the table.
+        :param rows: (Iterable) The batch of rows, with a value for every column.
+        """
+
+        rows = list(rows)
+        self._output.insert_rows(table, rows)
+        if table in self._columns:
+            self.__add_rows(table, rows)
+
+    def hexdigest(self) -> str:
+        """
+        Returns the fingerprint of the filtered rows - the hash of every rank with the current row of its person.
+
+        :return: (str) The hexadecimal SHA-256 hash.
+        """
+
+        self.__hash_pending_ranks()
+        return self._digest.hexdigest()
+
+    def to_metadata(self) -> dict[str, Any]:
+        """
+        Returns the fingerprints, which are stored in the metadata of the records.
+
+        :return: (dict) Dictionary with the fingerprint of the filtered rows and the schema fingerprints by table.
+        """
+
+        return {"rows_fingerprint": self.hexdigest(), "schema_fingerprints": self.schemas}
+
+    def __add_rows(self, table: str, rows: Iterable[tuple]) -> None:
+        """
+        Keeps the hashed columns of a batch of rows of the persons as text and hashes the ones of the ranks.
+
+        :param table: (str) The name of the table.
+        :param rows: (Iterable) The batch of rows, with a value for every column.
+        """
+
+        columns = self._columns[table]
+        if table == TABLE_PERSONS:
+            wca_id_index, sub_id_index = columns[:2]
+            for row in rows:
+                if str(row[sub_id_index]) == "1":
+                    self._persons[str(row[wca_id_index])] = "\t".join(str(row[index]) for index in columns[2:])
+        else:
+            person_index, event_index, best_index, country_rank_index, world_rank_index, continent_rank_index = columns
+            # Only whether the national record is also a world or continental record matters
+            ranks = ["\t".join((
+                str(row[person_index]), table, str(row[event_index]), str(row[best_index]),
+                str(row[country_rank_index]), str(str(row[world_rank_index]) == "1"),
+                str(str(row[continent_rank_index]) == "1"))) for row in rows]
+            if self._persons_complete:
+                self.__hash_ranks(ranks)
+            else:
+                self._pending_ranks.extend(ranks)
+
+    def __hash_pending_ranks(self) -> None:
+        """
+        Adds the ranks, which came before the persons were complete, to the hash.
+        """
+
+        self.__hash_ranks(self._pending_ranks)
+        self._pending_ranks = []
+
+    def __hash_ranks(self, ranks: list[str]) -> None:
+        """
+        Adds the ranks of the kept persons, joined with the current rows of the persons, to the hash.
+
+        :param ranks: (list) The hashed columns of the ranks as text, in the order of the export.
+        """
+
+        for rank in ranks:
+            person = self._persons.get(rank.split("\t", 1)[0])
+            if person is not None:
+                self._digest.update(f"{rank}\t{person}\n".encode())
@@ -0,0 +1,350 @@
+# Python dependencies
+import json
+import os
+import re
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterable
+
+# Project dependencies
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.constants import *
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.file_utils import get_export_metadata, map_sql_dump, open_atomically, open_sql_dump
+from wca_nr_api.utils.results_utils import get_competition_columns, get_competition_date
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns
+from wca_nr_api.utils.sql_utils import filter_sql_lines, get_filtered_countries, iter_sql_dump_sections
+from wca_nr_api.utils.tsv_utils import ingest_tsv_export
+
+# Columns of an entry of the progression file
+PROGRESSION_COLUMNS = ["person_id", "name", "result", "competition_id", "since", "until"]
+
+# Best results of rounds by event, country, type of result, competition and round - (result, [(WCA ID, name)])
+RoundResults = dict[tuple[str, str, ResultType, str, str], tuple[int, list[tuple[str, str]]]]
+
+
+def backfill_national_record_progression() -> dict[str, Any]:
+    """
+    Computes the progression of the national records of every event - who held each record, from when until when -
+    from the whole results table, and saves it to the progression file.
+
+    The results section is streamed and its rows are parsed by a pool of processes in chunks. Every chunk is reduced
+    to the best results of every round by country, as only they can be national records, and the rounds are then
+    partitioned by event, so that the pool runs a chronological running minimum per event and type of result.
+
+    :return: (dict) The progression - {country: {event: {type: [entry]}}}, see "PROGRESSION_COLUMNS".
+    """
+
+    logger.info(f"Starting backfilling the national record progression ({EXPORT_FORMAT}, {SQL_DUMP_SOURCE}, "
+                f"{SQL_DUMP_SCAN_MODE}).")
+    tables = [TABLE_COMPETITIONS, TABLE_RESULTS]
+
+    with ProcessPoolExecutor(max_workers=SQL_DUMP_PARALLEL_WORKERS) as executor:
+        collector = ProgressionCollector(executor, get_filtered_countries())
+
+        # Only the TSV files of the two tables are decompressed
+        if EXPORT_FORMAT == EXPORT_FORMAT_TSV:
+            ingest_tsv_export(tables, collector, collector.tsv_row_filter)
+
+        # Search the memory-mapped SQL dump for the sections of the tables
+        elif SQL_DUMP_SOURCE == SQL_DUMP_SOURCE_EXTRACTED and SQL_DUMP_SCAN_MODE != SQL_DUMP_SCAN_MODE_LINES:
+            with map_sql_dump() as sql_dump_map:
+                filter_sql_lines(iter_sql_dump_sections(sql_dump_map, tables), tables, collector,
+                                 collector.row_filter)
+
+        # Read every line of the SQL dump
+        else:
+            with open_sql_dump() as sql_dump:
+                filter_sql_lines(sql_dump, tables, collector, collector.row_filter)
+
+        progression = collector.progression()
+
+    # Compact file - the entries are lists of the progression columns, without indentation
+    location = os.path.join(RECORDS_FOLDER, PROGRESSION_FILENAME)
+    with open_atomically(location) as f:
+        json.dump({"metadata": get_export_metadata(), "columns": PROGRESSION_COLUMNS, "progression": progression},
+                  f, separators=(",", ":"))
+    logger.info(f"Saved the national record progression of {len(progression)} countries to {location}")
+
+    return progression
+
+
+class ProgressionCollector:
+    """
+    "ProgressionCollector" collects the rows of the competitions and the results tables for the progression of the
+    national records. It is an output of the filter, like "RecordsEngine" - the competitions are kept by ID, while
+    the rows of the results are sent in chunks to the pool, which reduces them to the best results of every round.
+    """
+
+    def __init__(self, executor: Executor, countries: set[str] | None):
+        """
+        Initializer for the "ProgressionCollector" class.
+
+        :param executor: (Executor) The pool of processes, which parses the results and computes the progression.
+        :param countries: (set) The countries, whose progression is computed. All countries if "None".
+        """
+
+        self._executor = executor
+        self._countries = countries
+
+        self._tokenizers: dict[str, RowTokenizer] = {}
+        # Start dates of the competitions by ID, in ISO format, so that they are ordered as strings
+        self._competition_dates: dict[str, str] = {}
+
+        # Rows of the results, which are not sent to the pool yet, and the chunks, which are not reduced yet
+        self._chunk: list = []
+        self._chunk_parsed = False
+        self._pending: deque[Future] = deque()
+        self._rounds: RoundResults = {}
+
+    def drop_tables(self, tables: list[str]) -> None:
+        """
+        Nothing to drop - the rows are kept only in memory, for the lifetime of the collector.
+
+        :param tables: (list) The names of the tables.
+        """
+
+    def create_table(self, table: str, statement: str) -> None:
+        """
+        Prepares the tokenizer of a table from its CREATE TABLE statement.
+
+        :param table: (str) The name of the table.
+        :param statement: (str) The CREATE TABLE statement.
+        """
+
+        self._tokenizers[table] = RowTokenizer(parse_create_table_columns(statement))
+
+    def row_filter(self, table: str, columns: list[str]) -> Callable[[str], bool]:
+        """
+        Returns the filter for the rows of the INSERT statements of a table of the SQL dump.
+        Rows of the results, which do not contain any of the countries, are rejected by a search for their quoted
+        names - the country of every row is checked after it is parsed.
+
+        :param table: (str) The name of the table.
+        :param columns: (list) The names of the columns of the table, from its CREATE TABLE statement.
+        :return: (Callable) Function, which accepts a row and returns "True" if it should be kept.
+        """
+
+        pattern = self.__countries_pattern(table, "'{country}'")
+        if pattern is None:
+            return lambda row: True
+        return lambda row: pattern.search(row) is not None
+
+    def tsv_row_filter(self, table: str, columns: list[str]) -> Callable[[str], list[str] | None]:
+        """
+        Returns the filter for the lines of the TSV file of a table.
+
+        :param table: (str) The name of the table.
+        :param columns: (list) The names of the columns of the table, from the header of the TSV file.
+        :return: (Callable) Function, which accepts a line and returns its values if it should be kept, "None" otherwise.
+        """
+
+        pattern = self.__countries_pattern(table, "{country}")
+
+        def row_filter(line: str) -> list[str] | None:
+            if pattern is not None and pattern.search(line) is None:
+                return None
+            return line.rstrip("\n").split("\t")
+
+        return row_filter
+
+    def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+        """
+        Adds a batch of rows of an INSERT statement - competitions are parsed, results are parsed by the pool.
+
+        :param table: (str) The name of the table.
+        :param insert_statement: (str) The beginning of the INSERT statement.
+        :param values: (list) The batch of rows of the INSERT statement.
+        """
+
+        if table == TABLE_COMPETITIONS:
+            self.insert_rows(table, map(self._tokenizers[table].parse, values))
+        elif table == TABLE_RESULTS:
+            self.__add_results(values, parsed=False)
+
+    def insert_rows(self, table: str, rows: Iterable[tuple]) -> None:
+        """
+        Adds a batch of already parsed rows.
+
+        :param table: (str) The name of the table.
+        :param rows: (Iterable) The batch of rows, with a value for every column.
+        """
+
+        if table == TABLE_COMPETITIONS:
+            competition_index, _, *date_indexes = get_competition_columns(self._tokenizers[table])
+            for row in rows:
+                self._competition_dates[row[competition_index]] = get_competition_date(
+                    [row[index] for index in date_indexes]).isoformat()
+        elif table == TABLE_RESULTS:
+            self.__add_results(list(rows), parsed=True)
+
+    def progression(self) -> dict[str, Any]:
+        """
+        Reduces the remaining chunks and computes the progression of every event in the pool.
+
+        :return: (dict) The progression - {country: {event: {type: [entry]}}}.
+        """
+
+        self.__send_chunk()
+        while self._pending:
+            merge_round_results(self._rounds, self._pending.popleft().result())
+        logger.info(f"Reduced the results to the best results of {len(self._rounds)} rounds.")
+
+        # Partition the rounds by event, with the dates of their competitions only
+        events: dict[str, list[tuple[str, ResultType, str, str, int, list[tuple[str, str]]]]] = {}
+        for (event, country, result_type, competition_id, round_type), (result, holders) in self._rounds.items():
+            events.setdefault(event, []).append((country, result_type, competition_id, round_type, result, holders))
+        competition_dates = [{competition_id: self._competition_dates[competition_id]
+                              for _, _, competition_id, _, _, _ in rounds if competition_id in self._competition_dates}
+                             for rounds in events.values()]
+
+        progression: dict[str, Any] = {}
+        for event, event_progression in zip(events, self._executor.map(compute_event_progression, events.values(),
+                                                                        competition_dates)):
+            for (country, result_type), entries in event_progression.items():
+                progression.setdefault(country, {}).setdefault(event, {})[result_type.name] = entries
+            logger.info(f"Computed the national record progression of event `{event}`.")
+
+        return {country: dict(sorted(country_progression.items()))
+                for country, country_progression in sorted(progression.items())}
+
+    def __add_results(self, rows: list, parsed: bool) -> None:
+        """
+        Adds rows of the results to the current chunk and sends it to the pool, once it is full.
+        The number of chunks in the pool is limited, so that memory does not grow with the size of the table.
+
+        :param rows: (list) The rows - raw rows of the SQL dump, or values of the lines of the TSV file.
+        :param parsed: (bool) "True" if the rows are values, "False" if they are raw rows.
+        """
+
+        self._chunk.extend(rows)
+        self._chunk_parsed = parsed
+        if len(self._chunk) < PROGRESSION_CHUNK_SIZE:
+            return
+
+        self.__send_chunk()
+        while len(self._pending) > 2 * SQL_DUMP_PARALLEL_WORKERS:
+            merge_round_results(self._rounds, self._pending.popleft().result())
+
+    def __send_chunk(self) -> None:
+        """
+        Sends the current chunk of the results to the pool.
+        """
+
+        if self._chunk:
+            self._pending.append(self._executor.submit(reduce_results_chunk, self._tokenizers[TABLE_RESULTS].columns,
+                                                       self._chunk, self._chunk_parsed, self._countries))
+            self._chunk = []
+
+    def __countries_pattern(self, table: str, template: str) -> re.Pattern | None:
+        """
+        Returns the pattern, which finds the rows of the results of the countries.
+
+        :param table: (str) The name of the table.
+        :param template: (str) The template of a searched country, e.g. quoted for the SQL dump.
+        :return: (Pattern) The compiled pattern, "None" if all rows are kept.
+        """
+
+        if table != TABLE_RESULTS or self._countries is None:
+            return None
+        return re.compile("|".join(re.escape(template.format(country=country)) for country in sorted(self._countries)))
+
+
+def reduce_results_chunk(columns: list[str], rows: list, parsed: bool, countries: set[str] | None) -> RoundResults:
+    """
+    Reduces a chunk of the rows of the results to the best results of every round by country.
+    Runs in a worker process.
+
+    :param columns: (list) The names of the columns of the results table.
+    :param rows: (list) The rows - raw rows of the SQL dump, or values of the lines of the TSV file.
+    :param parsed: (bool) "True" if the rows are values, "False" if they are raw rows.
+    :param countries: (set) The countries, whose results are kept. All countries if "None".
+    :return: (dict) The best results of the rounds of the chunk.
+    """
+
+    tokenizer = RowTokenizer(columns)
+    person_index, name_index, country_index, event_index, competition_index, round_index, best_index, average_index = (
+        tokenizer.index(column) for column in ("person_id", "person_name", "person_country_id", "event_id",
+                                               "competition_id", "round_type_id", "best", "average"))
+
+    rounds: RoundResults = {}
+    for row in rows:
+        if not parsed:
+            row = tokenizer.parse(row)
+        country = row[country_index]
+        if countries is not None and country not in countries:
+            continue
+
+        for value, result_type in ((row[best_index], ResultType.SINGLE), (row[average_index], ResultType.AVERAGE)):
+            # The values of the TSV export are not typed
+            result = int(value) if value is not None else 0
+            # No result, DNF or DNS
+            if result <= 0:
+                continue
+            key = (row[event_index], country, result_type, row[competition_index], row[round_index])
+            holder = (row[person_index], row[name_index])
+            current = rounds.get(key)
+            if current is None or result < current[0]:
+                rounds[key] = (result, [holder])
+            elif result == current[0]:
+                current[1].append(holder)
+
+    return rounds
+
+
+def merge_round_results(rounds: RoundResults, other_rounds: RoundResults) -> None:
+    """
+    Merges the best results of rounds into other ones - the better result is kept, equal results share the round.
+
+    :param rounds: (dict) The best results of rounds, which are updated.
+    :param other_rounds: (dict) The best results of rounds, which are merged.
+    """
+
+    for key, (result, holders) in other_rounds.items():
+        current = rounds.get(key)
+        if current is None or result < current[0]:
+            rounds[key] = (result, list(holders))
+        elif result == current[0]:
+            current[1].extend(holders)
+
+
+def compute_event_progression(rounds: list[tuple[str, ResultType, str, str, int, list[tuple[str, str]]]],
+                              competition_dates: dict[str, str]) -> dict[tuple[str, ResultType], list[list[Any]]]:
+    """
+    Computes the progression of the national records of an event with a chronological running minimum per country
+    and type of result. A result, which ties the national record, is a national record as well.
+    Runs in a worker process.
+
+    :param rounds: (list) The best results of the rounds of the event -
+    (country, type of result, competition ID, round type, result, [(WCA ID, name)]).
+    :param competition_dates: (dict) The start dates of the competitions by ID.
+    :return: (dict) The entries of the progression by country and type of result, see "PROGRESSION_COLUMNS".
+    """
+
+    round_order = {round_type: index for index, round_type in enumerate(ROUND_TYPE_ORDER)}
+    # Rounds of competitions without a date cannot be ordered
+    rounds = sorted((r for r in rounds if r[2] in competition_dates),
+                    key=lambda r: (competition_dates[r[2]], r[2], round_order.get(r[3], len(round_order))))
+
+    progressions: dict[tuple[str, ResultType], list[list[Any]]] = {}
+    for country, result_type, competition_id, _, result, holders in rounds:
+        progression = progressions.setdefault((country, result_type), [])
+        if progression and result > progression[-1][2]:
+            continue
+
+        # A holder, who ties their own record, does not hold it again
+        held_by = {entry[0] for entry in progression if entry[2] == result}
+        for person_id, name in holders:
+            if person_id not in held_by:
+                progression.append([person_id, name, result, competition_id, competition_dates[competition_id], None])
+
+    # A record is held until the first better result - equal results are held together
+    for progression in progressions.values():
+        until, result, since = None, None, None
+        for entry in reversed(progression):
+            if entry[2] != result:
+                until, result = since, entry[2]
+            entry[5] = until
+            since = entry[4]
+
+    return progressions
@@ -0,0 +1,194 @@
+# Python dependencies
+from typing import Any, Iterable
+
+# Project dependencies
+from wca_nr_api.classes.leaderboards import Leaderboards
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.record_table import RecordTable
+from wca_nr_api.classes.records import Records
+from wca_nr_api.classes.region import Region
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.constants import *
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns
+
+
+class RecordsEngine:
+    """
+    "RecordsEngine" extracts the national records from the filtered rows of the export, without a database.
+    It is an output of the filter, like "SQLiteLoader" - the persons are kept in a dictionary keyed by WCA ID and
+    the rows of the ranks tables are joined against it as they arrive (hash join), creating the records directly.
+    The joined national records of all countries are kept by columns, in a "RecordTable".
+    """
+
+    def __init__(self, leaderboards: Leaderboards = None):
+        """
+        Initializer for the "RecordsEngine" class.
+
+        :param leaderboards: (Leaderboards) The leaderboards, which get every joined result, if they are computed.
+        """
+
+        self._leaderboards = leaderboards
+        self._tokenizers: dict[str, RowTokenizer] = {}
+        self._columns: dict[str, tuple[int, ...]] = {}
+
+        # Current name, gender and country of the persons by WCA ID - the rows of a person with a "sub_id" other
+        # than 1 hold the earlier names and countries (e.g. after a change of the citizenship)
+        self._persons: dict[str, tuple[str, str, str]] = {}
+        self._persons_loaded = False
+
+        # Rows of the ranks tables, which arrived before all persons were loaded
+        self._pending_ranks: list[tuple[ResultType, tuple[Any, ...]]] = []
+        # Records with the country of the person and the regions, in which they are also records, by columns
+        self._records = RecordTable()
+
+    def drop_tables(self, tables: list[str]) -> None:
+        """
+        Nothing to drop - the rows are kept only in memory, for the lifetime of the engine.
+
+        :param tables: (list) The names of the tables.
+        """
+
+    def create_table(self, table: str, statement: str) -> None:
+        """
+        Prepares the tokenizer and the positions of the joined columns of a table from its CREATE TABLE statement.
+
+        :param table: (str) The name of the table.
+        :param statement: (str) The CREATE TABLE statement.
+        """
+
+        # The tables of the export come one after another - once the next table starts, all persons are loaded
+        if TABLE_PERSONS in self._tokenizers and table != TABLE_PERSONS:
+            self._persons_loaded = True
+
+        tokenizer = RowTokenizer(parse_create_table_columns(statement))
+        self._tokenizers[table] = tokenizer
+
+        if table == TABLE_PERSONS:
+            self._columns[table] = (tokenizer.index("wca_id"), tokenizer.index(COLUMN_SUB_ID),
+                                    tokenizer.index("name"), tokenizer.index("gender"),
+                                    tokenizer.index(COLUMN_COUNTRY_ID))
+        elif table in (TABLE_RANKS_SINGLE, TABLE_RANKS_AVERAGE):
+            self._columns[table] = (tokenizer.index("person_id"), tokenizer.index("event_id"),
+                                    tokenizer.index("best"), tokenizer.index(COLUMN_COUNTRY_RANK),
+                                    tokenizer.index(Region.WORLD.rank_column()),
+                                    tokenizer.index(Region.CONTINENT.rank_column()))
+
+    def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+        """
+        Parses a batch of rows of an INSERT statement and joins them.
+
+        :param table: (str) The name of the table.
+        :param insert_statement: (str) The beginning of the INSERT statement.
+        :param values: (list) The batch of rows of the INSERT statement.
+        """
+
+        if table in self._columns:
+            self.insert_rows(table, map(self._tokenizers[table].parse, values))
+
+    def insert_rows(self, table: str, rows: Iterable[tuple]) -> None:
+        """
+        Adds a batch of already parsed rows - the current rows of the persons are added to the dictionary,
+        ranks are joined with them.
+
+        :param table: (str) The name of the table.
+        :param rows: (Iterable) The batch of rows, with a value for every column.
+        """
+
+        if table == TABLE_PERSONS:
+            wca_id_index, sub_id_index, name_index, gender_index, country_index = self._columns[table]
+            for row in rows:
+                # The values of the TSV export are not typed
+                if str(row[sub_id_index]) == "1":
+                    self._persons[row[wca_id_index]] = (row[name_index], row[gender_index], row[country_index])
+
+        elif table in (TABLE_RANKS_SINGLE, TABLE_RANKS_AVERAGE):
+            result_type = self.__result_type(table)
+            columns = self._columns[table]
+            for row in rows:
+                rank = tuple(row[index] for index in columns)
+                if self._persons_loaded:
+                    self.__join(result_type, rank)
+                else:
+                    self._pending_ranks.append((result_type, rank))
+
+    def to_records(self, country: str = None, region: Region = None) -> Records:
+        """
+        Joins the remaining ranks and returns the extracted national records.
+
+        :param country: (str) The country, whose records are returned. All countries if not passed.
+        :param region: (Region) The region, whose records (held by the country) are returned,
+        instead of the national records.
+        :return: (Records) The records - for every event the single records, then the average records.
+        """
+
+        self.__join_pending()
+
+        rows = {
+            result_type: self._records.filter(result_type=result_type, country=country, region=region)
+            for result_type in (ResultType.SINGLE, ResultType.AVERAGE)
+        }
+        logger.info(f"Joined {len(rows[ResultType.SINGLE])} `single` and {len(rows[ResultType.AVERAGE])} "
+                    f"`average` {region.name.lower() if region is not None else 'national'} records"
+                    f"{f' of {country}' if country is not None else ''} in memory.")
+        return Records.from_records(self._records.records(rows[ResultType.SINGLE] + rows[ResultType.AVERAGE]))
+
+    def countries(self) -> list[str]:
+        """
+        Joins the remaining ranks and returns the countries, which have national records.
+
+        :return: (list) The IDs of the countries.
+        """
+
+        self.__join_pending()
+        return self._records.countries()
+
+    def __join_pending(self) -> None:
+        """
+        Joins the ranks, which arrived before all persons were loaded.
+        """
+
+        for result_type, rank in self._pending_ranks:
+            self.__join(result_type, rank)
+        self._pending_ranks = []
+
+    def __join(self, result_type: ResultType, rank: tuple[Any, ...]) -> None:
+        """
+        Creates a record of a rank with the current row of its person, like an INNER JOIN.
+
+        :param result_type: (ResultType) The type of result of the rank.
+        :param rank: (tuple) The WCA ID of the person, the event, the result and the country, world and continent rank.
+        """
+
+        person_id, event_id, best, country_rank, world_rank, continent_rank = rank
+        person = self._persons.get(person_id)
+        if person is None:
+            return
+
+        # The values of the TSV export are not typed
+        national_record = str(country_rank) == "1"
+        # A national record, which is also a world or continental record
+        regions = set()
+        if str(world_rank) == "1":
+            regions.add(Region.WORLD)
+        if str(continent_rank) == "1":
+            regions.add(Region.CONTINENT)
+
+        name, gender, country = person
+        record = Record(person_id, name, gender, event_id, int(best), result_type)
+        # Records of removed events and of persons without a gender are not valid, like in "Records"
+        if national_record and record.validate():
+            self._records.append(country, record, regions)
+        if self._leaderboards is not None:
+            self._leaderboards.add(country, record)
+
+    @staticmethod
+    def __result_type(table: str) -> ResultType:
+        """
+        Returns the type of result of a ranks table.
+
+        :param table: (str) The name of the ranks table.
+        :return: (ResultType) The type of result.
+        """
+
+        return ResultType.SINGLE if table == TABLE_RANKS_SINGLE else ResultType.AVERAGE
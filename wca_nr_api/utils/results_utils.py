@@ -0,0 +1,260 @@
+# Python dependencies
+import itertools
+import re
+from datetime import date
+from typing import Any, Callable, Iterable
+
+# Project dependencies
+from wca_nr_api.classes.competition import Competition
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.constants import *
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.file_utils import map_sql_dump, open_sql_dump
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns
+from wca_nr_api.utils.sql_utils import filter_sql_lines, iter_sql_dump_sections
+from wca_nr_api.utils.tsv_utils import ingest_tsv_export
+
+
+def find_record_competitions(records: list[Record]) -> dict[Record, Competition]:
+    """
+    Finds the competitions, at which the given records were set, with a targeted scan of the results table.
+    Only the rows of the results with the person, event and value of a record are kept, and only the competitions
+    of these rows, so the memory depends on the number of the records, not on the size of the results table.
+
+    When the sections of the SQL dump can be searched (or the TSV export is used), the results are scanned before
+    the competitions, so that only the competitions of the records are kept. Otherwise the SQL dump is read in order
+    and the competitions, which come before the results, are kept until the results are scanned.
+
+    :param records: (list) The records, usually the new ones.
+    :return: (dict) Dictionary of {record: competition}, for the records, whose result was found.
+    """
+
+    if not records:
+        return {}
+
+    logger.info(f"Starting finding the competitions of {len(records)} records.")
+    matcher = RecordResultsMatcher(records)
+    tables = [TABLE_RESULTS, TABLE_COMPETITIONS]
+
+    # Only the TSV files of the two tables are decompressed, in the given order
+    if EXPORT_FORMAT == EXPORT_FORMAT_TSV:
+        ingest_tsv_export(tables, matcher, matcher.tsv_row_filter)
+
+    # Search the memory-mapped SQL dump for the sections of the tables, results first
+    elif SQL_DUMP_SOURCE == SQL_DUMP_SOURCE_EXTRACTED and SQL_DUMP_SCAN_MODE != SQL_DUMP_SCAN_MODE_LINES:
+        with map_sql_dump() as sql_dump_map:
+            lines = itertools.chain.from_iterable(iter_sql_dump_sections(sql_dump_map, [table]) for table in tables)
+            filter_sql_lines(lines, tables, matcher, matcher.row_filter)
+
+    # Read every line of the SQL dump
+    else:
+        with open_sql_dump() as sql_dump:
+            filter_sql_lines(sql_dump, tables, matcher, matcher.row_filter)
+
+    competitions = matcher.competitions()
+    logger.info(f"Found the competitions of {len(competitions)} of {len(records)} records.")
+    return competitions
+
+
+def find_earliest_competitions(record_competition_ids: dict[Record, set[str]],
+                               competitions: dict[str, Competition]) -> dict[Record, Competition]:
+    """
+    Returns the competitions of the matched records. If a person got the same result more than once,
+    the record was set at the earliest competition.
+
+    :param record_competition_ids: (dict) The IDs of the competitions of the matching results by record.
+    :param competitions: (dict) The competitions by ID.
+    :return: (dict) Dictionary of {record: competition}.
+    """
+
+    record_competitions = {}
+    for record, competition_ids in record_competition_ids.items():
+        matching_competitions = [competitions[c] for c in competition_ids if c in competitions]
+        if matching_competitions:
+            record_competitions[record] = min(matching_competitions, key=lambda competition: competition.start_date)
+    return record_competitions
+
+
+def get_competition_columns(tokenizer: RowTokenizer) -> tuple[int, ...]:
+    """
+    Returns the positions of the columns of the competitions table, which hold the ID, the name and the start date.
+    Newer exports have the start date of the competition, older ones only its year, month and day.
+
+    :param tokenizer: (RowTokenizer) The tokenizer of the competitions table.
+    :return: (tuple) The positions of the ID, the name and the columns of the start date.
+    """
+
+    if "start_date" in tokenizer.columns:
+        date_columns = (tokenizer.index("start_date"), )
+    else:
+        date_columns = (tokenizer.index("year"), tokenizer.index("month"), tokenizer.index("day"))
+    return (tokenizer.index("id"), tokenizer.index("name")) + date_columns
+
+
+def get_competition_date(values: list[Any]) -> date:
+    """
+    Returns the start date of a competition.
+
+    :param values: (list) Either the start date, or the year, month and day of the competition.
+    :return: (date) The start date.
+    """
+
+    if len(values) == 1:
+        return date.fromisoformat(str(values[0]))
+    return date(*map(int, values))
+
+
+class RecordResultsMatcher:
+    """
+    "RecordResultsMatcher" matches the rows of the results table against the given records.
+    It is an output of the filter, like "RecordsEngine" - the rows of the persons of the records are passed by a
+    substring search, then the rows with the event and the value of a record are kept by a lookup in a dictionary.
+    """
+
+    def __init__(self, records: list[Record]):
+        """
+        Initializer for the "RecordResultsMatcher" class.
+
+        :param records: (list) The records, whose competitions are found.
+        """
+
+        # Records by WCA ID, event, value and type of result - the values of the TSV export are not typed
+        self._records: dict[tuple[str, str, str, ResultType], list[Record]] = {}
+        for record in records:
+            key = (record.person_id, record.event.database_value(), str(record.result), record.result_type)
+            self._records.setdefault(key, []).append(record)
+        self._person_ids = sorted({record.person_id for record in records})
+
+        self._tokenizers: dict[str, RowTokenizer] = {}
+        self._columns: dict[str, tuple[int, ...]] = {}
+
+        # IDs of the competitions of the matching results by record, and the competitions by ID
+        self._record_competition_ids: dict[Record, set[str]] = {}
+        self._competitions: dict[str, Competition] = {}
+
+    def drop_tables(self, tables: list[str]) -> None:
+        """
+        Nothing to drop - the rows are kept only in memory, for the lifetime of the matcher.
+
+        :param tables: (list) The names of the tables.
+        """
+
+    def create_table(self, table: str, statement: str) -> None:
+        """
+        Prepares the tokenizer and the positions of the needed columns of a table from its CREATE TABLE statement.
+
+        :param table: (str) The name of the table.
+        :param statement: (str) The CREATE TABLE statement.
+        """
+
+        tokenizer = RowTokenizer(parse_create_table_columns(statement))
+        self._tokenizers[table] = tokenizer
+
+        if table == TABLE_RESULTS:
+            self._columns[table] = (tokenizer.index("person_id"), tokenizer.index("event_id"),
+                                    tokenizer.index("best"), tokenizer.index("average"),
+                                    tokenizer.index("competition_id"))
+        elif table == TABLE_COMPETITIONS:
+            self._columns[table] = get_competition_columns(tokenizer)
+
+    def row_filter(self, table: str, columns: list[str]) -> Callable[[str], bool]:
+        """
+        Returns the filter for the rows of the INSERT statements of a table of the SQL dump.
+
+        :param table: (str) The name of the table.
+        :param columns: (list) The names of the columns of the table, from its CREATE TABLE statement.
+        :return: (Callable) Function, which accepts a row and returns "True" if it should be kept.
+        """
+
+        pattern = self.__values_pattern(table, "'{value}'")
+        if pattern is None:
+            return lambda row: True
+        return lambda row: pattern.search(row) is not None
+
+    def tsv_row_filter(self, table: str, columns: list[str]) -> Callable[[str], list[str] | None]:
+        """
+        Returns the filter for the lines of the TSV file of a table.
+
+        :param table: (str) The name of the table.
+        :param columns: (list) The names of the columns of the table, from the header of the TSV file.
+        :return: (Callable) Function, which accepts a line and returns its values if it should be kept, "None" otherwise.
+        """
+
+        pattern = self.__values_pattern(table, "{value}")
+
+        def row_filter(line: str) -> list[str] | None:
+            if pattern is not None and pattern.search(line) is None:
+                return None
+            return line.rstrip("\n").split("\t")
+
+        return row_filter
+
+    def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+        """
+        Parses a batch of rows of an INSERT statement and matches them.
+
+        :param table: (str) The name of the table.
+        :param insert_statement: (str) The beginning of the INSERT statement.
+        :param values: (list) The batch of rows of the INSERT statement.
+        """
+
+        if table in self._columns:
+            self.insert_rows(table, map(self._tokenizers[table].parse, values))
+
+    def insert_rows(self, table: str, rows: Iterable[tuple]) -> None:
+        """
+        Adds a batch of already parsed rows - results are matched with the records, competitions are kept.
+
+        :param table: (str) The name of the table.
+        :param rows: (Iterable) The batch of rows, with a value for every column.
+        """
+
+        if table == TABLE_RESULTS:
+            person_index, event_index, best_index, average_index, competition_index = self._columns[table]
+            for row in rows:
+                for value, result_type in ((row[best_index], ResultType.SINGLE),
+                                           (row[average_index], ResultType.AVERAGE)):
+                    key = (row[person_index], row[event_index], str(value), result_type)
+                    for record in self._records.get(key, []):
+                        self._record_competition_ids.setdefault(record, set()).add(row[competition_index])
+
+        elif table == TABLE_COMPETITIONS:
+            competition_index, name_index, *date_indexes = self._columns[table]
+            for row in rows:
+                self._competitions[row[competition_index]] = Competition(
+                    row[competition_index], row[name_index], get_competition_date([row[i] for i in date_indexes]))
+
+    def competitions(self) -> dict[Record, Competition]:
+        """
+        Returns the competitions of the matched records. If a person got the same result more than once,
+        the record was set at the earliest competition.
+
+        :return: (dict) Dictionary of {record: competition}.
+        """
+
+        return find_earliest_competitions(self._record_competition_ids, self._competitions)
+
+    def __values_pattern(self, table: str, template: str) -> re.Pattern | None:
+        """
+        Returns the pattern, which finds the rows of a table, which can be matched - the results of the persons of
+        the records, and the competitions of these results, once the results are matched.
+
+        :param table: (str) The name of the table.
+        :param template: (str) The template of a searched value, e.g. quoted for the SQL dump.
+        :return: (Pattern) The compiled pattern, "None" if all rows are kept.
+        """
+
+        if table == TABLE_RESULTS:
+            values = self._person_ids
+        # The results come before the competitions only in the searched sections and in the TSV export
+        elif table == TABLE_COMPETITIONS and TABLE_RESULTS in self._tokenizers:
+            values = sorted(set().union(*self._record_competition_ids.values()))
+        else:
+            return None
+
+        # A pattern, which never matches, if there is nothing to search for
+        if not values:
+            return re.compile(r"(?!)")
+        return re.compile("|".join(re.escape(template.format(value=value)) for value in values))
+
@@ -0,0 +1,148 @@
+# Python dependencies
+import json
+import sqlite3
+from contextlib import closing
+from typing import Any
+
+# Project dependencies
+from wca_nr_api.classes.record import Record
+from wca_nr_api.classes.result_type import ResultType
+from wca_nr_api.config.logger import logger
+
+# Kind of the sections of the national records - the sections of the regional records are kinds by the region
+SECTION_RECORDS = "records"
+
+
+class StorageSnapshot:
+    """
+    "StorageSnapshot" stores the metadata and the records of a country in a SQLite file, with a section per kind
+    of records (national or regional) and event. A section holds the records of the event as compact JSON rows.
+
+    Only the sections, which changed, are rewritten - in a single transaction, so the snapshot is either updated
+    or left as it was. The records of a single event can be read without reading the other sections.
+    """
+
+    def __init__(self, location: str):
+        """
+        Initializer for the "StorageSnapshot" class.
+
+        :param location: (str) The path to the SQLite file of the snapshot.
+        """
+
+        self._location = location
+
+    @property
+    def location(self) -> str:
+        return self._location
+
+    def read_metadata(self) -> dict[str, Any] | None:
+        """
+        Reads the metadata of the export, from which the records were extracted.
+
+        :return: (dict) The metadata, "None" if the snapshot has none.
+        """
+
+        with closing(self.__connect()) as connection:
+            row = connection.execute("SELECT data FROM metadata").fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def read_sections(self) -> dict[str, dict[str, list[Record]]]:
+        """
+        Reads the records of all sections.
+
+        :return: (dict) Dictionary of {kind: {event: records}}.
+        """
+
+        sections = {}
+        with closing(self.__connect()) as connection:
+            for kind, event, data in connection.execute("SELECT kind, event, data FROM sections ORDER BY position"):
+                sections.setdefault(kind, {})[event] = self.__decode(event, data)
+        return sections
+
+    def read_event(self, event: str, kind: str = SECTION_RECORDS) -> list[Record]:
+        """
+        Reads the records of a single event, without reading the other sections.
+
+        :param event: (str) The event, e.g. "333".
+        :param kind: (str) The kind of the records - the national records, or the name of a region.
+        :return: (list) The records of the event, empty if the section is not present.
+        """
+
+        with closing(self.__connect()) as connection:
+            row = connection.execute("SELECT data FROM sections WHERE kind = ? AND event = ?",
+                                     (kind, event)).fetchone()
+        return self.__decode(event, row[0]) if row is not None else []
+
+    def write(self, metadata: dict[str, Any], sections: dict[str, dict[str, list[Record]]]) -> None:
+        """
+        Writes the metadata and rewrites the sections, whose records changed. Sections, which are not passed,
+        are deleted.
+
+        :param metadata: (dict) The metadata of the export.
+        :param sections: (dict) Dictionary of {kind: {event: records}}.
+        """
+
+        encoded_sections = {
+            (kind, event): self.__encode(records)
+            for kind, kind_sections in sections.items() for event, records in kind_sections.items()
+        }
+
+        with closing(self.__connect()) as connection, connection:
+            rows = connection.execute("SELECT kind, event, position, data FROM sections")
+            stored_sections = {(kind, event): (position, data) for kind, event, position, data in rows}
+
+            changed_sections = [
+                (kind, event, position, data) for position, ((kind, event), data) in enumerate(encoded_sections.items())
+                if stored_sections.get((kind, event)) != (position, data)
+            ]
+            connection.executemany("INSERT OR REPLACE INTO sections (kind, event, position, data) VALUES (?, ?, ?, ?)",
+                                   changed_sections)
+            connection.executemany("DELETE FROM sections WHERE kind = ? AND event = ?",
+                                   [key for key in stored_sections if key not in encoded_sections])
+
+            connection.execute("DELETE FROM metadata")
+            connection.execute("INSERT INTO metadata (data) VALUES (?)", (json.dumps(metadata),))
+
+        logger.info(f"Rewrote {len(changed_sections)} of {len(encoded_sections)} sections of {self.location}")
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Opens the SQLite file of the snapshot and creates its tables, if they do not exist.
+
+        :return: (Connection) The connection to the snapshot.
+        """
+
+        connection = sqlite3.connect(self.location)
+        connection.execute("CREATE TABLE IF NOT EXISTS metadata (data TEXT NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS sections (kind TEXT NOT NULL, event TEXT NOT NULL, "
+                           "position INTEGER NOT NULL, data BLOB NOT NULL, PRIMARY KEY (kind, event))")
+        return connection
+
+    @staticmethod
+    def __encode(records: list[Record]) -> bytes:
+        """
+        Encodes the records of a section as compact JSON rows - the event is the key of the section.
+
+        :param records: (list) The records of the section.
+        :return: (bytes) The encoded records.
+        """
+
+        return json.dumps([
+            [record.person_id, record.name, record.gender.name, record.result, record.result_type.name]
+            for record in records
+        ], separators=(",", ":"), ensure_ascii=False).encode()
+
+    @staticmethod
+    def __decode(event: str, data: bytes) -> list[Record]:
+        """
+        Decodes the records of a section.
+
+        :param event: (str) The event of the section.
+        :param data: (bytes) The encoded records.
+        :return: (list) The records of the section.
+        """
+
+        return [
+            Record(person_id, name, gender, event, result, ResultType.from_database_value(result_type))
+            for person_id, name, gender, result, result_type in json.loads(data)
+        ]
@@ -0,0 +1,226 @@
+# Python dependencies
+import re
+from typing import Any, Callable, Iterator
+
+# A single value of a row - quoted string (with backslash escapes), NULL or unquoted number
+VALUE_PATTERN = r"'[^'\\]*(?:\\.[^'\\]*)*'|[^,()']*"
+# Column definition in a CREATE TABLE statement - the column name in backticks at the start of a line
+COLUMN_PATTERN = re.compile(r"(?:^|[(,])\s*`([^`]+)`\s+\w", re.MULTILINE)
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+
+class RowTokenizer:
+    """
+    "RowTokenizer" splits the rows of the MySQL INSERT statements of a table into typed values.
+    A single compiled regular expression matches a whole row with one group per column, so quoting, escapes and
+    NULL are handled without a Python loop over the characters of the row.
+    """
+
+    def __init__(self, columns: list[str]):
+        """
+        Initializer for the "RowTokenizer" class.
+
+        :param columns: (list) The names of the columns of the table, in the order of the CREATE TABLE statement.
+        """
+
+        self._columns = columns
+        self._indexes = {column: index for index, column in enumerate(columns)}
+
+        values = ",".join([f"({VALUE_PATTERN})"] * len(columns))
+        # A row on its own line, with the trailing comma or semicolon
+        self._row_pattern = re.compile(r"\s*\(" + values + r"\)\s*[,;]?\s*$", re.DOTALL)
+        # Rows anywhere in an INSERT statement
+        self._rows_pattern = re.compile(r"\(" + values + r"\)", re.DOTALL)
+
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
+
+    def index(self, column: str) -> int:
+        """
+        Returns the position of a column in the rows.
+
+        :param column: (str) The name of the column.
+        :return: (int) The position of the column.
+        """
+
+        try:
+            return self._indexes[column]
+        except KeyError:
+            raise KeyError(f"Column `{column}` not found in columns {self._columns}") from None
+
+    def tokens(self, row: str) -> tuple[str, ...]:
+        """
+        Splits a row into its raw values - quoted strings keep their quotes and escapes.
+
+        :param row: (str) The row, e.g. "('2012PERS01',1,'O\\'Neil',NULL),".
+        :return: (tuple) The raw values of the row.
+        """
+
+        match = self._row_pattern.match(row)
+        if match is None:
+            raise ValueError(f"Row does not match the {len(self._columns)} columns {self._columns}: {row!r}")
+        return match.groups()
+
+    def parse(self, row: str) -> tuple[Any, ...]:
+        """
+        Splits a row into its typed values.
+
+        :param row: (str) The row, e.g. "('2012PERS01',1,'O\\'Neil',NULL),".
+        :return: (tuple) The values of the row - strings, integers, floats or "None" for NULL.
+        """
+
+        return tuple(map(convert_token, self.tokens(row)))
+
+    def iter_rows(self, statement: str) -> Iterator[tuple[Any, ...]]:
+        """
+        Yields the typed values of all rows of an INSERT statement.
+
+        :param statement: (str) The INSERT statement, or only the part after "VALUES".
+        :return: (Iterator) The values of every row.
+        """
+
+        values_position = statement.find(" VALUES")
+        position = values_position + len(" VALUES") if values_position != -1 else 0
+
+        for match in self._rows_pattern.finditer(statement, position):
+            yield tuple(map(convert_token, match.groups()))
+
+    def filter(self, predicates: dict[str, Any]) -> Callable[[str], bool]:
+        """
+        Creates a filter for the rows from predicates on the values of single columns.
+        A predicate is either a value, which the column must be equal to, or a function of the value of the column.
+
+        Values are compiled into the regular expression of the row and into a substring check, so that most rows
+        are rejected by a plain substring search, without running the regular expression at all.
+        Only the values of the columns with a function predicate are converted. A function predicate of the last
+        column is also checked before the regular expression, as its value is simply the end of the row.
+
+        :param predicates: (dict) Dictionary of {column_name: value or predicate},
+        e.g. {"country_id": "Bulgaria", "country_rank": 1}.
+        :return: (Callable) Function, which accepts a row and returns "True" if all predicates hold.
+        """
+
+        for column in predicates:
+            self.index(column)
+
+        parts, needles, functions = [], [], []
+        for index, column in enumerate(self._columns):
+            predicate = predicates.get(column)
+
+            # No predicate - skip the value
+            if column not in predicates:
+                parts.append(f"(?:{VALUE_PATTERN})")
+
+            # Function predicate - capture the value
+            elif callable(predicate):
+                parts.append(f"({VALUE_PATTERN})")
+                functions.append((len(functions) + 1, predicate))
+
+            # Value predicate - match the value literally
+            else:
+                literal = to_sql_literal(predicate)
+                parts.append(re.escape(literal))
+                needles.append(literal_check(literal))
+
+        row_pattern = re.compile(r"\s*\(" + ",".join(parts) + r"\)\s*[,;]?\s*$", re.DOTALL)
+        last_predicate = predicates.get(self._columns[-1])
+        if not callable(last_predicate):
+            last_predicate = None
+
+        def row_filter(row: str) -> bool:
+            # Cheap rejection - every value predicate needs its literal in the row
+            for contains_literal in needles:
+                if not contains_literal(row):
+                    return False
+
+            # Cheap rejection - the unquoted value of the last column is between the last comma and parenthesis
+            if last_predicate is not None:
+                end = row.rfind(")")
+                last_value = row[row.rfind(",", 0, end) + 1:end]
+                if last_value and "'" not in last_value and not last_predicate(convert_token(last_value)):
+                    return False
+
+            match = row_pattern.match(row)
+            if match is None:
+                return False
+            return all(predicate(convert_token(match.group(group))) for group, predicate in functions)
+
+        return row_filter
+
+
+def parse_create_table_columns(statement: str) -> list[str]:
+    """
+    Extracts the names of the columns from a CREATE TABLE statement. Index and key definitions are skipped.
+
+    :param statement: (str) The CREATE TABLE statement.
+    :return: (list) The names of the columns, in the order of the statement.
+    """
+
+    # Skip the table name
+    body = statement[statement.index("(") + 1:]
+    return COLUMN_PATTERN.findall(body)
+
+
+def literal_check(literal: str) -> Callable[[str], bool]:
+    """
+    Creates a substring check, which tells if a literal can be one of the values of a row.
+
+    :param literal: (str) The literal, as in the INSERT statement.
+    :return: (Callable) Function, which accepts a row and returns "False" if the literal is surely not in it.
+    """
+
+    # Quoted strings are distinctive on their own
+    if literal[:1] == "'":
+        return lambda row: literal in row
+
+    # Numbers need their separators, so that "1" does not match "12"
+    first, middle, last = f"({literal},", f",{literal},", f",{literal})"
+    return lambda row: middle in row or last in row or first in row
+
+
+def to_sql_literal(value: Any) -> str:
+    """
+    Converts a value to its representation in a MySQL INSERT statement.
+
+    :param value: (Any) The value - string, integer, float or "None".
+    :return: (str) The quoted and escaped string, NULL or the number.
+    """
+
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return str(value)
+
+
+def convert_token(token: str) -> Any:
+    """
+    Converts a raw value of a row to its type.
+
+    :param token: (str) The raw value - quoted string, NULL or unquoted number.
+    :return: (Any) The string without quotes and escapes, "None" for NULL, or the number.
+    """
+
+    if token[:1] == "'":
+        return unescape_value(token[1:-1])
+    if token == "NULL":
+        return None
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def unescape_value(value: str) -> str:
+    """
+    Unescapes a quoted MySQL string value.
+
+    :param value: (str) The value between the quotes.
+    :return: (str) The unescaped value.
+    """
+
+    if "\\" not in value:
+        return value
+    return ESCAPE_PATTERN.sub(lambda match: ESCAPES.get(match.group(1), match.group(1)), value)
@@ -1,103 +1,528 @@
 # Python dependencies
 import os.path
-from typing import Any
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from mmap import mmap
+from typing import Any, Callable, Iterable, Iterator, TextIO
 
 # Project dependencies
 from wca_nr_api.config.constants import *
+from wca_nr_api.config.environ import get_tracked_countries
 from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.database import DB, SQLiteLoader
+from wca_nr_api.utils.file_utils import map_sql_dump, open_sql_dump
+from wca_nr_api.utils.fingerprint import FilteredRowsFingerprint
+from wca_nr_api.utils.sql_tokenizer import RowTokenizer, parse_create_table_columns
 
 
-def filter_sql_dump(table_filters: dict[str, Any]) -> None:
+# Sections of the SQL dump, in which the filter can be
+SECTION_NONE = 0
+SECTION_CREATE_TABLE = 1
+SECTION_INSERT = 2
+
+# Prefixes of the statements, which start or end a section, followed by the name of the table
+CREATE_TABLE_PREFIX = "CREATE TABLE `"
+INSERT_PREFIX = "INSERT INTO `"
+ALTER_TABLE_PREFIX = "/*!40000 ALTER TABLE `"
+ENABLE_KEYS_SUFFIX = "` ENABLE KEYS"
+
+
+def filter_sql_dump(table_filters: dict[str, Any], sql_dump: TextIO = None, output: Any = None,
+                    fingerprint: FilteredRowsFingerprint = None) -> None:
     """
     Extracts:
       - The CREATE TABLE statements for the given tables.
       - All INSERT statements for the given tables.
       - Applies different filters per table.
 
+    Depending on the configured scan mode, either every line of the dump is passed through the filter, or the
+    memory-mapped dump is searched for the sections of the given tables and only their lines are passed
+    (optionally with the rows pre-filtered by a pool of processes).
+
     :param table_filters: (dict) Dictionary of {table_name: filter_value}.
+    :param sql_dump: (TextIO) Already opened SQL dump to filter. If not passed, the SQL dump of the export is opened.
+    :param output: (Any) The output of the filter, e.g. "RecordsEngine". If not passed, the configured one is opened.
+    :param fingerprint: (FilteredRowsFingerprint) The fingerprint, which is computed from the filtered rows.
+    """
+
+    logger.info(f"Starting filtering SQL dump. Input - {EXPORTS_SQL_FILENAME} ({SQL_DUMP_SOURCE}, "
+                f"{SQL_DUMP_SCAN_MODE}), output - {DATABASE_LOADER_MODE}")
+
+    with open_filtered_sql_dump_output(output) as output:
+        # Pass the filtered rows through the fingerprint to the output
+        if fingerprint is not None:
+            output = fingerprint.wrap(output)
+
+        # DROP tables if they exist
+        output.drop_tables(list(table_filters))
+
+        # Already opened SQL dump
+        if sql_dump is not None:
+            filter_sql_lines(sql_dump, table_filters, output)
+
+        # Search the memory-mapped SQL dump for the sections of the tables
+        elif SQL_DUMP_SCAN_MODE == SQL_DUMP_SCAN_MODE_MMAP:
+            with map_sql_dump() as sql_dump_map:
+                filter_sql_lines(iter_sql_dump_sections(sql_dump_map, table_filters), table_filters, output)
+
+        # Search the memory-mapped SQL dump for the sections of the tables and filter their rows in parallel -
+        # the rows, which the workers filtered with the configured predicates, are not filtered again
+        elif SQL_DUMP_SCAN_MODE == SQL_DUMP_SCAN_MODE_PARALLEL:
+            with map_sql_dump() as sql_dump_map, \
+                    ProcessPoolExecutor(max_workers=SQL_DUMP_PARALLEL_WORKERS) as executor:
+                filter_sql_lines(iter_sql_dump_sections_parallel(sql_dump_map, table_filters, executor),
+                                 table_filters, output, get_prefiltered_row_filter)
+
+        # Read every line of the SQL dump
+        else:
+            with open_sql_dump() as infile:
+                filter_sql_lines(infile, table_filters, output)
+
+    logger.info(f"Finished filtering SQL dump. Output - {DATABASE_LOADER_MODE}")
+
+
+@contextmanager
+def open_filtered_sql_dump_output(output: Any = None) -> Iterator[Any]:
+    """
+    Opens the output of the filter, based on the configured loader - either the filtered SQL script, which is later
+    executed into the local database, or the local database itself.
+
+    :param output: (Any) Already opened output, which is used as it is.
+    :return: (SQLScriptWriter | SQLiteLoader | Any) The output of the filter.
     """
 
-    in_create_table, in_insert, insert_statement = None, None, None
-    insert_values = []
+    # Already opened output
+    if output is not None:
+        yield output
+
+    # Load the filtered rows directly into the local database
+    elif DATABASE_LOADER_MODE == DATABASE_LOADER_MODE_DIRECT:
+        with DB() as database:
+            yield SQLiteLoader(database)
+
+    # Write the filtered SQL script
+    else:
+        filtered_sql_dump_filename = os.path.join(EXPORTS_FOLDER, FILTERED_EXPORTS_SQL_FILENAME)
+        with open(filtered_sql_dump_filename, "w", encoding="utf-8") as outfile:
+            yield SQLScriptWriter(outfile)
+
+
+class SQLScriptWriter:
+    """
+    Writes the filtered statements of the SQL dump as an SQL script.
+    """
+
+    def __init__(self, outfile: TextIO):
+        """
+        Initializer for the "SQLScriptWriter" class.
+
+        :param outfile: (TextIO) The output file.
+        """
+
+        self._outfile = outfile
+
+    def drop_tables(self, tables: list[str]) -> None:
+        """
+        Writes DROP statements for the tables.
+
+        :param tables: (list) The names of the tables.
+        """
+
+        for table in tables:
+            self._outfile.write(f"DROP TABLE IF EXISTS `{table}`;")
+
+    def create_table(self, table: str, statement: str) -> None:
+        """
+        Writes a CREATE TABLE statement.
+
+        :param table: (str) The name of the table.
+        :param statement: (str) The CREATE TABLE statement.
+        """
+
+        self._outfile.write(statement)
+
+    def insert(self, table: str, insert_statement: str, values: list[str]) -> None:
+        """
+        Writes an INSERT statement with a batch of rows.
+
+        :param table: (str) The name of the table.
+        :param insert_statement: (str) The beginning of the INSERT statement.
+        :param values: (list) The batch of rows of the INSERT statement.
+        """
+
+        # Join INSERT statement with all values for insertion
+        self._outfile.write(insert_statement + " " + ", ".join(values) + ";\n")
 
-    sql_dump_filename = os.path.join(EXPORTS_FOLDER, EXPORTS_SQL_FILENAME)
-    filtered_sql_dump_filename = os.path.join(EXPORTS_FOLDER, FILTERED_EXPORTS_SQL_FILENAME)
+
+def filter_sql_lines(lines: Iterable[str], table_filters: dict[str, Any], output: "SQLScriptWriter | SQLiteLoader",
+                     row_filter_factory: Callable[[str, list[str]], Callable[[str], bool]] = None) -> None:
+    """
+    Filters the lines of the SQL dump and passes the CREATE TABLE and the filtered INSERT statements of the given
+    tables to the output.
+
+    The lines are processed with a state machine that keeps the current section.
+    Outside the sections of the given tables only the first character of a line is inspected and the table of
+    a statement is looked up by its name, so the cost per line does not depend on the number of tables.
+
+    :param lines: (Iterable) The lines of the SQL dump.
+    :param table_filters: (dict) Dictionary of {table_name: filter_value}.
+    :param output: (SQLScriptWriter | SQLiteLoader) The output of the filter.
+    :param row_filter_factory: (Callable) Function, which creates the row filter of a table from its columns.
+    The filter of the configured predicates ("get_row_filter") if not passed.
+    """
+
+    row_filter_factory = get_row_filter if row_filter_factory is None else row_filter_factory
+
+    section, table, insert_statement = SECTION_NONE, None, None
+    create_statement, insert_values = [], []
 
     # Flags for all the tables in the filter
     sql_tables_flags = create_flags_dict(table_filters)
+    # Row filters for all the tables in the filter, created from the columns of their CREATE TABLE statements
+    row_filters = {}
 
-    logger.info(f"Starting filtering SQL dump. Input - {sql_dump_filename}, output - {filtered_sql_dump_filename}")
+    for line in lines:
+        # Inside a multi-line INSERT statement - every line is a row
+        if section == SECTION_INSERT:
+            stripped_line = line.strip()
+            if row_filter(stripped_line):
+                insert_values.append(stripped_line.rstrip(',;'))
 
-    with open(sql_dump_filename, "r", encoding="utf-8", errors="ignore") as infile, \
-            open(filtered_sql_dump_filename, "w", encoding="utf-8") as outfile:
+                # Pass a full batch of values for insertion, so that memory does not grow with the matching rows
+                if len(insert_values) >= FILTERED_INSERT_BATCH_SIZE:
+                    output.insert(table, insert_statement, insert_values)
+                    insert_values = []
 
-        # DROP tables if they exist
-        for table in table_filters:
-            outfile.write(f"DROP TABLE IF EXISTS `{table}`;")
+            # End of multi-line INSERT statement
+            if stripped_line.endswith(";"):
+                # Pass the INSERT statement with the remaining values for insertion
+                if len(insert_values) > 0:
+                    output.insert(table, insert_statement, insert_values)
+                # Reset tracking
+                section, table, insert_statement = SECTION_NONE, None, None
+                insert_values = []
 
-        for line in infile:
+        # Inside a CREATE TABLE statement - every line is a column, until the closing parenthesis
+        elif section == SECTION_CREATE_TABLE:
             stripped_line = line.strip()
+            if stripped_line.startswith(")"):
+                create_statement.append(");\n")
+                output.create_table(table, "".join(create_statement))
+                row_filters[table] = row_filter_factory(table, parse_create_table_columns("".join(create_statement)))
+                # Stop capturing the CREATE statement
+                sql_tables_flags[table]["create_processed"] = True
+                logger.info(f"Processed CREATE statement for table `{table}`.")
+                section, table, create_statement = SECTION_NONE, None, []
+            else:
+                # Continue capturing CREATE statement
+                # Change collation from "utf8mb4_unicode_ci" to "NOCASE" for SQLite 3 to work
+                replaced_line = stripped_line.replace("utf8mb4_unicode_ci", "NOCASE")
+                create_statement.append(replaced_line)
+
+        # Outside a section - only statements starting with "C", "I" or "/" can start or end a section
+        else:
+            first_character = line[:1]
 
             # Detect and extract CREATE TABLE statements
-            for table in table_filters:
-                if stripped_line.startswith(f"CREATE TABLE `{table}`"):
+            if first_character == "C" and line.startswith(CREATE_TABLE_PREFIX):
+                table = get_statement_table(line, CREATE_TABLE_PREFIX)
+                if table in sql_tables_flags:
                     # Start capturing the CREATE statement
-                    in_create_table = table
-                    outfile.write(stripped_line)
-                    break
-                if in_create_table == table:
-                    if stripped_line.startswith(")"):
-                        outfile.write(");\n")
-                        # Stop capturing the CREATE statement
-                        sql_tables_flags[in_create_table]["create_processed"] = True
-                        logger.info(f"Processed CREATE statement for table `{in_create_table}`.")
-                        in_create_table = None
-                    else:
-                        # Continue writing CREATE statement
-                        # Change collation from "utf8mb4_unicode_ci" to "NOCASE" for SQLite 3 to work
-                        replaced_line = stripped_line.replace("utf8mb4_unicode_ci", "NOCASE")
-                        outfile.write(replaced_line)
+                    section = SECTION_CREATE_TABLE
+                    create_statement.append(line.strip())
 
             # Detect and extract multi-line INSERT INTO statements
-            for table in table_filters:
-                if stripped_line.startswith(f"INSERT INTO `{table}`"):
+            elif first_character == "I" and line.startswith(INSERT_PREFIX):
+                table = get_statement_table(line, INSERT_PREFIX)
+                if table in sql_tables_flags:
+                    if table not in row_filters:
+                        raise ValueError(f"INSERT statement for table `{table}` before its CREATE statement.")
                     # Start capturing INSERT statement
-                    in_insert = table
-                    insert_statement = stripped_line
-                    break
-
-                if in_insert == table:
-                    # For ranks single and ranks average tables take only NRs
-                    if in_insert in (TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE):
-                        if int(stripped_line.strip("(),;").split(",")[-1]) == 1:
-                            insert_values.append(stripped_line.rstrip(',;'))
-
-                    # For Persons take only Bulgaria
-                    if in_insert == TABLE_PERSONS:
-                        if os.environ["WCA_COUNTRY"] in stripped_line:
-                            insert_values.append(stripped_line.rstrip(',;'))
-
-                    # End of multi-line INSERT statement
-                    if stripped_line.endswith(";"):
-                        # Join INSERT statement with all values for insertion
-                        if len(insert_values) > 0:
-                            joined_inserts = insert_statement + " " + ", ".join(insert_values) + ";\n"
-                            outfile.write(joined_inserts)
-                        # Reset tracking
-                        in_insert = insert_statement = None
-                        insert_values = []
+                    section = SECTION_INSERT
+                    insert_statement = line.strip()
+                    row_filter = row_filters[table]
 
             # Detect if the tables have been extracted to their fullest
-            for table in table_filters:
-                if f"ALTER TABLE `{table}` ENABLE KEYS" in line:
+            elif first_character == "/" and line.startswith(ALTER_TABLE_PREFIX):
+                table = get_statement_table(line, ALTER_TABLE_PREFIX)
+                if table in sql_tables_flags and line.startswith(ENABLE_KEYS_SUFFIX, len(ALTER_TABLE_PREFIX) + len(table)):
                     logger.info(f"Processed all INSERT statements for table `{table}`.")
                     sql_tables_flags[table]["insert_processed"] = True
 
-            # Check if all tables have been extracted
-            if all(flag['create_processed'] and flag['insert_processed'] for flag in sql_tables_flags.values()):
-                break
+                    # Check if all tables have been extracted
+                    if all(flag['create_processed'] and flag['insert_processed']
+                           for flag in sql_tables_flags.values()):
+                        break
+
+
+def find_sql_dump_sections(sql_dump_map: mmap, table_filters: dict[str, Any]) -> list[tuple[str, int, int, int]]:
+    """
+    Finds the sections of the given tables in the memory-mapped SQL dump with byte searches.
+
+    :param sql_dump_map: (mmap) The memory-mapped SQL dump.
+    :param table_filters: (dict) Dictionary of {table_name: filter_value}.
+    :return: (list) For every table found - the table, the start and the end of its CREATE TABLE statement
+    and the start of its ENABLE KEYS statement, in the order of the SQL dump.
+    """
+
+    sections = []
+
+    for table in table_filters:
+        create_position = find_line(sql_dump_map, f"{CREATE_TABLE_PREFIX}{table}`".encode(), 0)
+        if create_position == -1:
+            logger.warning(f"CREATE statement for table `{table}` not found in SQL dump.")
+            continue
+
+        # CREATE TABLE statement ends with the line, which starts with the closing parenthesis
+        create_end = sql_dump_map.find(b"\n", sql_dump_map.find(b"\n)", create_position) + 1) + 1
+
+        # All INSERT statements are before the ENABLE KEYS statement of the table
+        enable_keys_position = find_line(sql_dump_map, f"{ALTER_TABLE_PREFIX}{table}{ENABLE_KEYS_SUFFIX}".encode(),
+                                         create_end)
+        if enable_keys_position == -1:
+            logger.warning(f"ENABLE KEYS statement for table `{table}` not found in SQL dump.")
+            enable_keys_position = len(sql_dump_map)
+
+        sections.append((table, create_position, create_end, enable_keys_position))
+
+    return sorted(sections, key=lambda section: section[1])
+
+
+def iter_sql_dump_sections(sql_dump_map: mmap, table_filters: dict[str, Any]) -> Iterator[str]:
+    """
+    Yields only the lines of the sections of the given tables from the memory-mapped SQL dump - the CREATE TABLE
+    statement, the INSERT statements and the ENABLE KEYS statement of every table.
+    The sections are found with byte searches, so the tables which are not needed are never split into lines.
+
+    :param sql_dump_map: (mmap) The memory-mapped SQL dump.
+    :param table_filters: (dict) Dictionary of {table_name: filter_value}.
+    :return: (Iterator) The lines of the sections of the given tables, in the order of the SQL dump.
+    """
+
+    for table, create_position, create_end, enable_keys_position in find_sql_dump_sections(sql_dump_map,
+                                                                                           table_filters):
+        yield from iter_lines(sql_dump_map, create_position, create_end)
+
+        insert_prefix = f"{INSERT_PREFIX}{table}`".encode()
+        position = find_line(sql_dump_map, insert_prefix, create_end, enable_keys_position)
+        while position != -1:
+            # INSERT statement ends with the row, which ends with a semicolon
+            insert_end = sql_dump_map.find(b";\n", position, enable_keys_position) + 2
+            if insert_end == 1:
+                insert_end = enable_keys_position
+            yield from iter_lines(sql_dump_map, position, insert_end)
+            position = find_line(sql_dump_map, insert_prefix, insert_end, enable_keys_position)
+
+        yield from iter_enable_keys_line(sql_dump_map, enable_keys_position)
+
+
+def iter_sql_dump_sections_parallel(sql_dump_map: mmap, table_filters: dict[str, Any],
+                                    executor: Executor) -> Iterator[str]:
+    """
+    Yields the lines of the sections of the given tables from the memory-mapped SQL dump, like
+    "iter_sql_dump_sections", but the rows of the INSERT statements are pre-filtered in parallel.
+    The INSERT section of every table is split into newline-aligned byte ranges, which the executor filters.
+    The results are yielded in the order of the ranges, so the lines are the same as in the sequential scan,
+    without the rows that the filter drops.
+
+    :param sql_dump_map: (mmap) The memory-mapped SQL dump.
+    :param table_filters: (dict) Dictionary of {table_name: filter_value}.
+    :param executor: (Executor) The executor, which filters the byte ranges.
+    :return: (Iterator) The lines of the sections of the given tables, in the order of the SQL dump.
+    """
+
+    for table, create_position, create_end, enable_keys_position in find_sql_dump_sections(sql_dump_map,
+                                                                                           table_filters):
+        create_lines = list(iter_lines(sql_dump_map, create_position, create_end))
+        yield from create_lines
+
+        # The workers need the columns of the table for the row filter
+        columns = parse_create_table_columns("".join(line.strip() for line in create_lines))
+
+        # Split the INSERT statements into ranges, which end at the end of a line
+        ranges = []
+        start = create_end
+        while start < enable_keys_position:
+            end = min(start + SQL_DUMP_PARALLEL_RANGE_SIZE, enable_keys_position)
+            if end < enable_keys_position:
+                end = sql_dump_map.find(b"\n", end, enable_keys_position) + 1 or enable_keys_position
+            ranges.append((table, columns, start, end))
+            start = end
+
+        logger.info(f"Filtering INSERT statements for table `{table}` in {len(ranges)} ranges.")
+        for lines in executor.map(prefilter_sql_dump_range, *zip(*ranges)):
+            yield from lines
+
+        yield from iter_enable_keys_line(sql_dump_map, enable_keys_position)
+
+
+def prefilter_sql_dump_range(table: str, columns: list[str], start: int, end: int) -> list[str]:
+    """
+    Filters a byte range of the INSERT statements of a table in the extracted SQL dump.
+    Runs in a worker process. Keeps all lines, which are not rows, the rows which pass the filter of the table
+    and the rows which end an INSERT statement, so that the statements can be rebuilt from the result.
+
+    :param table: (str) The name of the table.
+    :param columns: (list) The names of the columns of the table.
+    :param start: (int) The start of the range, at the start of a line.
+    :param end: (int) The end of the range, after the end of a line.
+    :return: (list) The kept lines of the range.
+    """
+
+    row_filter = get_row_filter(table, columns)
+
+    with open(os.path.join(EXPORTS_FOLDER, EXPORTS_SQL_FILENAME), "rb") as sql_dump:
+        sql_dump.seek(start)
+        data = sql_dump.read(end - start)
+
+    kept_lines = []
+    for line in data.decode("utf-8", errors="ignore").splitlines(keepends=True):
+        # Rows start with an opening parenthesis
+        if line[:1] != "(":
+            kept_lines.append(line)
+            continue
+        stripped_line = line.strip()
+        if stripped_line.endswith(";") or row_filter(stripped_line):
+            kept_lines.append(line)
+
+    return kept_lines
+
+
+def iter_enable_keys_line(sql_dump_map: mmap, enable_keys_position: int) -> Iterator[str]:
+    """
+    Yields the ENABLE KEYS statement of a table, if it was found.
+
+    :param sql_dump_map: (mmap) The memory-mapped SQL dump.
+    :param enable_keys_position: (int) The start of the ENABLE KEYS statement.
+    :return: (Iterator) The line of the ENABLE KEYS statement.
+    """
+
+    if enable_keys_position < len(sql_dump_map):
+        yield from iter_lines(sql_dump_map, enable_keys_position, sql_dump_map.find(b"\n", enable_keys_position) + 1)
+
+
+def find_line(sql_dump_map: mmap, prefix: bytes, start: int, end: int = None) -> int:
+    """
+    Finds the first line, which starts with the given prefix.
+
+    :param sql_dump_map: (mmap) The memory-mapped SQL dump.
+    :param prefix: (bytes) The prefix of the line.
+    :param start: (int) The position to search from, at the start of a line.
+    :param end: (int) The position to search until.
+    :return: (int) The position of the line, -1 if there is no such line.
+    """
+
+    end = len(sql_dump_map) if end is None else end
+
+    if sql_dump_map[start:start + len(prefix)] == prefix:
+        return start
+
+    position = sql_dump_map.find(b"\n" + prefix, start, end)
+    return position if position == -1 else position + 1
+
+
+def iter_lines(sql_dump_map: mmap, start: int, end: int) -> Iterator[str]:
+    """
+    Yields the decoded lines in a range of the memory-mapped SQL dump, decoding them in large blocks.
+
+    :param sql_dump_map: (mmap) The memory-mapped SQL dump.
+    :param start: (int) The start of the range, at the start of a line.
+    :param end: (int) The end of the range, after the end of a line.
+    :return: (Iterator) The lines in the range, with their line endings.
+    """
+
+    while start < end:
+        # Cut the block at the end of a line
+        block_end = min(start + EXPORTS_READ_BUFFER_SIZE, end)
+        if block_end < end:
+            block_end = sql_dump_map.rfind(b"\n", start, block_end) + 1 or end
+
+        yield from sql_dump_map[start:block_end].decode("utf-8", errors="ignore").splitlines(keepends=True)
+        start = block_end
+
+
+def get_statement_table(line: str, prefix: str) -> str:
+    """
+    Returns the name of the table of a statement - the name between the backticks after the prefix of the statement.
+
+    :param line: (str) The line of the statement.
+    :param prefix: (str) The prefix of the statement, ending with the opening backtick.
+    :return: (str) The name of the table.
+    """
+
+    return line[len(prefix):line.find("`", len(prefix))]
+
+
+def get_row_filter(table: str, columns: list[str]) -> Callable[[str], bool]:
+    """
+    Returns the filter for the rows of the INSERT statements of a table, based on the predicates on its columns.
+
+    :param table: (str) The name of the table.
+    :param columns: (list) The names of the columns of the table, from its CREATE TABLE statement.
+    :return: (Callable) Function, which accepts a row and returns "True" if it should be kept.
+    """
+
+    predicates = get_row_predicates(table)
+    if not predicates:
+        return lambda row: True
+    return RowTokenizer(columns).filter(predicates)
+
+
+def get_prefiltered_row_filter(table: str, columns: list[str]) -> Callable[[str], bool]:
+    """
+    Returns the filter for the rows, which were already pre-filtered by "prefilter_sql_dump_range". Only the rows,
+    which end an INSERT statement, are kept regardless of the filter, so only they are filtered again.
+
+    :param table: (str) The name of the table.
+    :param columns: (list) The names of the columns of the table, from its CREATE TABLE statement.
+    :return: (Callable) Function, which accepts a row and returns "True" if it should be kept.
+    """
+
+    row_filter = get_row_filter(table, columns)
+    return lambda row: not row.endswith(";") or row_filter(row)
+
+
+def get_row_predicates(table: str) -> dict[str, Any]:
+    """
+    Returns the predicates on the columns of a table, which the kept rows satisfy.
+      - For ranks single and ranks average tables take only NRs (country rank is 1), or the national top N,
+        if the leaderboards are computed.
+      - For persons take only the configured country (country ID is the configured country), or the configured
+        countries, if more countries are tracked (all persons, if all countries are tracked).
+      - For any other table take all rows.
+
+    :param table: (str) The name of the table.
+    :return: (dict) Dictionary of {column_name: value or predicate}.
+    """
+
+    if table in (TABLE_RANKS_AVERAGE, TABLE_RANKS_SINGLE):
+        # The leaderboards need the top N of every country, not only the NRs
+        if LEADERBOARD_SIZE > 1:
+            return {COLUMN_COUNTRY_RANK: lambda rank: rank is not None and 1 <= rank <= LEADERBOARD_SIZE}
+        return {COLUMN_COUNTRY_RANK: 1}
+
+    if table == TABLE_PERSONS:
+        countries = get_filtered_countries()
+        if countries is None:
+            return {}
+        if len(countries) > 1:
+            return {COLUMN_COUNTRY_ID: lambda country: country in countries}
+        return {COLUMN_COUNTRY_ID: next(iter(countries))}
+
+    return {}
+
+
+def get_filtered_countries() -> set[str] | None:
+    """
+    Returns the countries, whose persons are kept - the configured country and the tracked countries.
+
+    :return: (set) The IDs of the countries, "None" if all countries are tracked.
+    """
 
-    logger.info(f"Finished filtering SQL dump. Output - {filtered_sql_dump_filename}")
+    tracked_countries = get_tracked_countries()
+    if tracked_countries is None:
+        return None
+    return {os.environ["WCA_COUNTRY"], *tracked_countries}
 
 
 def create_flags_dict(table_filters: dict[str, Any]) -> dict[str, Any]:
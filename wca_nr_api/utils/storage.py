@@ -4,24 +4,34 @@ import json
 from typing import Any, Self
 
 # Project dependencies
+from wca_nr_api.classes.record import Record
 from wca_nr_api.classes.records import Records
-from wca_nr_api.config.constants import RECORDS_FOLDER, RECORDS_FILENAME
+from wca_nr_api.classes.region import Region
+from wca_nr_api.config.constants import (RECORDS_COUNTRY_FILENAME, RECORDS_COUNTRY_SNAPSHOT_FILENAME, RECORDS_FOLDER,
+                                         RECORDS_FILENAME, RECORDS_SNAPSHOT_FILENAME, STORAGE_FORMAT,
+                                         STORAGE_FORMAT_JSON, STORAGE_FORMAT_SNAPSHOT, STORAGE_JSON_EXPORT)
+from wca_nr_api.utils.file_utils import open_atomically
+from wca_nr_api.utils.snapshot import SECTION_RECORDS, StorageSnapshot
 
 class Storage:
     """
     "Storage" class is used for storing the records in a file for later use.
+    The records are stored either as a JSON file or as a snapshot, in which only the changed events are rewritten.
     """
 
-    def __init__(self, metadata: dict[str, Any] = None, records: Records = None):
+    def __init__(self, metadata: dict[str, Any] = None, records: Records = None,
+                 regional_records: dict[Region, Records] = None):
         """
         Initializer for the "Storage" class.
 
         :param metadata: (dict) The metadata of the WCA export.
         :param records: (Records) The records to store.
+        :param regional_records: (dict) The world and continental records of the country to store, by region.
         """
 
         self._metadata = metadata
         self._records = records
+        self._regional_records = regional_records
 
     @property
     def metadata(self):
@@ -31,6 +41,10 @@ class Storage:
     def records(self):
         return self._records
 
+    @property
+    def regional_records(self):
+        return self._regional_records
+
     def validate(self) -> bool:
         """
         Validates the both metadata and records are present and contain values.
@@ -47,26 +61,158 @@ class Storage:
         :return: (dict) The dictionary representation of the "Storage" class.
         """
 
-        return {
+        data = {
             "metadata": self.metadata,
             "records": self.records.to_dict()
         }
+        if self.regional_records is not None:
+            data["regional_records"] = {
+                region.name: records.to_dict() for region, records in self.regional_records.items()
+            }
+        return data
+
+    def save(self, country: str = None) -> None:
+        """
+        Saves the storage in the configured format. The JSON file is also exported next to the snapshot,
+        unless the export is turned off.
 
-    def to_json(self) -> None:
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        """
+
+        if STORAGE_FORMAT == STORAGE_FORMAT_SNAPSHOT:
+            self.to_snapshot(country)
+        if STORAGE_FORMAT == STORAGE_FORMAT_JSON or STORAGE_JSON_EXPORT:
+            self.to_json(country)
+
+    @classmethod
+    def load(cls, country: str = None) -> Self:
+        """
+        Loads the storage in the configured format. The records, which were stored only as a JSON file,
+        are loaded from it, until the first snapshot is saved.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        :return: (Storage) The class instance.
+        """
+
+        if STORAGE_FORMAT == STORAGE_FORMAT_SNAPSHOT and os.path.exists(cls.location(country)):
+            return cls.from_snapshot(country)
+        return cls.from_json(country)
+
+    @classmethod
+    def exists(cls, country: str = None) -> bool:
+        """
+        Checks if the records are stored in any format.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        :return: (bool) "True" if the records are stored, "False" otherwise.
+        """
+
+        return any(os.path.exists(cls.location(country, storage_format))
+                   for storage_format in (STORAGE_FORMAT_SNAPSHOT, STORAGE_FORMAT_JSON))
+
+    @classmethod
+    def load_event(cls, event: str, region: Region = None, country: str = None) -> list[Record]:
+        """
+        Loads the records of a single event. From the snapshot only the section of the event is read.
+
+        :param event: (str) The event, e.g. "333".
+        :param region: (Region) The region of the regional records. The national records if not passed.
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        :return: (list) The records of the event.
+        """
+
+        if STORAGE_FORMAT == STORAGE_FORMAT_SNAPSHOT and os.path.exists(cls.location(country)):
+            kind = region.name if region is not None else SECTION_RECORDS
+            return StorageSnapshot(cls.location(country)).read_event(event, kind)
+
+        storage = cls.from_json(country)
+        records = storage.records if region is None else (storage.regional_records or {}).get(region)
+        return records.records.get(event, []) if records is not None else []
+
+    def to_snapshot(self, country: str = None) -> None:
+        """
+        Saves the storage to its snapshot - only the sections of the events, whose records changed, are rewritten.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        """
+
+        sections = {SECTION_RECORDS: self.records.records}
+        if self.regional_records is not None:
+            sections |= {region.name: records.records for region, records in self.regional_records.items()}
+        StorageSnapshot(self.location(country, STORAGE_FORMAT_SNAPSHOT)).write(self.metadata, sections)
+
+    @classmethod
+    def from_snapshot(cls, country: str = None) -> Self:
+        """
+        Creates a "Storage" class instance from the snapshot.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        :return: (Storage) The class instance.
+        """
+
+        snapshot = StorageSnapshot(cls.location(country, STORAGE_FORMAT_SNAPSHOT))
+        sections = snapshot.read_sections()
+        records = sections.pop(SECTION_RECORDS, {})
+
+        # Regional records are not present in the snapshots, stored before they were tracked
+        regional_records = None
+        if sections:
+            regional_records = {
+                Region.from_database_value(region): Records(region_records)
+                for region, region_records in sections.items()
+            }
+
+        return cls(snapshot.read_metadata(), Records(records), regional_records)
+
+    def to_json(self, country: str = None, location: str = None) -> None:
         """
         Returns a JSON representation of the class by creating a dictionary representation of the class.
+        The file is replaced only once it is fully written.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        :param location: (str) The path to the JSON file. The records file of the country if not passed.
         """
 
-        with open(os.path.join(RECORDS_FOLDER, RECORDS_FILENAME), 'w') as f:
+        with open_atomically(location or self.location(country, STORAGE_FORMAT_JSON)) as f:
             json.dump(self.to_dict(), f, indent=4)
 
     @classmethod
-    def from_json(cls) -> Self:
+    def from_json(cls, country: str = None) -> Self:
         """
         Creates a "Storage" class instance from a JSON representation by creating a "Records" class from the JSON data.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
         :return:
         """
 
-        with open(os.path.join(RECORDS_FOLDER, RECORDS_FILENAME), 'r') as f:
+        with open(cls.location(country, STORAGE_FORMAT_JSON), 'r') as f:
             data = json.load(f)
-        return cls(data.get("metadata"), Records.from_dict(data.get("records")))
+
+        # Regional records are not present in the files, stored before they were tracked
+        regional_records = None
+        if data.get("regional_records") is not None:
+            regional_records = {
+                Region.from_database_value(region): Records.from_dict(records)
+                for region, records in data.get("regional_records").items()
+            }
+
+        return cls(data.get("metadata"), Records.from_dict(data.get("records")), regional_records)
+
+    @staticmethod
+    def location(country: str = None, storage_format: str = None) -> str:
+        """
+        Returns the path to the records file.
+
+        :param country: (str) The tracked country, whose records are stored. The configured country if not passed.
+        :param storage_format: (str) The format of the records file. The configured format if not passed.
+        :return: (str) The path to the records file.
+        """
+
+        if (storage_format or STORAGE_FORMAT) == STORAGE_FORMAT_SNAPSHOT:
+            filename, country_filename = RECORDS_SNAPSHOT_FILENAME, RECORDS_COUNTRY_SNAPSHOT_FILENAME
+        else:
+            filename, country_filename = RECORDS_FILENAME, RECORDS_COUNTRY_FILENAME
+
+        if country is None:
+            return os.path.join(RECORDS_FOLDER, filename)
+        return os.path.join(RECORDS_FOLDER, country_filename.format(country=country))
@@ -0,0 +1,366 @@
+# Python dependencies
+import io
+import struct
+import threading
+import zlib
+from typing import BinaryIO
+from zipfile import BadZipFile
+
+# External dependencies
+import requests
+
+# Project dependencies
+from wca_nr_api.config.constants import EXPORTS_DOWNLOAD_TIMEOUT
+from wca_nr_api.config.logger import logger
+
+ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+ZIP_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+ZIP_FLAG_DATA_DESCRIPTOR = 0x08
+ZIP_METHOD_STORED = 0
+ZIP_METHOD_DEFLATED = 8
+ZIP64_EXTRA_FIELD_ID = 0x0001
+ZIP64_SIZE_PLACEHOLDER = 0xFFFFFFFF
+
+
+class DownloadSpool:
+    """
+    "DownloadSpool" downloads a file in a background thread and spools it to disk,
+    while allowing readers to consume the bytes that have already arrived.
+
+    The file is downloaded over a single connection, in the order it is read - a stalled connection raises
+    after the read timeout to the readers, but the download is neither retried nor resumed.
+    """
+
+    def __init__(self, url: str, location: str, chunk_size: int):
+        """
+        Initializer for the "DownloadSpool" class.
+
+        :param url: (str) The URL of the file to download.
+        :param location: (str) The path of the spool file.
+        :param chunk_size: (int) The size of the chunks, in which the response body is read.
+        """
+
+        self._url = url
+        self._location = location
+        self._chunk_size = chunk_size
+
+        self._condition = threading.Condition()
+        self._written = 0
+        self._finished = False
+        self._cancelled = False
+        self._error = None
+        self._thread = threading.Thread(target=self.__download, name="export-download", daemon=True)
+
+    @property
+    def location(self) -> str:
+        return self._location
+
+    def start(self) -> None:
+        """
+        Creates the spool file and starts the download in the background.
+        """
+
+        # Create the file here, so that readers can open it as soon as "start" returns
+        open(self.location, "wb").close()
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stops the download after the chunk that is currently being written.
+        """
+
+        with self._condition:
+            self._cancelled = True
+
+    def join(self) -> None:
+        """
+        Waits for the download to finish. Raises the error of the download, if there was one.
+        """
+
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def wait_for(self, position: int) -> int:
+        """
+        Blocks until there are bytes after the given position in the spool file or the download is finished.
+
+        :param position: (int) The position in the spool file, which the reader is at.
+        :return: (int) The number of bytes written to the spool file so far.
+        """
+
+        with self._condition:
+            while self._written <= position and not self._finished:
+                self._condition.wait()
+            if self._error is not None:
+                raise self._error
+            return self._written
+
+    def __download(self) -> None:
+        """
+        Streams the response body into the spool file and notifies the waiting readers for every chunk.
+        """
+
+        try:
+            logger.info(f"Sending GET request to {self._url}")
+            with (requests.get(self._url, stream=True, timeout=EXPORTS_DOWNLOAD_TIMEOUT) as response,
+                  open(self.location, "wb", buffering=0) as f):
+                # Raise error if 4**
+                response.raise_for_status()
+
+                for chunk in response.iter_content(chunk_size=self._chunk_size):
+                    if self._cancelled:
+                        logger.warning(f"Download of {self._url} cancelled")
+                        break
+                    f.write(chunk)
+                    with self._condition:
+                        self._written += len(chunk)
+                        self._condition.notify_all()
+
+            logger.info(f"Downloaded {self._written} bytes from {self._url} to {self.location}")
+        except Exception as e:
+            logger.error(f"Received response from {self._url} with error {e}")
+            self._error = e
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+
+class SpoolReader(io.RawIOBase):
+    """
+    "SpoolReader" is a raw binary stream over the spool file of a "DownloadSpool".
+    Reads block until the requested bytes are downloaded and return EOF once the download is finished.
+    """
+
+    def __init__(self, spool: DownloadSpool):
+        """
+        Initializer for the "SpoolReader" class.
+
+        :param spool: (DownloadSpool) The started download spool.
+        """
+
+        self._spool = spool
+        self._file = open(spool.location, "rb", buffering=0)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Reads the downloaded bytes into the buffer, waiting for the download if needed.
+
+        :param buffer: (bytearray) The buffer to read into.
+        :return: (int) The number of bytes read, 0 at the end of the download.
+        """
+
+        available = self._spool.wait_for(self._position) - self._position
+        if available <= 0:
+            return 0
+
+        read = self._file.readinto(memoryview(buffer)[:available])
+        self._position += read
+        return read
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class ZipMemberReader(io.RawIOBase):
+    """
+    "ZipMemberReader" decompresses a single member of a ZIP archive from a forward-only stream of the archive.
+    The members before it are skipped by their local file headers, so the central directory at the end of the
+    archive is never needed.
+    """
+
+    def __init__(self, archive: BinaryIO, member_name: str, read_size: int):
+        """
+        Initializer for the "ZipMemberReader" class.
+
+        :param archive: (BinaryIO) The stream of the archive, positioned at its beginning.
+        :param member_name: (str) The name of the member to decompress.
+        :param read_size: (int) The size of the compressed blocks read from the archive.
+        """
+
+        self._archive = archive
+        self._read_size = read_size
+        self._pending = b""
+
+        # Skip all members until the requested one
+        while True:
+            name, flags, method, compressed_size, crc, zip64 = self.__read_local_header(member_name)
+            if name == member_name:
+                break
+            self.__skip_member(flags, method, compressed_size, zip64)
+
+        if method not in (ZIP_METHOD_STORED, ZIP_METHOD_DEFLATED):
+            raise BadZipFile(f"Unsupported compression method {method} for {member_name}")
+        if method == ZIP_METHOD_STORED and flags & ZIP_FLAG_DATA_DESCRIPTOR:
+            raise BadZipFile(f"Cannot stream stored member {member_name} without sizes")
+
+        self._method = method
+        self._remaining = compressed_size
+        self._expected_crc = None if flags & ZIP_FLAG_DATA_DESCRIPTOR else crc
+        self._crc = 0
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        self._eof = False
+
+        logger.info(f"Streaming member {member_name} from archive")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Decompresses the next part of the member into the buffer.
+
+        :param buffer: (bytearray) The buffer to read into.
+        :return: (int) The number of bytes read, 0 at the end of the member.
+        """
+
+        data = b""
+        while not data and not self._eof:
+            if self._method == ZIP_METHOD_STORED:
+                data = self.__read(min(len(buffer), self._remaining))
+                self._remaining -= len(data)
+                self._eof = self._remaining == 0
+                if not data and not self._eof:
+                    raise EOFError("Archive ended in the middle of a member")
+            else:
+                data = self.__inflate(len(buffer))
+
+        if data:
+            self._crc = zlib.crc32(data, self._crc)
+        elif self._expected_crc is not None and self._crc != self._expected_crc:
+            raise zlib.error("CRC mismatch of the streamed archive member")
+
+        buffer[:len(data)] = data
+        return len(data)
+
+    def __inflate(self, max_length: int) -> bytes:
+        """
+        Decompresses at most "max_length" bytes, reading more compressed data from the archive if needed.
+
+        :param max_length: (int) The maximum number of decompressed bytes to return.
+        :return: (bytes) The decompressed bytes.
+        """
+
+        compressed = self._decompressor.unconsumed_tail
+        if not compressed:
+            compressed = self.__read(self._read_size)
+            if not compressed:
+                raise EOFError("Archive ended in the middle of a member")
+
+        data = self._decompressor.decompress(compressed, max_length)
+        if self._decompressor.eof:
+            self._eof = True
+        return data
+
+    def __read(self, size: int) -> bytes:
+        """
+        Reads at most "size" bytes from the archive, starting with bytes pushed back by the skipped members.
+
+        :param size: (int) The maximum number of bytes to read.
+        :return: (bytes) The bytes read.
+        """
+
+        if self._pending:
+            data, self._pending = self._pending[:size], self._pending[size:]
+            return data
+        return self._archive.read(size)
+
+    def __read_exact(self, size: int) -> bytes:
+        """
+        Reads exactly "size" bytes from the archive.
+
+        :param size: (int) The number of bytes to read.
+        :return: (bytes) The bytes read.
+        """
+
+        data = b""
+        while len(data) < size:
+            chunk = self.__read(size - len(data))
+            if not chunk:
+                raise EOFError("Archive ended in the middle of a header")
+            data += chunk
+        return data
+
+    def __read_local_header(self, member_name: str) -> tuple[str, int, int, int, int, bool]:
+        """
+        Reads the local file header of the next member of the archive.
+
+        :param member_name: (str) The name of the requested member, used for the error message.
+        :return: (tuple) The name, flags, compression method, compressed size, CRC and whether the member is ZIP64.
+        """
+
+        header = self.__read_exact(ZIP_LOCAL_HEADER.size)
+        (signature, _, flags, method, _, _, crc, compressed_size, uncompressed_size,
+         name_length, extra_length) = ZIP_LOCAL_HEADER.unpack(header)
+
+        # The central directory is reached, there are no more members
+        if signature != ZIP_LOCAL_HEADER_SIGNATURE:
+            raise KeyError(f"There is no item named {member_name!r} in the archive")
+
+        name = self.__read_exact(name_length).decode("utf-8")
+        extra = self.__read_exact(extra_length)
+
+        # ZIP64 sizes are stored in the extra field
+        zip64 = False
+        offset = 0
+        while offset + 4 <= len(extra):
+            field_id, field_length = struct.unpack_from("<HH", extra, offset)
+            if field_id == ZIP64_EXTRA_FIELD_ID:
+                zip64 = True
+                sizes = list(struct.unpack_from(f"<{field_length // 8}Q", extra, offset + 4))
+                if uncompressed_size == ZIP64_SIZE_PLACEHOLDER and sizes:
+                    sizes.pop(0)
+                if compressed_size == ZIP64_SIZE_PLACEHOLDER and sizes:
+                    compressed_size = sizes.pop(0)
+            offset += 4 + field_length
+
+        return name, flags, method, compressed_size, crc, zip64
+
+    def __skip_member(self, flags: int, method: int, compressed_size: int, zip64: bool) -> None:
+        """
+        Skips the data (and the data descriptor) of a member, which is not requested.
+
+        :param flags: (int) The flags of the member.
+        :param method: (int) The compression method of the member.
+        :param compressed_size: (int) The compressed size of the member.
+        :param zip64: (bool) Whether the member is ZIP64.
+        """
+
+        # Sizes are known - skip the compressed data directly
+        if not flags & ZIP_FLAG_DATA_DESCRIPTOR:
+            while compressed_size:
+                skipped = len(self.__read(min(compressed_size, self._read_size)))
+                if not skipped:
+                    raise EOFError("Archive ended in the middle of a member")
+                compressed_size -= skipped
+            return
+
+        if method != ZIP_METHOD_DEFLATED:
+            raise BadZipFile(f"Cannot skip member with compression method {method} without sizes")
+
+        # Sizes are stored after the data - decompress until the end of the deflate stream
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        while not decompressor.eof:
+            compressed = self.__read(self._read_size)
+            if not compressed:
+                raise EOFError("Archive ended in the middle of a member")
+            # Only the end of the stream is needed, the decompressed data is discarded in bounded blocks
+            while compressed and not decompressor.eof:
+                decompressor.decompress(compressed, self._read_size)
+                compressed = decompressor.unconsumed_tail
+        self._pending = decompressor.unused_data + self._pending
+
+        # Skip the data descriptor - CRC and sizes, optionally preceded by a signature
+        descriptor_size = 20 if zip64 else 12
+        signature = self.__read_exact(4)
+        if signature == ZIP_DATA_DESCRIPTOR_SIGNATURE:
+            self.__read_exact(descriptor_size)
+        else:
+            self.__read_exact(descriptor_size - 4)
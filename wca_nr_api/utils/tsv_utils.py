@@ -0,0 +1,133 @@
+# Python dependencies
+import io
+from contextlib import ExitStack
+from typing import Any, Callable
+from zipfile import ZipFile
+
+# Project dependencies
+from wca_nr_api.config.constants import *
+from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.database import DB, SQLiteLoader
+from wca_nr_api.utils.file_utils import get_export_archive_location
+from wca_nr_api.utils.fingerprint import FilteredRowsFingerprint
+from wca_nr_api.utils.sql_utils import get_row_predicates
+
+# Columns of the tracked tables, which hold numbers - the TSV export has no types
+TSV_INTEGER_COLUMNS = {"sub_id", "best", "average", "world_rank", "continent_rank", "country_rank"}
+
+
+def ingest_tsv_export(table_filters: dict[str, Any], output: Any = None,
+                      row_filter_factory: Callable[[str, list[str]], Callable[[str], list[str] | None]] = None,
+                      fingerprint: FilteredRowsFingerprint = None) -> None:
+    """
+    Loads the given tables from the TSV export into the local database.
+    Only the TSV files of the given tables are decompressed - each of them is streamed from the archive line by line,
+    filtered with the same predicates as the SQL dump and inserted in batches.
+
+    :param table_filters: (dict) Dictionary of {table_name: filter_value}.
+    :param output: (Any) The output of the rows, e.g. "RecordsEngine". If not passed, the local database is used.
+    :param row_filter_factory: (Callable) Function, which creates the line filter of a table from its columns.
+    The filter of the configured predicates ("get_tsv_row_filter") if not passed.
+    :param fingerprint: (FilteredRowsFingerprint) The fingerprint, which is computed from the filtered rows.
+    """
+
+    row_filter_factory = get_tsv_row_filter if row_filter_factory is None else row_filter_factory
+
+    archive_location = get_export_archive_location()
+    logger.info(f"Starting ingesting TSV export from {archive_location}")
+
+    with ExitStack() as stack:
+        zf = stack.enter_context(ZipFile(archive_location, "r"))
+        loader = output if output is not None else SQLiteLoader(stack.enter_context(DB()))
+        # Pass the filtered rows through the fingerprint to the output
+        if fingerprint is not None:
+            loader = fingerprint.wrap(loader)
+        # DROP tables if they exist
+        loader.drop_tables(list(table_filters))
+
+        for table in table_filters:
+            member = EXPORTS_TSV_MEMBER_FILENAME.format(table=table)
+
+            with zf.open(member, "r") as tsv_file:
+                buffered_tsv_file = io.BufferedReader(tsv_file, buffer_size=EXPORTS_READ_BUFFER_SIZE)
+                text_tsv_file = io.TextIOWrapper(buffered_tsv_file, encoding="utf-8", errors="ignore")
+
+                # The first line holds the names of the columns
+                columns = text_tsv_file.readline().rstrip("\n").split("\t")
+                # SQLite converts the values of the INTEGER columns to numbers
+                column_definitions = ", ".join(
+                    f"`{column}` {'INTEGER' if column in TSV_INTEGER_COLUMNS else 'TEXT'}" for column in columns)
+                loader.create_table(table, f"CREATE TABLE `{table}` ({column_definitions});")
+                row_filter = row_filter_factory(table, columns)
+
+                rows = 0
+                batch = []
+                for line in text_tsv_file:
+                    row = row_filter(line)
+                    if row is not None:
+                        batch.append(tuple(None if value == "NULL" else value for value in row))
+
+                        # Insert a full batch, so that memory does not grow with the matching rows
+                        if len(batch) >= FILTERED_INSERT_BATCH_SIZE:
+                            loader.insert_rows(table, batch)
+                            rows += len(batch)
+                            batch = []
+
+                loader.insert_rows(table, batch)
+                rows += len(batch)
+
+            logger.info(f"Ingested {rows} rows for table `{table}` from {member}.")
+
+    logger.info(f"Finished ingesting TSV export from {archive_location}")
+
+
+def get_tsv_row_filter(table: str, columns: list[str]) -> Callable[[str], list[str] | None]:
+    """
+    Returns the filter for the lines of the TSV file of a table, based on the predicates on its columns.
+    Lines without the values of the value predicates are rejected by a substring search, before they are split at all.
+    Function predicates get the converted value of their column, like the ones of the SQL dump.
+
+    :param table: (str) The name of the table.
+    :param columns: (list) The names of the columns of the table, from the header of the TSV file.
+    :return: (Callable) Function, which accepts a line and returns its values if it should be kept, "None" otherwise.
+    """
+
+    checks, functions = [], []
+    for column, predicate in get_row_predicates(table).items():
+        if callable(predicate):
+            functions.append((columns.index(column), predicate))
+        else:
+            checks.append((columns.index(column), str(predicate)))
+
+    def row_filter(line: str) -> list[str] | None:
+        # Cheap rejection - every value predicate needs its value in the line
+        for _, value in checks:
+            if value not in line:
+                return None
+
+        row = line.rstrip("\n").split("\t")
+        for index, value in checks:
+            if row[index] != value:
+                return None
+        for index, predicate in functions:
+            if not predicate(convert_tsv_value(columns[index], row[index])):
+                return None
+        return row
+
+    return row_filter
+
+
+def convert_tsv_value(column: str, value: str) -> Any:
+    """
+    Converts a raw value of the TSV file of a table to its type.
+
+    :param column: (str) The name of the column.
+    :param value: (str) The raw value.
+    :return: (Any) "None" for NULL, the number for the numeric columns, or the value itself.
+    """
+
+    if value == "NULL":
+        return None
+    if column in TSV_INTEGER_COLUMNS:
+        return int(value)
+    return value
@@ -1,14 +1,20 @@
 # Python dependencies
+import io
+import json
 import os.path
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterator, TextIO
 
 # External dependencies
 import requests
-from urllib.request import urlretrieve
 
 # Project dependencies
 from wca_nr_api.config.constants import *
 from wca_nr_api.config.logger import logger
+from wca_nr_api.utils.download_utils import RangedDownloader
+from wca_nr_api.utils.file_utils import get_export_archive_location, open_atomically
+from wca_nr_api.utils.stream_utils import DownloadSpool, SpoolReader, ZipMemberReader
 
 
 class WCAUtils:
@@ -26,6 +32,8 @@ class WCAUtils:
         self._export_date = None
         self._sql_url = None
         self._tsv_url = None
+        self._not_modified = False
+        self._export_information_cache = None
 
     @property
     def export_date(self):
@@ -51,24 +59,52 @@ class WCAUtils:
     def tsv_url(self, url):
         self._tsv_url = url
 
+    @property
+    def not_modified(self) -> bool:
+        return self._not_modified
+
     def extract_latest_export_information(self) -> None:
         """
         Extracts the latest export information from the API including
-        export date, SQL formatted export and TSV formatted export
+        export date, SQL formatted export and TSV formatted export.
+        The request is conditional on the cached response of the last processed export -
+        if the export information is not modified, the cached information is used.
 
         :return: None
         """
 
+        # Load the response, cached in the last run
+        cache = self.__load_export_information_cache()
+
+        # Send the validators of the cached response, so that the API can answer with "304 Not Modified"
+        headers = {}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
         try:
             logger.info(f"Sending GET request to {self.EXPORTS_URL}")
             # GET latest WCA export information
-            response = requests.get(self.EXPORTS_URL)
+            response = requests.get(self.EXPORTS_URL, headers=headers)
             # Raise error if 4**
             response.raise_for_status()
             logger.info(f"Received response from {self.EXPORTS_URL} with status code {response.status_code}")
 
-            # Convert response to JSON
-            export_info = response.json()
+            if response.status_code == 304:
+                # Export information is the same as the cached one
+                self._not_modified = True
+                export_info = cache["export_information"]
+            else:
+                # Convert response to JSON
+                export_info = response.json()
+                # Keep the response for caching once it is processed
+                self._export_information_cache = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "export_information": export_info
+                }
+
             # Save export information
             self.export_date = export_info["export_date"]
             self.sql_url = export_info["sql_url"]
@@ -83,6 +119,45 @@ class WCAUtils:
             logger.error(f"Received response from {self.EXPORTS_URL} with status code {err.response.status_code}")
             logger.error(f"Error - {err.response.text}")
 
+    def save_export_information_cache(self) -> None:
+        """
+        Saves the latest export information with its validators (ETag and Last-Modified) for conditional requests.
+        Should be called only after the export has been processed, so that a failed run does not get skipped.
+        """
+
+        if self._export_information_cache is None:
+            return
+
+        cache_location = os.path.join(RECORDS_FOLDER, EXPORT_INFORMATION_CACHE_FILENAME)
+
+        # Write to a temporary file and replace, so that the cache is never half-written
+        with open_atomically(cache_location) as f:
+            json.dump(self._export_information_cache, f, indent=4)
+        logger.info(f"Saved export information cache to {cache_location}")
+
+    @staticmethod
+    def __load_export_information_cache() -> dict:
+        """
+        Loads the cached response of the export information from the last run.
+
+        :return: (dict) The cached response, or an empty dictionary if there is no valid cache.
+        """
+
+        cache_location = os.path.join(RECORDS_FOLDER, EXPORT_INFORMATION_CACHE_FILENAME)
+
+        try:
+            with open(cache_location, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            logger.info(f"No export information cache found in {cache_location}")
+            return {}
+
+        # A cache without the response cannot be used for "304 Not Modified"
+        if not cache.get("export_information"):
+            return {}
+
+        return cache
+
     def is_new_export_present(self, old_export_date: str) -> bool:
         """
         Compares the date between the export date, collected in the last script execution
@@ -99,17 +174,51 @@ class WCAUtils:
     def download_latest_export(self) -> None:
         """
         Downloads the latest export from the API including competitors, competitions, events, results, records, etc.
-        
+        The archive is downloaded in ranges over multiple connections and missing ranges are retried.
+
         :return: None
         """
 
+        # Define path and filename for archive download
+        archive_download_location = get_export_archive_location()
+        logger.info(f"Archive download location: {archive_download_location}")
+
+        # URL of the archive in the configured format
+        export_url = self.tsv_url if EXPORT_FORMAT == EXPORT_FORMAT_TSV else self.sql_url
+
+        # Send requests to retrieve the exports file and save it to the specified path - a failed download is
+        # raised, so that an incomplete archive is not unarchived
+        downloader = RangedDownloader(export_url, archive_download_location, EXPORTS_DOWNLOAD_CONNECTIONS,
+                                      EXPORTS_DOWNLOAD_RANGE_SIZE, EXPORTS_DOWNLOAD_RETRIES)
+        downloader.download()
+
+    @contextmanager
+    def stream_latest_export(self) -> Iterator[TextIO]:
+        """
+        Downloads the latest export in the background and streams the SQL dump out of the archive while it is
+        still downloading, so that the network, the decompression and the filtering run at the same time.
+        The archive is spooled to the exports folder, so the rest of its members can be read afterwards.
+
+        :return: (TextIO) The SQL dump as a text stream.
+        """
+
         # Define path and filename for archive download
         archive_download_location = os.path.join(EXPORTS_FOLDER, EXPORTS_ARCHIVE_FILENAME)
         logger.info(f"Archive download location: {archive_download_location}")
 
+        spool = DownloadSpool(self.sql_url, archive_download_location, EXPORTS_DOWNLOAD_CHUNK_SIZE)
+        spool.start()
+
         try:
-            # Send request to retrieve the exports file and save it to the specified path
-            logger.info(f"Sending GET request to {self.sql_url}")
-            urlretrieve(self.sql_url, filename=archive_download_location)
-        except Exception as e:
-            logger.error(f"Received response from {self.sql_url} with error {e}")
+            with SpoolReader(spool) as archive:
+                member = ZipMemberReader(archive, EXPORTS_SQL_FILENAME, EXPORTS_DOWNLOAD_CHUNK_SIZE)
+                buffered_member = io.BufferedReader(member, buffer_size=EXPORTS_READ_BUFFER_SIZE)
+                with io.TextIOWrapper(buffered_member, encoding="utf-8", errors="ignore") as sql_dump:
+                    yield sql_dump
+        except BaseException:
+            # No need to finish the download if the SQL dump could not be processed
+            spool.cancel()
+            raise
+        finally:
+            # Wait for the rest of the archive (metadata), even if the needed tables are already filtered
+            spool.join()